@@ -10,13 +10,48 @@ from .skill.riftclaw import (
     AgentPassport,
     Portal,
     PortalState,
+    PortalStateMachine,
+    ConnectionPool,
     RiftError,
     ConnectionError,
     SecurityError,
     HandoffError,
+    HandoffRejectedError,
+    CircuitOpenError,
     quick_connect,
     portal_jump,
 )
+from .skill.async_riftclaw import (
+    AsyncRiftClawSkill,
+    async_quick_connect,
+)
+from .skill.admission import AdmissionWaitlist, Rejection
+from .skill.canonical import canonicalize
+from .skill.connector import ConnectionSetup
+from .skill.events import HandlerMode, Subscription
+from .skill.outbound import Lane, OutboundQueue
+from .skill.ratelimit import RateGovernor, TokenBucket
+from .skill.resilience import RetryPolicy, CircuitBreaker, BreakerState
+from .skill.transport import (
+    Transport,
+    LoopbackListener,
+    LoopbackPeer,
+    register_transport,
+)
+from .skill.multiplex import (
+    MultiplexedSession,
+    AsyncMultiplexedSession,
+)
+from .skill.presence import (
+    MultiWorldPresence,
+    AsyncMultiWorldPresence,
+    WorldEvent,
+)
+from .skill.fleet import (
+    RiftClawFleet,
+    FleetAgent,
+)
+from .skill.sharded import ShardedFleet, WorkerDied
 
 __version__ = "0.1.0"
 __all__ = [
@@ -24,10 +59,42 @@ __all__ = [
     "AgentPassport",
     "Portal",
     "PortalState",
+    "PortalStateMachine",
+    "ConnectionPool",
     "RiftError",
     "ConnectionError",
     "SecurityError",
     "HandoffError",
+    "HandoffRejectedError",
+    "CircuitOpenError",
     "quick_connect",
     "portal_jump",
+    "AsyncRiftClawSkill",
+    "async_quick_connect",
+    "AdmissionWaitlist",
+    "Rejection",
+    "canonicalize",
+    "ConnectionSetup",
+    "HandlerMode",
+    "Subscription",
+    "Lane",
+    "OutboundQueue",
+    "RateGovernor",
+    "TokenBucket",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "BreakerState",
+    "Transport",
+    "LoopbackListener",
+    "LoopbackPeer",
+    "register_transport",
+    "MultiplexedSession",
+    "AsyncMultiplexedSession",
+    "MultiWorldPresence",
+    "AsyncMultiWorldPresence",
+    "WorldEvent",
+    "RiftClawFleet",
+    "FleetAgent",
+    "ShardedFleet",
+    "WorkerDied",
 ]
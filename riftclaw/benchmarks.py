@@ -0,0 +1,643 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Benchmarks
+===================
+Measures client-side costs against an in-process mock world, so results
+reflect RiftClaw itself rather than a remote server.
+
+Run from this directory:
+    python benchmarks.py fleet-memory --agents 500
+    python benchmarks.py transport-throughput --messages 20000
+    python benchmarks.py idle-hibernation --agents 200
+    python benchmarks.py shard-scaling --agents 256
+    python benchmarks.py rate-governor --requests 120
+    python benchmarks.py frame-signing --messages 20000
+    python benchmarks.py canonical-json --messages 20000
+"""
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import websockets
+
+from skill.canonical import FORMS, dumps as canonical_dumps
+from skill.riftclaw import PASSPORT_SHAPE, PortalState, RiftClawSkill
+from skill.fleet import RiftClawFleet
+from skill.sharded import ShardedFleet
+from skill.latency import LatencyStats
+from skill.ratelimit import RateGovernor
+from skill.transport import LoopbackListener
+
+
+class LocalWorld:
+    """
+    Minimal RiftClaw world served from a background thread.
+
+    Sends `welcome` on connect, answers `discover` with a fixed portal list
+    and confirms every `handoff_request`. Listens on TCP, or on a Unix
+    domain socket if `socket_path` is given. With `rate_limit=(limit,
+    window)` it rejects frames over the limit per connection like the
+    relay does, advertising the limit in its welcome if `advertise`.
+    """
+
+    def __init__(self, name: str = 'bench_world', host: str = '127.0.0.1', port: int = 0,
+                 socket_path: str = None, rate_limit: Optional[Tuple[int, float]] = None,
+                 advertise: bool = False):
+        self.name = name
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.rate_limit = rate_limit
+        self.advertise = advertise
+        self.rejected = 0
+        self.url = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> 'LocalWorld':
+        logging.getLogger('websockets').setLevel(logging.WARNING)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._serve())
+
+    async def _serve(self):
+        if self.socket_path:
+            server = await websockets.unix_serve(self._handler, self.socket_path)
+            self.url = f"ws+unix://{self.socket_path}"
+        else:
+            server = await websockets.serve(self._handler, self.host, self.port)
+            self.port = server.sockets[0].getsockname()[1]
+            self.url = f"ws://{self.host}:{self.port}"
+        self._ready.set()
+        await server.serve_forever()
+
+    def _welcome(self) -> Dict[str, Any]:
+        welcome = {'type': 'welcome', 'world_name': self.name, 'version': '1.0.0'}
+        if self.rate_limit and self.advertise:
+            welcome['rate_limits'] = {'*': {'limit': self.rate_limit[0], 'window': self.rate_limit[1]}}
+        return welcome
+
+    def _over_limit(self, history: deque) -> Optional[Dict[str, Any]]:
+        """A RATE_LIMITED error if one more frame on this connection is too many."""
+        if not self.rate_limit:
+            return None
+        limit, window = self.rate_limit
+        now = time.monotonic()
+        while history and history[0] <= now - window:
+            history.popleft()
+        if len(history) < limit:
+            history.append(now)
+            return None
+        self.rejected += 1
+        return {'type': 'error', 'code': 'RATE_LIMITED', 'message': 'Too many requests',
+                'scope': '*', 'retry_after': history[0] + window - now}
+
+    async def _handler(self, ws):
+        await ws.send(json.dumps(self._welcome()))
+        history = deque()
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                reply = self._over_limit(history) or self.respond(message)
+                if reply:
+                    if 'request_id' in message:
+                        reply['request_id'] = message['request_id']
+                    await ws.send(json.dumps(reply))
+        except websockets.ConnectionClosed:
+            pass
+
+    def serve_loopback(self, peer):
+        """The same world as a LoopbackListener handler."""
+        peer.send(json.dumps(self._welcome()))
+        history = deque()
+        for raw in peer:
+            message = json.loads(raw)
+            reply = self._over_limit(history) or self.respond(message)
+            if reply:
+                if 'request_id' in message:
+                    reply['request_id'] = message['request_id']
+                peer.send(json.dumps(reply))
+
+    def respond(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        msg_type = message.get('type')
+        if msg_type == 'discover':
+            return {'type': 'discover_response', 'portals': [{
+                'portal_id': 'portal_bench_01',
+                'name': 'Bench Gate',
+                'destination_world': self.name,
+                'destination_url': self.url
+            }]}
+        if msg_type == 'handoff_request':
+            return {'type': 'handoff_confirm', 'passport': message.get('passport'),
+                    'signature': message.get('passport', {}).get('signature')}
+        if msg_type == 'ping':
+            return {'type': 'pong', 'timestamp': time.time()}
+        return {}
+
+
+def _rss_bytes() -> int:
+    """Current resident set size of this process."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _open_fds() -> int:
+    """File descriptors open in this process."""
+    try:
+        return len(os.listdir('/proc/self/fd'))
+    except OSError:
+        return -1
+
+
+def _quiet():
+    """Silence skill logging and stray output inside a benchmark worker."""
+    logging.getLogger('riftclaw').setLevel(logging.ERROR)
+    logging.getLogger('websockets').setLevel(logging.ERROR)
+    logging.getLogger('websocket').setLevel(logging.ERROR)
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def _agent_configs(count: int, url: str) -> List[Dict[str, Any]]:
+    return [{'agent_name': f'bench_{i}', 'default_world': url, 'log_level': 'ERROR'}
+            for i in range(count)]
+
+
+def _fleet_memory_worker(model: str, count: int, url: str, results):
+    """Connect `count` agents with one model and report RSS and timings."""
+    with _quiet():
+        baseline = _rss_bytes()
+        start = time.perf_counter()
+
+        if model == 'threads':
+            skills = []
+            for config in _agent_configs(count, url):
+                config['security'] = {'key_path': None}
+                skill = RiftClawSkill(config=config)
+                skill.connect()
+                skills.append(skill)
+            connected = sum(1 for s in skills if s.connected)
+        else:
+            per_socket = count if model == 'multiplex' else 1
+            fleet = RiftClawFleet(_agent_configs(count, url), config_path=None,
+                                  agents_per_socket=per_socket)
+            fleet.start()
+            outcome = fleet.connect_all()
+            connected = sum(1 for r in outcome.values() if r is True)
+
+        elapsed = time.perf_counter() - start
+        rss = _rss_bytes()
+
+    results.put({
+        'model': model,
+        'agents': count,
+        'connected': connected,
+        'threads': threading.active_count(),
+        'connect_seconds': elapsed,
+        'rss_mb': rss / 2**20,
+        'per_agent_kb': (rss - baseline) / max(count, 1) / 1024,
+    })
+
+
+def bench_fleet_memory(agents: int = 500):
+    """Compare thread-per-agent skills, RiftClawFleet and one multiplexed socket."""
+    world = LocalWorld().start()
+    ctx = multiprocessing.get_context('spawn')
+    rows = []
+
+    for model in ('threads', 'fleet', 'multiplex'):
+        results = ctx.Queue()
+        proc = ctx.Process(target=_fleet_memory_worker, args=(model, agents, world.url, results))
+        proc.start()
+        rows.append(results.get())
+        proc.join()
+
+    print(f"\nFleet memory: {agents} agents per process")
+    print(f"{'model':<10}{'connected':>10}{'threads':>9}{'connect s':>11}"
+          f"{'RSS MB':>9}{'KB/agent':>10}{'agents/GB':>11}")
+    for row in rows:
+        per_gb = 2**20 / row['per_agent_kb'] if row['per_agent_kb'] > 0 else float('inf')
+        print(f"{row['model']:<10}{row['connected']:>10}{row['threads']:>9}"
+              f"{row['connect_seconds']:>11.2f}{row['rss_mb']:>9.1f}"
+              f"{row['per_agent_kb']:>10.1f}{per_gb:>11.0f}")
+    return rows
+
+
+def _idle_worker(idle_after: float, count: int, active: int, url: str, results):
+    """Connect `count` thread-based agents and keep only `active` of them busy."""
+    with _quiet():
+        baseline_rss, baseline_fds = _rss_bytes(), _open_fds()
+        baseline_threads = threading.active_count()
+        skills = []
+        for config in _agent_configs(count, url):
+            config['security'] = {'key_path': None}
+            config['hibernation'] = {'idle_after': idle_after}
+            # The busy agents discover faster than the spec's default limit
+            config['rate_limits'] = {'enabled': False}
+            skill = RiftClawSkill(config=config)
+            skill.connect()
+            skills.append(skill)
+
+        # Busy agents discover every 0.2s for a few idle periods
+        wake_times = []
+        deadline = time.monotonic() + max(idle_after, 1.0) * 3
+        while time.monotonic() < deadline:
+            for skill in skills[:active]:
+                started = time.perf_counter()
+                skill.discover()
+                wake_times.append(time.perf_counter() - started)
+            time.sleep(0.2)
+
+        row = {
+            'idle_after': idle_after,
+            'agents': count,
+            'active': active,
+            'hibernated': sum(1 for s in skills if s.hibernated),
+            'fds': _open_fds() - baseline_fds,
+            'threads': threading.active_count() - baseline_threads,
+            'rss_mb': (_rss_bytes() - baseline_rss) / 2**20,
+        }
+
+        # First call on a sleeping agent pays for the reconnect
+        sleeper = skills[-1]
+        started = time.perf_counter()
+        sleeper.discover()
+        row['wake_ms'] = (time.perf_counter() - started) * 1000
+        row['discover_ms'] = sorted(wake_times)[len(wake_times) // 2] * 1000 if wake_times else 0.0
+    results.put(row)
+
+
+def bench_idle_hibernation(agents: int = 200, active_share: float = 0.1):
+    """Compare fds, threads and RSS of mostly idle agents with and without hibernation."""
+    world = LocalWorld().start()
+    ctx = multiprocessing.get_context('spawn')
+    active = max(int(agents * active_share), 1)
+    rows = []
+
+    for idle_after in (0, 1.0):
+        results = ctx.Queue()
+        proc = ctx.Process(target=_idle_worker, args=(idle_after, agents, active, world.url, results))
+        proc.start()
+        rows.append(results.get())
+        proc.join()
+
+    print(f"\nIdle hibernation: {agents} agents, {active} active")
+    print(f"{'idle_after':<11}{'asleep':>7}{'fds':>6}{'threads':>9}{'RSS MB':>8}"
+          f"{'discover ms':>13}{'wake ms':>9}")
+    for row in rows:
+        print(f"{row['idle_after'] or 'off':<11}{row['hibernated']:>7}{row['fds']:>6}"
+              f"{row['threads']:>9}{row['rss_mb']:>8.1f}"
+              f"{row['discover_ms']:>13.2f}{row['wake_ms']:>9.2f}")
+    return rows
+
+
+def bench_shard_scaling(agents: int = 256, hops: int = 4):
+    """Journey throughput of a ShardedFleet with 1, 2, 4 and 8 workers."""
+    world = LocalWorld().start()
+    rows = []
+
+    for workers in (1, 2, 4, 8):
+        configs = [{'agent_name': f'bench_{i}', 'default_world': world.url, 'log_level': 'ERROR'}
+                   for i in range(agents)]
+        with _quiet(), ShardedFleet(configs, workers=workers, config_path=None) as fleet:
+            fleet.connect_all()
+            start = time.perf_counter()
+            results = fleet.run_journeys([{'agent_id': a, 'hops': hops} for a in fleet.agent_ids])
+            elapsed = time.perf_counter() - start
+            status = fleet.get_status()
+        done = sum(1 for r in results if r['success'])
+        rows.append({
+            'workers': workers,
+            'journeys': done,
+            'seconds': elapsed,
+            'hops_per_second': done * hops / elapsed,
+            'p50': status['journey_seconds']['p50'],
+            'cpu_seconds': sum(status['cpu_seconds'].values()),
+        })
+
+    print(f"\nShard scaling: {agents} agents x {hops} hops, {os.cpu_count()} CPUs")
+    print(f"{'workers':<8}{'ok':>6}{'seconds':>9}{'hops/s':>9}{'speedup':>9}"
+          f"{'p50 s':>8}{'CPU s':>8}")
+    for row in rows:
+        print(f"{row['workers']:<8}{row['journeys']:>6}{row['seconds']:>9.2f}"
+              f"{row['hops_per_second']:>9.0f}"
+              f"{row['hops_per_second'] / rows[0]['hops_per_second']:>9.2f}"
+              f"{row['p50']:>8.2f}{row['cpu_seconds']:>8.1f}")
+    return rows
+
+
+def _throughput(url: str, messages: int, window: int) -> Dict[str, Any]:
+    """Round-trip `messages` discover requests over one link to `url`."""
+    with _quiet():
+        skill = RiftClawSkill(config={'agent_name': 'bench_transport', 'default_world': url,
+                                      'log_level': 'ERROR', 'keepalive': {'interval': 0}})
+        skill.connect()
+        skill.wait_for_state([PortalState.CONNECTED], timeout=5)
+
+        # Signing is the same for every transport, so frames are built up front
+        frames = [(request_id, skill._build_frame('discover', request_id=request_id))
+                  for request_id in (f'bench_{i}' for i in range(messages))]
+        sent_at: Dict[str, float] = {}
+        rtt = LatencyStats(window=messages)
+        received = threading.Semaphore(0)
+
+        def on_response(data):
+            rtt.record(time.perf_counter() - sent_at[data['request_id']])
+            received.release()
+
+        skill.subscribe('discover_response', on_response)
+        start = time.perf_counter()
+        # Keep at most `window` requests in flight so the send queue never overflows
+        for i, (request_id, frame) in enumerate(frames):
+            if i >= window:
+                received.acquire()
+            sent_at[request_id] = time.perf_counter()
+            skill._send_frame(frame, 'discover')
+        for _ in range(min(window, messages)):
+            received.acquire()
+        elapsed = time.perf_counter() - start
+        skill.disconnect(park=False)
+
+    return {'messages': messages, 'seconds': elapsed, 'p50': rtt.percentile(50),
+            'p99': rtt.percentile(99)}
+
+
+def bench_transport_throughput(messages: int = 20000, window: int = 500):
+    """Compare discover round trips over TCP, a Unix domain socket and loopback."""
+    tcp_world = LocalWorld().start()
+    socket_dir = tempfile.mkdtemp(prefix='riftclaw-bench-')
+    unix_world = LocalWorld(socket_path=os.path.join(socket_dir, 'world.sock')).start()
+    listener = LoopbackListener('bench_world', unix_world.serve_loopback).start()
+    rows = []
+
+    try:
+        for name, url in (('ws', tcp_world.url), ('ws+unix', unix_world.url),
+                          ('loop', listener.url)):
+            rows.append({'transport': name, **_throughput(url, messages, window)})
+    finally:
+        listener.close()
+
+    # Round trips are timed under load, so they include queueing behind the window
+    print(f"\nTransport throughput: {messages} discover round trips, {window} in flight")
+    print(f"{'transport':<10}{'seconds':>9}{'msgs/s':>10}{'p50 ms':>9}{'p99 ms':>9}")
+    for row in rows:
+        print(f"{row['transport']:<10}{row['seconds']:>9.2f}"
+              f"{row['messages'] / row['seconds']:>10.0f}"
+              f"{row['p50'] * 1000:>9.2f}{row['p99'] * 1000:>9.2f}")
+    return rows
+
+
+def _rate_run(world: LocalWorld, governed: bool, requests: int) -> Dict[str, Any]:
+    """Make `requests` discovers from 4 threads, retrying rejected ones."""
+    RateGovernor.forget()
+    rejected_before = world.rejected
+    with _quiet():
+        skill = RiftClawSkill(config={
+            'agent_name': 'bench_rate', 'default_world': world.url, 'log_level': 'ERROR',
+            'keepalive': {'interval': 0},
+            # Only the world's socket limit applies, not the spec's discover limit
+            'rate_limits': {'enabled': governed, 'limits': {'discover': None}, 'max_wait': 60}
+        })
+        logging.getLogger('riftclaw').setLevel(logging.CRITICAL)
+        skill.connect()
+        skill.wait_for_state([PortalState.CONNECTED], timeout=5)
+        sent = [0]
+        lock = threading.Lock()
+
+        def worker(count: int):
+            for _ in range(count):
+                while True:
+                    with lock:
+                        sent[0] += 1
+                    response = skill._request('discover', 'discover_response')
+                    if response and 'error' not in response:
+                        break
+                    # What a client without a governor does: back off briefly and retry
+                    time.sleep(0.05)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=worker, args=(requests // 4,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        skill.disconnect(park=False)
+
+    return {'seconds': elapsed, 'sent': sent[0], 'rejected': world.rejected - rejected_before}
+
+
+def bench_rate_governor(requests: int = 120, limit: int = 20, window: float = 1.0):
+    """Requests over a world's rate limit: retries vs. the rate governor."""
+    rows = []
+    for label, governed, advertise in (('retry', False, False), ('learned', True, False),
+                                       ('advertised', True, True)):
+        world = LocalWorld(rate_limit=(limit, window), advertise=advertise).start()
+        rows.append({'client': label, **_rate_run(world, governed, requests)})
+
+    print(f"\nRate governor: {requests} discovers, world allows {limit} frames per {window:g}s")
+    print(f"{'client':<12}{'seconds':>9}{'sent':>7}{'rejected':>10}")
+    for row in rows:
+        print(f"{row['client']:<12}{row['seconds']:>9.2f}{row['sent']:>7}{row['rejected']:>10}")
+    return rows
+
+
+def _two_pass_frame(skill: RiftClawSkill, msg_type: str, payload: Dict[str, Any]) -> str:
+    """The frame builder before single-pass signing: copy, dump to sign, dump again."""
+    message = {
+        "type": msg_type,
+        "agent_id": skill.config["agent_id"],
+        "timestamp": time.time(),
+        "request_id": uuid.uuid4().hex,
+        **payload
+    }
+    msg_bytes = json.dumps(
+        {k: v for k, v in message.items() if k != "signature"}, sort_keys=True
+    ).encode('utf-8')
+    signature = skill._signing_key.sign(msg_bytes).signature
+    message["signature"] = base64.b64encode(signature).decode('utf-8')
+    return json.dumps(message)
+
+
+def _verifies(skill: RiftClawSkill, frame: str) -> bool:
+    """Check a frame with the spec's recipe: pop signature, sorted dumps, verify."""
+    message = json.loads(frame)
+    signature = base64.b64decode(message.pop('signature'))
+    try:
+        skill._verify_key.verify(json.dumps(message, sort_keys=True).encode(), signature)
+        return True
+    except Exception:
+        return False
+
+
+def bench_frame_signing(messages: int = 20000):
+    """CPU per signed frame: two serializations per message vs. one."""
+    with _quiet():
+        skill = RiftClawSkill(config={'agent_name': 'bench_frames', 'log_level': 'ERROR',
+                                      'security': {'key_path': None}})
+    passport = skill.create_passport('bench_world', position={'x': 1.5, 'y': 0.0, 'z': -3.25},
+                                     memory_summary='Crossed ' * 20, reputation=4.2)
+    payloads = {
+        'position_update': {'x': 10.5, 'y': 2.0, 'z': -3.7},
+        'handoff_request': {'portal_id': 'portal_bench_01', 'passport': passport.to_dict()},
+    }
+    builders = {
+        'two-pass': lambda msg_type, payload: _two_pass_frame(skill, msg_type, payload),
+        'single-pass': skill._build_frame,
+    }
+
+    rows = []
+    for msg_type, payload in payloads.items():
+        for name, build in builders.items():
+            frame = build(msg_type, payload)
+            start = time.process_time()
+            for _ in range(messages):
+                build(msg_type, payload)
+            cpu = time.process_time() - start
+            rows.append({'message': msg_type, 'builder': name, 'bytes': len(frame),
+                         'us': cpu / messages * 1e6, 'verifies': _verifies(skill, frame)})
+
+    print(f"\nFrame signing: {messages} frames per builder (Ed25519 signing included)")
+    print(f"{'message':<17}{'builder':<13}{'bytes':>7}{'us/frame':>10}{'saved':>8}{'verifies':>10}")
+    for row in rows:
+        baseline = next(r['us'] for r in rows
+                        if r['message'] == row['message'] and r['builder'] == 'two-pass')
+        print(f"{row['message']:<17}{row['builder']:<13}{row['bytes']:>7}{row['us']:>10.1f}"
+              f"{1 - row['us'] / baseline:>8.0%}{str(row['verifies']):>10}")
+    return rows
+
+
+VECTORS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'protocol', 'canonical-vectors.json')
+
+
+def _check_vectors() -> Dict[str, Any]:
+    """Run the shared RFC 8785 vectors through the Python and JavaScript encoders."""
+    with open(VECTORS_PATH) as f:
+        vectors = json.load(f)['vectors']
+    failed = [v['name'] for v in vectors if canonical_dumps(v['input']) != v['canonical']]
+    results = {'vectors': len(vectors), 'python_failures': failed, 'node': None}
+    node = shutil.which('node')
+    if node:
+        script = os.path.join(os.path.dirname(VECTORS_PATH), '..', 'relay', 'canonical.js')
+        completed = subprocess.run([node, script, VECTORS_PATH], capture_output=True, text=True)
+        results['node'] = completed.returncode == 0
+        results['node_output'] = completed.stdout.strip()
+    return results
+
+
+def bench_canonical_json(messages: int = 20000):
+    """Test vectors, then CPU per signed passport and frame for each canonical form."""
+    results = _check_vectors()
+    print(f"\nCanonical JSON vectors: {results['vectors'] - len(results['python_failures'])}"
+          f"/{results['vectors']} pass in Python")
+    for name in results['python_failures']:
+        print(f"  FAIL {name}")
+    if results['node'] is None:
+        print("  node not found; JavaScript encoder not checked")
+    else:
+        print(f"  node: {results['node_output']}")
+
+    skills = {}
+    with _quiet():
+        for form in FORMS:
+            skills[form] = RiftClawSkill(config={'agent_name': 'bench_canonical', 'log_level': 'ERROR',
+                                                 'security': {'key_path': None, 'canonical_json': form}})
+    passport = skills['python'].create_passport(
+        'bench_world', position={'x': 1.5, 'y': 0.0, 'z': -3.25},
+        memory_summary='Crossed ' * 20, reputation=4.2
+    )
+    sign = skills['python']._signing_key.sign
+    cases = {
+        'passport': {
+            # Encoded afresh each time; to_bytes() would return its cached bytes
+            'python': lambda: sign(FORMS['python'].encode(passport.signed_fields())),
+            'jcs-generic': lambda: sign(canonical_dumps(passport.signed_fields()).encode('utf-8')),
+            'jcs': lambda: sign(FORMS['jcs'].encode(passport.signed_fields(), PASSPORT_SHAPE)),
+        },
+        'discover': {
+            form: (lambda skill=skill: skill._build_frame('discover')) for form, skill in skills.items()
+        },
+        'handoff_request': {
+            form: (lambda skill=skill: skill._build_frame(
+                'handoff_request', {'portal_id': 'portal_bench_01', 'passport': passport.to_dict()}
+            )) for form, skill in skills.items()
+        },
+    }
+
+    rows = []
+    for case, encoders in cases.items():
+        for name, run in encoders.items():
+            run()
+            start = time.process_time()
+            for _ in range(messages):
+                run()
+            cpu = time.process_time() - start
+            rows.append({'signed': case, 'form': name, 'us': cpu / messages * 1e6,
+                         'per_second': messages / cpu if cpu else float('inf')})
+
+    print(f"\nSigning throughput: {messages} signatures per form (Ed25519 signing included)")
+    print(f"{'signed':<17}{'form':<13}{'us/sig':>9}{'sigs/s':>10}{'vs python':>11}")
+    for row in rows:
+        baseline = next(r['us'] for r in rows if r['signed'] == row['signed'] and r['form'] == 'python')
+        print(f"{row['signed']:<17}{row['form']:<13}{row['us']:>9.1f}{row['per_second']:>10.0f}"
+              f"{row['us'] / baseline - 1:>+11.0%}")
+    return {'vectors': results, 'rows': rows}
+
+
+BENCHMARKS = {
+    'fleet-memory': bench_fleet_memory,
+    'transport-throughput': bench_transport_throughput,
+    'idle-hibernation': bench_idle_hibernation,
+    'shard-scaling': bench_shard_scaling,
+    'rate-governor': bench_rate_governor,
+    'frame-signing': bench_frame_signing,
+    'canonical-json': bench_canonical_json,
+}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='RiftClaw benchmarks')
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('--agents', type=int, default=500)
+    parser.add_argument('--messages', type=int, default=20000)
+    parser.add_argument('--requests', type=int, default=120)
+    args = parser.parse_args()
+
+    if args.benchmark == 'fleet-memory':
+        bench_fleet_memory(agents=args.agents)
+    elif args.benchmark == 'transport-throughput':
+        bench_transport_throughput(messages=args.messages)
+    elif args.benchmark == 'idle-hibernation':
+        bench_idle_hibernation(agents=args.agents)
+    elif args.benchmark == 'shard-scaling':
+        bench_shard_scaling(agents=args.agents)
+    elif args.benchmark == 'rate-governor':
+        bench_rate_governor(requests=args.requests)
+    elif args.benchmark == 'frame-signing':
+        bench_frame_signing(messages=args.messages)
+    elif args.benchmark == 'canonical-json':
+        bench_canonical_json(messages=args.messages)
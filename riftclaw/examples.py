@@ -243,15 +243,31 @@ def example_9_event_handlers():
     
     skill = RiftClawSkill()
     
-    # Register custom handler for specific message type
+    # Quick handlers can run inline on the reader
     def on_custom_event(data):
         print(f"Received custom event: {data}")
     
-    skill._message_handlers['custom_event'] = on_custom_event
-    print("Registered custom event handler")
+    skill.subscribe('custom_event', on_custom_event)
     
-    # Now messages of type 'custom_event' will trigger the handler
-    print("Handlers registered:", list(skill._message_handlers.keys()))
+    # Slow work goes to the handler thread pool, so it never delays
+    # other traffic such as handoff confirmations
+    def log_arrival(data):
+        print(f"Handoff confirmed to {data.get('passport', {}).get('target_world')}")
+    
+    skill.subscribe('handoff_confirm', log_arrival, mode='thread')
+    
+    # Predicates filter messages before a handler is called
+    rare = skill.subscribe(
+        'custom_event', lambda data: print("Rare event!"),
+        predicate=lambda data: data.get('rarity') == 'legendary'
+    )
+    print("Registered custom event handlers")
+    
+    # Per-handler call counts and run times
+    for stats in skill.get_status()['subscribers']:
+        print(f"  {stats['msg_type']}: {stats['handler']} ({stats['mode']})")
+    
+    skill.unsubscribe(rare)
 
 
 def example_10_full_workflow():
@@ -0,0 +1,50 @@
+#!/usr/bin/env node
+/**
+ * RiftClaw Canonical JSON (RFC 8785 / JCS)
+ *
+ * The bytes a `jcs` signature covers: keys sorted by UTF-16 code units,
+ * no whitespace, and strings and numbers as JSON.stringify writes them.
+ * Matches skill/canonical.py.
+ *
+ * Run directly to check the shared test vectors:
+ *   node canonical.js [../protocol/canonical-vectors.json]
+ */
+
+const fs = require('fs');
+const path = require('path');
+
+function canonicalize(value) {
+  if (value === null || typeof value !== 'object') {
+    if (typeof value === 'number' && !Number.isFinite(value)) {
+      throw new RangeError(`${value} is not allowed in canonical JSON`);
+    }
+    return JSON.stringify(value);
+  }
+  if (Array.isArray(value)) {
+    return '[' + value.map(canonicalize).join(',') + ']';
+  }
+  // The default sort compares UTF-16 code units, as RFC 8785 requires
+  const keys = Object.keys(value).sort();
+  return '{' + keys.map((key) => JSON.stringify(key) + ':' + canonicalize(value[key])).join(',') + '}';
+}
+
+function checkVectors(file) {
+  const { vectors } = JSON.parse(fs.readFileSync(file, 'utf8'));
+  let failed = 0;
+  for (const vector of vectors) {
+    const actual = canonicalize(vector.input);
+    if (actual !== vector.canonical) {
+      failed++;
+      console.log(`FAIL ${vector.name}\n  expected ${vector.canonical}\n  actual   ${actual}`);
+    }
+  }
+  console.log(`${vectors.length - failed}/${vectors.length} canonical JSON vectors passed`);
+  return failed === 0;
+}
+
+module.exports = { canonicalize };
+
+if (require.main === module) {
+  const file = process.argv[2] || path.join(__dirname, '..', 'protocol', 'canonical-vectors.json');
+  process.exit(checkVectors(file) ? 0 : 1);
+}
@@ -7,10 +7,14 @@
  */
 
 const WebSocket = require('ws');
+const fs = require('fs');
+const http = require('http');
 
 // Configuration
 const PORT = process.env.PORT || 8765;
 const HOST = process.env.HOST || '0.0.0.0';
+// Listen on a Unix domain socket instead, for skills on the same host
+const SOCKET_PATH = process.env.SOCKET_PATH;
 
 // State management
 const connections = new Map();
@@ -33,6 +37,55 @@ function createMessage(type, payload = {}) {
   });
 }
 
+// Replies echo the request's request_id and agent_id so clients can
+// correlate them, including when several agents share one socket
+function createReply(request, type, payload = {}) {
+  const echo = {};
+  if (request && request.request_id) echo.request_id = request.request_id;
+  if (request && request.agent_id) echo.agent_id = request.agent_id;
+  return createMessage(type, { ...payload, ...echo });
+}
+
+// Requests replayed after a client reconnects (same agent_id and
+// request_id) are answered again instead of being executed twice
+const REPLAY_CACHE_SIZE = 1000;
+const handledRequests = new Map(); // "agent_id:request_id" -> { ws, reply }
+const pendingHandoffs = new Map(); // "agent_id:request_id" -> { timer, targetWorld }
+
+function replayKey(message) {
+  return message.agent_id && message.request_id
+    ? `${message.agent_id}:${message.request_id}`
+    : null;
+}
+
+// Returns true if the request was already handled (and answers the replay)
+function answerReplay(ws, message) {
+  const key = replayKey(message);
+  if (!key) return false;
+  const entry = handledRequests.get(key);
+  if (!entry) {
+    handledRequests.set(key, { ws, reply: null });
+    if (handledRequests.size > REPLAY_CACHE_SIZE) {
+      handledRequests.delete(handledRequests.keys().next().value);
+    }
+    return false;
+  }
+  console.log(`[Replay] ${message.type} ${message.request_id} already handled`);
+  entry.ws = ws; // Still in flight: answer on the new socket
+  if (entry.reply) ws.send(entry.reply);
+  return true;
+}
+
+// Send a reply, remembering it for replays of the same request
+function sendReply(ws, message, reply) {
+  const entry = handledRequests.get(replayKey(message));
+  if (entry) {
+    entry.reply = reply;
+    ws = entry.ws;
+  }
+  ws.send(reply);
+}
+
 // Message handlers
 const handlers = {
   // World registration
@@ -55,7 +108,7 @@ const handlers = {
     conn.worldName = world_name;
     conn.isWorld = true;
     
-    ws.send(createMessage('register_confirm', {
+    ws.send(createReply(message, 'register_confirm', {
       world_name: world_name,
       status: 'registered'
     }));
@@ -94,7 +147,7 @@ const handlers = {
       }
     });
 
-    ws.send(createMessage('discover_response', { 
+    ws.send(createReply(message, 'discover_response', { 
       portals,
       registered_worlds: worlds.size
     }));
@@ -107,6 +160,8 @@ const handlers = {
     const conn = connections.get(ws);
     if (!conn) return;
 
+    if (answerReplay(ws, message)) return;
+
     const { portal_id, passport } = message;
     const targetWorld = passport?.target_world;
     
@@ -125,12 +180,15 @@ const handlers = {
         
         console.log(`[Handoff] Forwarded to ${targetWorld}`);
         
-        setTimeout(() => {
-          ws.send(createMessage('handoff_confirm', {
+        const key = replayKey(message);
+        const timer = setTimeout(() => {
+          if (key) pendingHandoffs.delete(key);
+          sendReply(ws, message, createReply(message, 'handoff_confirm', {
             passport: passport,
             target_url: worldData.url
           }));
         }, 500);
+        if (key) pendingHandoffs.set(key, { timer, targetWorld });
         
         return;
       } catch (e) {
@@ -138,7 +196,7 @@ const handlers = {
       }
     }
 
-    ws.send(createMessage('handoff_rejected', {
+    sendReply(ws, message, createReply(message, 'handoff_rejected', {
       reason: 'unknown_destination',
       details: `World '${targetWorld}' not found`
     }));
@@ -151,15 +209,34 @@ const handlers = {
     console.log(`[Handoff] ${worldName} acknowledged`);
   },
 
+  // Agent withdrawing a handoff_request (another portal confirmed first)
+  handoff_cancel(ws, message) {
+    const key = replayKey(message);
+    const pending = key && pendingHandoffs.get(key);
+    if (!pending) return;
+
+    clearTimeout(pending.timer);
+    pendingHandoffs.delete(key);
+    console.log(`[Handoff] Agent ${message.agent_id} cancelled ${message.request_id}`);
+
+    const worldData = worlds.get(pending.targetWorld);
+    if (worldData && worldData.ws.readyState === WebSocket.OPEN) {
+      worldData.ws.send(createMessage('handoff_cancel', {
+        portal_id: message.portal_id,
+        from_agent: message.agent_id
+      }));
+    }
+  },
+
   // Keep-alive ping
   ping(ws, message) {
-    ws.send(createMessage('pong', { timestamp: getTimestamp() }));
+    ws.send(createReply(message, 'pong', { timestamp: getTimestamp() }));
   },
 
   // Default handler
   default(ws, message) {
     console.log(`[Unknown] Message type: ${message.type}`);
-    ws.send(createMessage('error', {
+    ws.send(createReply(message, 'error', {
       code: 'UNKNOWN_TYPE',
       message: `Unknown message type: ${message.type}`
     }));
@@ -167,7 +244,16 @@ const handlers = {
 };
 
 // Create WebSocket server
-const wss = new WebSocket.Server({ port: PORT, host: HOST });
+let wss;
+if (SOCKET_PATH) {
+  // Remove a socket file left behind by a previous run
+  try { fs.unlinkSync(SOCKET_PATH); } catch (e) {}
+  const server = http.createServer();
+  server.listen(SOCKET_PATH);
+  wss = new WebSocket.Server({ server });
+} else {
+  wss = new WebSocket.Server({ port: PORT, host: HOST });
+}
 
 console.log(`
 ╔══════════════════════════════════════════════════╗
@@ -178,7 +264,7 @@ console.log(`
 ║                                                  ║
 ╚══════════════════════════════════════════════════╝
 
-WebSocket: wss://${HOST}:${PORT}
+WebSocket: ${SOCKET_PATH ? `ws+unix://${SOCKET_PATH}` : `wss://${HOST}:${PORT}`}
 Max connections: 100
 
 Worlds should connect to this relay and register.
@@ -199,6 +285,7 @@ wss.on('connection', (ws, req) => {
     ip: clientIp,
     connectedAt: Date.now(),
     agentId: null,
+    agentIds: new Set(), // every agent multiplexed over this socket
     worldName: null,
     isWorld: false
   });
@@ -206,7 +293,7 @@ wss.on('connection', (ws, req) => {
   ws.send(createMessage('welcome', {
     world_name: 'RiftClaw Relay',
     version: '0.2.0',
-    capabilities: ['portals', 'relay'],
+    capabilities: ['portals', 'relay', 'multiplex'],
     relay_id: connectionId
   }));
 
@@ -215,8 +302,11 @@ wss.on('connection', (ws, req) => {
       const message = JSON.parse(data);
       const conn = connections.get(ws);
 
-      if (message.agent_id && !conn.agentId) {
-        conn.agentId = message.agent_id;
+      if (message.agent_id) {
+        if (!conn.agentId) {
+          conn.agentId = message.agent_id;
+        }
+        conn.agentIds.add(message.agent_id);
       }
 
       const handler = handlers[message.type] || handlers.default;
@@ -8,11 +8,14 @@
 
 const WebSocket = require('ws');
 const fs = require('fs');
+const http = require('http');
 const path = require('path');
 
 // Configuration
 const PORT = process.env.PORT || 8765;
 const HOST = process.env.HOST || '0.0.0.0';
+// Listen on a Unix domain socket instead, for skills on the same host
+const SOCKET_PATH = process.env.SOCKET_PATH;
 const CONFIG_PATH = process.env.CONFIG || path.join(__dirname, 'config.json');
 
 // Load or create default config
@@ -62,6 +65,55 @@ function createMessage(type, payload = {}) {
   });
 }
 
+// Replies echo the request's request_id and agent_id so clients can
+// correlate them, including when several agents share one socket
+function createReply(request, type, payload = {}) {
+  const echo = {};
+  if (request && request.request_id) echo.request_id = request.request_id;
+  if (request && request.agent_id) echo.agent_id = request.agent_id;
+  return createMessage(type, { ...payload, ...echo });
+}
+
+// Requests replayed after a client reconnects (same agent_id and
+// request_id) are answered again instead of being executed twice
+const REPLAY_CACHE_SIZE = 1000;
+const handledRequests = new Map(); // "agent_id:request_id" -> { ws, reply }
+const pendingHandoffs = new Map(); // "agent_id:request_id" -> { timer, targetWorld }
+
+function replayKey(message) {
+  return message.agent_id && message.request_id
+    ? `${message.agent_id}:${message.request_id}`
+    : null;
+}
+
+// Returns true if the request was already handled (and answers the replay)
+function answerReplay(ws, message) {
+  const key = replayKey(message);
+  if (!key) return false;
+  const entry = handledRequests.get(key);
+  if (!entry) {
+    handledRequests.set(key, { ws, reply: null });
+    if (handledRequests.size > REPLAY_CACHE_SIZE) {
+      handledRequests.delete(handledRequests.keys().next().value);
+    }
+    return false;
+  }
+  console.log(`[Replay] ${message.type} ${message.request_id} already handled`);
+  entry.ws = ws; // Still in flight: answer on the new socket
+  if (entry.reply) ws.send(entry.reply);
+  return true;
+}
+
+// Send a reply, remembering it for replays of the same request
+function sendReply(ws, message, reply) {
+  const entry = handledRequests.get(replayKey(message));
+  if (entry) {
+    entry.reply = reply;
+    ws = entry.ws;
+  }
+  ws.send(reply);
+}
+
 // Rate limiter (simple in-memory)
 class RateLimiter {
   constructor(windowMs = 60000, maxRequests = 30) {
@@ -91,6 +143,18 @@ class RateLimiter {
     return true;
   }
 
+  // Seconds until the oldest request in the window expires
+  retryAfter(ws) {
+    const history = this.requests.get(ws) || [];
+    if (history.length === 0) return 0;
+    return Math.max(0, (history[0] + this.windowMs - Date.now()) / 1000);
+  }
+
+  // Advertised to clients in the welcome and in RATE_LIMITED errors
+  describe() {
+    return { limit: this.maxRequests, window: this.windowMs / 1000 };
+  }
+
   remove(ws) {
     this.requests.delete(ws);
   }
@@ -123,7 +187,7 @@ const handlers = {
     conn.worldName = world_name;
     conn.isWorld = true;
     
-    ws.send(createMessage('register_confirm', {
+    ws.send(createReply(message, 'register_confirm', {
       world_name: world_name,
       status: 'registered'
     }));
@@ -182,7 +246,7 @@ const handlers = {
       }
     });
 
-    ws.send(createMessage('discover_response', { 
+    ws.send(createReply(message, 'discover_response', { 
       portals,
       registered_worlds: worlds.size
     }));
@@ -193,6 +257,8 @@ const handlers = {
     const conn = connections.get(ws);
     if (!conn) return;
 
+    if (answerReplay(ws, message)) return;
+
     const { portal_id, passport } = message;
     const targetWorld = passport?.target_world;
     
@@ -212,13 +278,15 @@ const handlers = {
         
         console.log(`[Handoff] Forwarded to registered world '${targetWorld}'`);
         
-        // Wait for response (in a real implementation, we'd track this)
-        setTimeout(() => {
-          ws.send(createMessage('handoff_confirm', {
+        const key = replayKey(message);
+        const timer = setTimeout(() => {
+          if (key) pendingHandoffs.delete(key);
+          sendReply(ws, message, createReply(message, 'handoff_confirm', {
             passport: passport,
             target_url: worldData.url
           }));
         }, 500);
+        if (key) pendingHandoffs.set(key, { timer, targetWorld });
         
         return;
       } catch (e) {
@@ -227,7 +295,7 @@ const handlers = {
     }
 
     // Unknown destination
-    ws.send(createMessage('handoff_rejected', {
+    sendReply(ws, message, createReply(message, 'handoff_rejected', {
       reason: 'unknown_destination',
       details: `World '${targetWorld}' not found in relay registry`
     }));
@@ -243,9 +311,28 @@ const handlers = {
     // Don't broadcast this - the relay already handled the confirm
   },
 
+  // Agent withdrawing a handoff_request (another portal confirmed first)
+  handoff_cancel(ws, message) {
+    const key = replayKey(message);
+    const pending = key && pendingHandoffs.get(key);
+    if (!pending) return;
+
+    clearTimeout(pending.timer);
+    pendingHandoffs.delete(key);
+    console.log(`[Handoff] Agent ${message.agent_id} cancelled ${message.request_id}`);
+
+    const worldData = worlds.get(pending.targetWorld);
+    if (worldData && worldData.ws.readyState === WebSocket.OPEN) {
+      worldData.ws.send(createMessage('handoff_cancel', {
+        portal_id: message.portal_id,
+        from_agent: message.agent_id
+      }));
+    }
+  },
+
   // Keep-alive ping from worlds to prevent idle timeout
   ping(ws, message) {
-    ws.send(createMessage('pong', { timestamp: getTimestamp() }));
+    ws.send(createReply(message, 'pong', { timestamp: getTimestamp() }));
   },
 
   // Admin/debug: list all connections
@@ -256,16 +343,17 @@ const handlers = {
       agents: Array.from(connections.values()).map(c => ({
         id: c.id,
         worldName: c.worldName,
-        isWorld: c.isWorld
+        isWorld: c.isWorld,
+        agents: c.agentIds.size
       }))
     };
-    ws.send(createMessage('admin_status_response', status));
+    ws.send(createReply(message, 'admin_status_response', status));
   },
 
   // Default handler for unknown types
   default(ws, message) {
     console.log(`[Unknown] Message type: ${message.type}`);
-    ws.send(createMessage('error', {
+    ws.send(createReply(message, 'error', {
       code: 'UNKNOWN_TYPE',
       message: `Unknown message type: ${message.type}`
     }));
@@ -273,7 +361,16 @@ const handlers = {
 };
 
 // Create WebSocket server
-const wss = new WebSocket.Server({ port: PORT, host: HOST });
+let wss;
+if (SOCKET_PATH) {
+  // Remove a socket file left behind by a previous run
+  try { fs.unlinkSync(SOCKET_PATH); } catch (e) {}
+  const server = http.createServer();
+  server.listen(SOCKET_PATH);
+  wss = new WebSocket.Server({ server });
+} else {
+  wss = new WebSocket.Server({ port: PORT, host: HOST });
+}
 
 console.log(`
 ╔══════════════════════════════════════════════════╗
@@ -282,7 +379,7 @@ console.log(`
 ║                                                  ║
 ╚══════════════════════════════════════════════════╝
 
-Listening on: ws://${HOST}:${PORT}
+Listening on: ${SOCKET_PATH ? `ws+unix://${SOCKET_PATH}` : `ws://${HOST}:${PORT}`}
 Max connections: ${config.relay.maxConnections}
 Rate limit: ${config.relay.rateLimitMaxRequests} req/${config.relay.rateLimitWindowMs}ms
 
@@ -312,6 +409,7 @@ wss.on('connection', (ws, req) => {
     ip: clientIp,
     connectedAt: Date.now(),
     agentId: null,
+    agentIds: new Set(), // every agent multiplexed over this socket
     state: 'connected'
   });
 
@@ -319,17 +417,24 @@ wss.on('connection', (ws, req) => {
   ws.send(createMessage('welcome', {
     world_name: config.relay.name,
     version: config.relay.version,
-    capabilities: ['portals', 'relay'],
-    relay_id: connectionId
+    capabilities: ['portals', 'relay', 'multiplex'],
+    relay_id: connectionId,
+    rate_limits: { '*': rateLimiter.describe() }
   }));
 
   // Handle messages
   ws.on('message', (data) => {
     // Rate limit check
     if (!rateLimiter.check(ws)) {
-      ws.send(createMessage('error', {
+      // Echo the IDs when the frame parses, so only that request fails
+      let rejected = {};
+      try { rejected = JSON.parse(data); } catch (e) {}
+      ws.send(createReply(rejected, 'error', {
         code: 'RATE_LIMITED',
-        message: 'Too many requests, please slow down'
+        message: 'Too many requests, please slow down',
+        scope: '*',
+        retry_after: rateLimiter.retryAfter(ws),
+        ...rateLimiter.describe()
       }));
       return;
     }
@@ -340,14 +445,21 @@ wss.on('connection', (ws, req) => {
 
       console.log(`[Message] Type: ${message.type} from ${conn?.id || 'unknown'}`);
 
-      // Store agent ID from first message
-      if (message.agent_id && !conn.agentId) {
-        conn.agentId = message.agent_id;
-        agentSessions.set(message.agent_id, {
-          connectionId: conn.id,
-          connectedAt: conn.connectedAt,
-          lastSeen: Date.now()
-        });
+      // Track every agent seen on this socket (one, or many when multiplexed)
+      if (message.agent_id) {
+        if (!conn.agentId) {
+          conn.agentId = message.agent_id;
+        }
+        if (!conn.agentIds.has(message.agent_id)) {
+          conn.agentIds.add(message.agent_id);
+          agentSessions.set(message.agent_id, {
+            connectionId: conn.id,
+            connectedAt: conn.connectedAt,
+            lastSeen: Date.now()
+          });
+        } else if (agentSessions.has(message.agent_id)) {
+          agentSessions.get(message.agent_id).lastSeen = Date.now();
+        }
       }
 
       // Route to handler
@@ -369,9 +481,7 @@ wss.on('connection', (ws, req) => {
     console.log(`[Disconnect] ${conn?.id || 'unknown'} closed (${code}): ${reason}`);
     
     // Clean up
-    if (conn?.agentId) {
-      agentSessions.delete(conn.agentId);
-    }
+    conn?.agentIds.forEach(agentId => agentSessions.delete(agentId));
     
     // Clean up registered world
     if (conn?.worldName) {
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Admission - Waiting in Line for a Full World
+=====================================================
+A world at capacity answers handoff requests with `handoff_rejected`
+(reason `capacity`), and one over its rate limit with a `RATE_LIMITED`
+error. Agents that simply retry turn a popular world's surge into a retry
+storm: every agent in the process hammers it again the moment its own
+backoff ends.
+
+Rejection parses either reply into a reason, details and the world's
+`retry_after`. AdmissionWaitlist queues the agents of a process that are
+bound for the same world once it has turned one away: a single agent at
+a time probes it, after the world's `retry_after` plus jitter, and the
+others wait for the result. Each admission lets the next agent in line
+try straight away; each rejection pushes the next try back. Once no one
+is waiting the world is treated as open again.
+
+Version: 0.1.0
+Author: OpenClaw Framework
+"""
+
+import asyncio
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Optional, Any, Tuple
+
+try:
+    from .resilience import RetryPolicy
+except ImportError:
+    from resilience import RetryPolicy
+
+# Rejections that say "not now" rather than "not you"
+RETRYABLE_REASONS = ('capacity', 'rate_limited')
+
+
+@dataclass
+class Rejection:
+    """Why a world turned a handoff away."""
+    reason: str
+    details: str = ""
+    retry_after: Optional[float] = None
+    code: Optional[str] = None
+
+    @property
+    def retryable(self) -> bool:
+        """Whether the same request may be admitted later."""
+        return self.reason in RETRYABLE_REASONS
+
+    @classmethod
+    def from_message(cls, data: Dict[str, Any]) -> 'Rejection':
+        """
+        Parse a `handoff_rejected` or `error` message.
+
+        `handoff_rejected` carries a `reason`; an error's `code` becomes
+        the reason in lower case (`RATE_LIMITED` -> `rate_limited`).
+        """
+        code = data.get('code')
+        reason = data.get('reason') or (str(code).lower() if code else 'custom')
+        try:
+            retry_after = float(data['retry_after']) if data.get('retry_after') is not None else None
+        except (TypeError, ValueError):
+            retry_after = None
+        return cls(
+            reason=reason,
+            details=data.get('details') or data.get('message') or "",
+            retry_after=retry_after,
+            code=code
+        )
+
+
+def _resolve(waker: asyncio.Future):
+    if not waker.done():
+        waker.set_result(None)
+
+
+class AdmissionWaitlist:
+    """
+    Per-destination queue of the agents in this process waiting to enter.
+
+    An agent join()s, waits for its turn, makes its attempt and reports
+    admitted() or rejected(), and finally leave()s. While the destination
+    has not turned anyone away every turn comes at once. After a rejection
+    turns are handed out in arrival order, one probe in flight at a time:
+    the first in line waits until the retry time, the rest until the probe
+    ahead of them is answered. Threads wait on a condition; coroutines
+    on a future per ticket, resolved on their own loop.
+    """
+
+    _registry: Dict[str, 'AdmissionWaitlist'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, destination: str, jitter: float = 0.25,
+                 policy: Optional[RetryPolicy] = None):
+        """
+        Args:
+            destination: World the agents are bound for
+            jitter: Fraction of `retry_after` added at random to each wait
+            policy: Backoff for rejections that give no `retry_after`
+        """
+        self.destination = destination
+        self.jitter = jitter
+        self.policy = policy or RetryPolicy()
+        self._condition = threading.Condition()
+        self._tickets = itertools.count(1)
+        self._queue: deque = deque()
+        self._prober: Optional[int] = None
+        self._wakers: Dict[int, Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._full = False
+        self._retry_at = 0.0
+        self._attempts = 0
+        self.last_rejection: Optional[Rejection] = None
+        self.rejections = 0
+        self.admissions = 0
+        self.probes = 0
+
+    @classmethod
+    def for_destination(cls, destination: str, **settings) -> 'AdmissionWaitlist':
+        """The process-wide waitlist for `destination`, created with `settings` if new."""
+        with cls._registry_lock:
+            waitlist = cls._registry.get(destination)
+            if waitlist is None:
+                waitlist = cls._registry[destination] = cls(destination, **settings)
+            return waitlist
+
+    @classmethod
+    def from_config(cls, destination: str, config: Dict[str, Any]) -> 'AdmissionWaitlist':
+        """The process-wide waitlist for `destination`, using a skill config's settings."""
+        settings = config.get('admission') or {}
+        return cls.for_destination(
+            destination,
+            jitter=settings.get('jitter', 0.25),
+            policy=RetryPolicy.from_config(config)
+        )
+
+    @classmethod
+    def snapshot_all(cls) -> Dict[str, Dict[str, Any]]:
+        """Status of every waitlist in the process."""
+        with cls._registry_lock:
+            waitlists = list(cls._registry.values())
+        return {waitlist.destination: waitlist.snapshot() for waitlist in waitlists}
+
+    @classmethod
+    def reset_all(cls):
+        """Forget every waitlist (mainly for tests and benchmarks)."""
+        with cls._registry_lock:
+            cls._registry.clear()
+
+    def join(self) -> int:
+        """Get in line; returns the ticket for the other calls."""
+        with self._condition:
+            ticket = next(self._tickets)
+            self._queue.append(ticket)
+            return ticket
+
+    def _turn(self, ticket: int) -> Optional[float]:
+        """
+        0.0 if `ticket` may make its attempt now, else seconds until it
+        may, or None while it waits on someone else's attempt.
+        """
+        if not self._full:
+            self._discard(ticket)
+            return 0.0
+        if self._prober is not None:
+            return 0.0 if self._prober == ticket else None
+        if not self._queue or self._queue[0] != ticket:
+            return None
+        wait = self._retry_at - time.monotonic()
+        if wait > 0:
+            return wait
+        self._queue.popleft()
+        self._prober = ticket
+        self.probes += 1
+        return 0.0
+
+    def turn(self, ticket: int) -> Optional[float]:
+        """See _turn(); does not block."""
+        with self._condition:
+            return self._turn(ticket)
+
+    def wait_turn(self, ticket: int, deadline: float) -> bool:
+        """
+        Block until `ticket` may make its attempt.
+
+        Returns:
+            False if `deadline` (time.monotonic()) passed first
+        """
+        with self._condition:
+            while True:
+                wait = self._turn(ticket)
+                if wait == 0:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining if wait is None else min(wait, remaining))
+
+    async def wait_turn_async(self, ticket: int, deadline: float) -> bool:
+        """wait_turn() for coroutines."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                wait = self._turn(ticket)
+                if wait == 0:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                waker = loop.create_future()
+                self._wakers[ticket] = (loop, waker)
+            try:
+                await asyncio.wait_for(waker, remaining if wait is None else min(wait, remaining))
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._condition:
+                    if self._wakers.get(ticket, (None, None))[1] is waker:
+                        del self._wakers[ticket]
+
+    def _notify(self):
+        """Wake every waiting thread and coroutine (caller holds the lock)."""
+        self._condition.notify_all()
+        for loop, waker in self._wakers.values():
+            try:
+                loop.call_soon_threadsafe(_resolve, waker)
+            except RuntimeError:  # Loop closed; nobody is waiting there
+                pass
+
+    def admitted(self, ticket: int):
+        """`ticket`'s attempt got in; the next in line may try at once."""
+        with self._condition:
+            if self._prober == ticket:
+                self._prober = None
+            self._discard(ticket)
+            self.admissions += 1
+            self._attempts = 0
+            self._retry_at = time.monotonic()
+            if not self._queue:
+                self._full = False
+            self._notify()
+
+    def rejected(self, ticket: int, rejection: Rejection) -> float:
+        """
+        `ticket`'s attempt was turned away; it goes back to the front.
+
+        Only a probe, or the first rejection after the retry time, pushes
+        the next attempt back: agents that went in together before the
+        world was known to be full do not add up their backoffs.
+
+        Returns:
+            Seconds until the next attempt
+        """
+        with self._condition:
+            now = time.monotonic()
+            probing = self._prober == ticket
+            if probing:
+                self._prober = None
+            self._full = True
+            self.rejections += 1
+            self.last_rejection = rejection
+            if probing or now >= self._retry_at:
+                self._attempts += 1
+                self._retry_at = max(self._retry_at, now + self._delay(rejection))
+            self._discard(ticket)
+            self._queue.appendleft(ticket)
+            self._notify()
+            return max(0.0, self._retry_at - now)
+
+    def leave(self, ticket: int):
+        """Get out of line (after admission, or giving up)."""
+        with self._condition:
+            if self._prober == ticket:
+                self._prober = None
+            self._discard(ticket)
+            self._notify()
+
+    def _delay(self, rejection: Rejection) -> float:
+        """The world's retry_after plus jitter, or the policy's backoff."""
+        if rejection.retry_after:
+            return rejection.retry_after * (1 + random.uniform(0, self.jitter))
+        return self.policy.delay(self._attempts)
+
+    def _discard(self, ticket: int):
+        try:
+            self._queue.remove(ticket)
+        except ValueError:
+            pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Queue length, probe state and counters."""
+        with self._condition:
+            return {
+                'full': self._full,
+                'waiting': len(self._queue),
+                'probing': self._prober is not None,
+                'retry_in': max(0.0, self._retry_at - time.monotonic()) if self._full else 0.0,
+                'rejections': self.rejections,
+                'admissions': self.admissions,
+                'probes': self.probes,
+                'last_reason': self.last_rejection.reason if self.last_rejection else None
+            }
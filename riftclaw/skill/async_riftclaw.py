@@ -0,0 +1,832 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Async Skill - asyncio-native Portal Traversal
+======================================================
+Runs the RiftClaw client on an asyncio event loop. Connections, discovery
+and handoffs resolve through futures, so thousands of agents can share a
+single loop instead of each holding a WebSocket thread.
+
+Version: 0.1.0
+Author: OpenClaw Framework
+"""
+
+import asyncio
+import json
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple, Union
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+from .outbound import Lane, OutboundQueue, drain, lane_for
+from .resilience import RetryPolicy
+from .riftclaw import (
+    RiftClawSkill,
+    Portal,
+    PortalState,
+    RiftError,
+    ConnectionError,
+    HandoffError,
+    HandoffRejectedError,
+    logger,
+)
+
+
+class AsyncRiftClawSkill(RiftClawSkill):
+    """
+    asyncio variant of RiftClawSkill.
+
+    Configuration, keys, passports, signature verification and message
+    handlers are shared with RiftClawSkill. Only the transport and the way
+    callers wait differ: every network method is a coroutine.
+    """
+
+    def __init__(self, config_path: Optional[str] = None,
+                 config: Optional[Dict[str, Any]] = None,
+                 identity: Optional[RiftClawSkill] = None):
+        """
+        Initialize the async RiftClaw skill.
+
+        Args:
+            config_path: Path to YAML configuration file (auto-detected if None)
+            config: Overrides merged on top of the file config
+            identity: Another skill of the same agent whose config, keys
+                and connection pool are shared
+        """
+        super().__init__(config_path, config, identity)
+        self._reader_task: Optional[asyncio.Task] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._outbox: Optional[OutboundQueue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._url: Optional[str] = None
+        # Created on first use: skills are often built outside the loop
+        # they run on, and before Python 3.10 a Lock binds to the loop
+        # current when it is made
+        self._hibernate_lock: Optional[asyncio.Lock] = None
+
+    def _hibernation_lock(self) -> asyncio.Lock:
+        if self._hibernate_lock is None:
+            self._hibernate_lock = asyncio.Lock()
+        return self._hibernate_lock
+
+    def _link_outbox(self) -> Optional[OutboundQueue]:
+        return self._outbox if self._outbox is not None else getattr(self.ws, 'outbox', None)
+
+    def _handshake_timings(self) -> Dict[str, Any]:
+        if not self._setup or not self._url or not self.ws:
+            return {}
+        return self._setup.timings(self._url)
+
+    def _owns_link(self) -> bool:
+        return self._outbox is not None
+
+    def _link_url(self) -> Optional[str]:
+        return self._url
+
+    def _send_ping(self, frame: str) -> bool:
+        return self._outbox is not None and self._outbox.put(frame, Lane.CONTROL)
+
+    def _abort_link(self):
+        transport = getattr(self.ws, 'transport', None)
+        if transport is not None:
+            transport.abort()
+
+    def _start_keepalive(self):
+        """Run the keepalive task for the active socket unless one is running."""
+        if not (self._keepalive_settings()[0] or self._idle_after()):
+            return
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+    async def _keepalive_loop(self):
+        """
+        Ping, and hibernate when idle, until the socket goes away; the next
+        adoption restarts it.
+        """
+        while True:
+            now = time.monotonic()
+            due = self._hibernation_due(now)
+            if due == 0:
+                if await self.hibernate() is not None:
+                    return
+                due = None
+            delays = [d for d in (due, self._keepalive_tick(now)) if d is not None]
+            if not delays:
+                return
+            await asyncio.sleep(min(delays))
+
+    def _create_future(self) -> asyncio.Future:
+        """Pending requests resolve through futures on the running loop."""
+        return asyncio.get_running_loop().create_future()
+
+    async def wait_for_state(self, states, timeout: Optional[float] = None) -> Optional[PortalState]:
+        """
+        Wait until the skill reaches one of `states` without blocking the loop.
+
+        Args:
+            states: A PortalState or a collection of them
+            timeout: Seconds to wait (None waits forever)
+
+        Returns:
+            The state reached, or None on timeout
+        """
+        targets = {states} if isinstance(states, PortalState) else set(states)
+        if self.state in targets:
+            return self.state
+
+        loop = asyncio.get_running_loop()
+        reached = loop.create_future()
+
+        def on_transition(old_state: PortalState, new_state: PortalState):
+            if new_state in targets:
+                loop.call_soon_threadsafe(
+                    lambda: reached.done() or reached.set_result(new_state)
+                )
+
+        self._state.add_listener(on_transition)
+        try:
+            return await asyncio.wait_for(reached, timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._state.remove_listener(on_transition)
+
+    async def _read_loop(self, ws):
+        """Feed inbound frames into the shared message handlers."""
+        close_code, close_reason = None, None
+        try:
+            async for message in ws:
+                self._on_message(ws, message)
+        except websockets.ConnectionClosed as e:
+            close_code, close_reason = e.code, e.reason
+        except Exception as e:
+            self._on_error(ws, e)
+        finally:
+            # Only the active socket may change connection state
+            if ws is self.ws:
+                resumable = self._resumable()
+                self._on_close(ws, close_code, close_reason)
+                self.ws = None
+                self._close_outbox()
+                if resumable:
+                    self._start_reconnect(self._reconnect_urls(self._url))
+
+    async def connect(self, url: Union[str, List[str], None] = None) -> bool:
+        """
+        Connect to a 3D world via WebSocket.
+
+        Several mirror URLs are raced as in RiftClawSkill.connect().
+
+        Args:
+            url: WebSocket URL of the world, or a list of mirror URLs
+                (defaults to config)
+
+        Returns:
+            True if connection successful
+
+        Raises:
+            ConnectionError: If connection fails after retries
+        """
+        if websockets is None:
+            raise RiftError("websockets not installed")
+
+        if asyncio.current_task() is not self._reconnect_task:
+            await self._cancel_reconnect()
+
+        if self.ws and self.connected:
+            logger.warning("Already connected, disconnecting first")
+            await self.disconnect()
+        self._hibernation = None
+
+        target_urls = self._resolve_target_urls(url)
+
+        self.state = PortalState.CONNECTING
+        logger.info(f"Connecting to {', '.join(target_urls)}...")
+
+        policy = RetryPolicy.from_config(self.config)
+
+        for attempt in range(1, policy.max_retries + 1):
+            urls = self._admitted_urls(target_urls)
+            self.state = PortalState.CONNECTING
+            self._connect_stats['attempts'] += 1
+            timeout = self._connect_timeout(urls)
+            try:
+                if len(urls) > 1:
+                    target_url, ws, first_frame = await self._race(urls, timeout)
+                    self._adopt_socket(ws, target_url, first_frame)
+                else:
+                    target_url = urls[0]
+                    self._adopt_socket(await self._open_socket(target_url, timeout), target_url)
+            except Exception as e:
+                await asyncio.sleep(self._after_failed_attempt(urls, attempt, policy, e))
+                continue
+
+            self._breaker(target_url).record_success()
+            logger.info(f"Successfully connected to {target_url}")
+            return True
+
+        return False
+
+    def _adopt_socket(self, ws, url: str, first_frame: Optional[str] = None):
+        """Make `ws` the active socket, replaying a frame read before adoption."""
+        self._close_outbox()
+        self.ws = ws
+        self._url = url
+        self._outbox = OutboundQueue.from_config(self.config, url)
+        self._writer_task = asyncio.create_task(drain(self._outbox, ws.send))
+        self._reset_keepalive()
+        self._on_open(ws)
+        self._start_keepalive()
+        if first_frame is not None:
+            self._on_message(ws, first_frame)
+        self._reader_task = asyncio.create_task(self._read_loop(ws))
+
+    async def _race(self, urls: List[str], timeout: float) -> Tuple[str, Any, str]:
+        """
+        Race staggered connects to mirror URLs; the first welcome wins.
+
+        Returns:
+            (url, socket, welcome frame) of the winner; losers are closed
+
+        Raises:
+            ConnectionError: If every mirror fails or the timeout passes
+        """
+        stagger = self.config.get('connect_stagger', 0.25)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        waiting = list(urls)
+        attempts: Dict[asyncio.Task, str] = {}
+
+        try:
+            while waiting or attempts:
+                if waiting:
+                    url = waiting.pop(0)
+                    attempts[asyncio.create_task(self._preconnect(url))] = url
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self._record_timeout(urls, 'connect')
+                    raise ConnectionError("Connection timeout")
+                done, _ = await asyncio.wait(
+                    attempts, timeout=min(stagger, remaining) if waiting else remaining,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    url = attempts.pop(task)
+                    if task.exception() is None:
+                        ws, first_frame = task.result()
+                        return url, ws, first_frame
+                    logger.debug(f"Mirror {url} failed: {task.exception()}")
+        finally:
+            await asyncio.gather(*(self._discard_preconnect(t) for t in attempts))
+
+        raise ConnectionError(f"All {len(urls)} mirrors failed")
+
+    async def _open_socket(self, url: str, timeout: float):
+        """Open a websockets connection through the shared connection setup."""
+        try:
+            options = await self._setup.websockets_options(url, timeout) if self._setup else {}
+            started = time.monotonic()
+            # No permessage-deflate: frames are small JSON and each zlib
+            # context costs ~100 KB, which dominates per-agent memory
+            ws = await websockets.connect(
+                url, open_timeout=timeout, compression=None, **options
+            )
+        except asyncio.TimeoutError:
+            self._record_timeout([url], 'connect')
+            raise
+        elapsed = time.monotonic() - started
+        self._timeouts.observe(url, 'connect', elapsed)
+        if self._setup:
+            self._setup.record_phase(url, connect=elapsed)
+        return ws
+
+    def _start_reconnect(self, urls: List[str]):
+        """Reconnect to `urls` in a background task, then replay the journal."""
+        self._reconnecting = True
+        self._recovery_stats['drops'] += 1
+        logger.warning(f"Link to {urls[0]} dropped, reconnecting in the background")
+        self._reconnect_task = asyncio.create_task(
+            self._auto_reconnect(urls, time.monotonic())
+        )
+
+    async def _cancel_reconnect(self):
+        """Cancel a background reconnect and wait for it to unwind."""
+        task, self._reconnect_task = self._reconnect_task, None
+        if task is None or task is asyncio.current_task():
+            return
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def _auto_reconnect(self, urls: List[str], dropped_at: float):
+        """Background reconnect loop; runs until resumed, cancelled or given up."""
+        policy = RetryPolicy.from_config(self.config)
+        rounds = 0
+        try:
+            while True:
+                rounds += 1
+                error: Optional[Exception] = None
+                try:
+                    await self.connect(urls)
+                    if self.connected and await self._replay_pending():
+                        self._record_recovery(dropped_at)
+                        return
+                except Exception as e:
+                    error = e
+
+                wait = self._recovery_wait(error, policy, rounds)
+                if self._recovery_expired(dropped_at, wait):
+                    self._abandon_recovery()
+                    return
+                await asyncio.sleep(wait)
+        finally:
+            self._reconnecting = False
+
+    async def _replay_pending(self) -> bool:
+        """
+        Replay the journal, including requests queued while it was sent.
+
+        Returns:
+            True once everything went out and the link is still up
+        """
+        sent = set()
+        while self.connected:
+            frames = [(request_id, frame) for request_id, frame in self._replayable_frames()
+                      if request_id not in sent]
+            if not frames:
+                # No await between the last check and resuming direct sends
+                self._reconnecting = False
+                return True
+            for request_id, frame in frames:
+                sent.add(request_id)
+                await self._send_frame(frame, 'replay', Lane.CONTROL, request_id=request_id)
+                self._recovery_stats['replayed'] += 1
+            logger.info(f"Replayed {len(frames)} unanswered requests")
+        return False
+
+    def _close_outbox(self):
+        """Close the active socket's send queue; its writer task then exits."""
+        outbox, self._outbox = self._outbox, None
+        self._writer_task = None
+        if outbox is not None:
+            outbox.close()
+
+    async def _release_socket(self):
+        """Close the active socket and wait for its tasks, without touching skill state."""
+        keepalive, self._keepalive_task = self._keepalive_task, None
+        # hibernate() may be running on the keepalive task itself
+        if keepalive and keepalive is not asyncio.current_task():
+            keepalive.cancel()
+        self._close_outbox()
+        ws, self.ws = self.ws, None
+        if ws:
+            await ws.close()
+
+        if self._reader_task:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
+
+    async def disconnect(self):
+        """Disconnect from current world."""
+        await self._cancel_reconnect()
+        self._hibernation = None
+        if self.ws:
+            logger.info("Disconnecting from world...")
+        await self._release_socket()
+
+        self.connected = False
+        self.state = PortalState.DISCONNECTED
+        self.current_world = None
+        logger.info("Disconnected")
+
+    async def hibernate(self) -> Optional[Dict[str, Any]]:
+        """Release an idle agent's socket; see RiftClawSkill.hibernate()."""
+        async with self._hibernation_lock():
+            if not self._can_hibernate():
+                return None
+            snapshot = self._save_session()
+            await self._release_socket()
+            self.connected = False
+            self.current_world = None
+            self.state = PortalState.HIBERNATED
+        return snapshot
+
+    async def wake(self) -> bool:
+        """Reconnect a hibernated agent; see RiftClawSkill.wake()."""
+        async with self._hibernation_lock():
+            saved = self._hibernation
+            if saved is None:
+                return self.connected
+            snapshot = json.loads(saved)
+            started = time.monotonic()
+            woke = False
+            try:
+                woke = await self.connect(snapshot['urls'])
+            finally:
+                if not woke:
+                    # Stay hibernated; the next call tries again
+                    self._hibernation = saved
+                    self._hibernation_stats['failed_wakes'] += 1
+            if woke:
+                self._restore_session(snapshot, started)
+        return woke
+
+    async def _mark_active(self):
+        """Note caller activity, waking the agent first if it is hibernated."""
+        self._last_activity = time.monotonic()
+        if self._hibernation is not None and not await self.wake():
+            raise ConnectionError("Could not reconnect to wake from hibernation")
+
+    async def _send_message(self, msg_type: str, payload: Dict[str, Any] = None,
+                            request_id: Optional[str] = None) -> bool:
+        """Send a signed message to the connected world."""
+        return await self._send_frame(self._build_frame(msg_type, payload, request_id), msg_type,
+                                      request_id=request_id)
+
+    async def _send_frame(self, frame: str, msg_type: str, lane: Optional[Lane] = None,
+                          coalesce_key: Optional[str] = None,
+                          request_id: Optional[str] = None) -> bool:
+        """Queue an already signed frame; see RiftClawSkill._send_frame()."""
+        if not self.ws or not self.connected:
+            logger.error("Not connected")
+            return False
+
+        lane = lane_for(msg_type) if lane is None else lane
+        try:
+            if self._outbox is not None:
+                queued = self._outbox.put(frame, lane, coalesce_key)
+            else:
+                # Multiplexed channel: the session owns the queue
+                queued = await self.ws.send(frame, lane, coalesce_key, request_id)
+        except Exception as e:
+            logger.error(f"Send failed: {e}")
+            return False
+
+        if queued:
+            logger.debug(f"Queued {msg_type}")
+        else:
+            logger.warning(f"Send queue full or closed, {msg_type} not sent")
+        return queued
+
+    async def send(self, msg_type: str, payload: Dict[str, Any] = None,
+                   lane: Lane = Lane.TELEMETRY, coalesce_key: Optional[str] = None) -> bool:
+        """Send a fire-and-forget message; see RiftClawSkill.send()."""
+        await self._mark_active()
+        wait = self._rate_wait(msg_type, payload)
+        if wait is None:
+            return False
+        if wait:
+            await asyncio.sleep(wait)
+        return await self._send_frame(self._build_frame(msg_type, payload), msg_type,
+                                      lane, coalesce_key)
+
+    async def submit(self, msg_type: str, operation: str,
+                     payload: Dict[str, Any] = None,
+                     timeout: Optional[float] = None) -> asyncio.Future:
+        """
+        Send a request without waiting for its response.
+
+        Several requests may be in flight at once; each is correlated to its
+        response by request_id.
+
+        Returns:
+            Future resolving to the response dict, or None if the send
+            failed or the request expired
+        """
+        await self._mark_active()
+        wait = self._rate_wait(msg_type, payload)
+        if wait:
+            await asyncio.sleep(wait)
+        request_id = self._new_request(operation, timeout)
+        with self._requests_lock:
+            pending = self._pending_requests[request_id]
+
+        frame = self._build_frame(msg_type, payload, request_id)
+        if wait is None:
+            self._complete_request(pending, None)
+        elif self._journal_frame(request_id, frame):
+            logger.debug(f"Queued {msg_type} until the link is resumed")
+        elif not await self._send_frame(frame, msg_type, request_id=request_id):
+            self._complete_request(pending, None)
+
+        return pending.future
+
+    async def _request(self, msg_type: str, operation: str,
+                       payload: Dict[str, Any] = None,
+                       timeout: Optional[float] = None) -> Optional[Dict]:
+        """Send a request and wait for its response, or None on failure/timeout."""
+        timeout = (timeout or self._operation_timeout(operation)) + self._rate_backlog()
+        future = await self.submit(msg_type, operation, payload, timeout)
+        return await self._wait_for_response(future, operation, timeout)
+
+    async def _wait_for_response(self, future: asyncio.Future, operation: str,
+                                 timeout: Optional[float] = None) -> Optional[Dict]:
+        """Wait for a submitted request's response."""
+        timeout = timeout or self._operation_timeout(operation)
+
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            self._record_response_timeout(operation)
+            logger.warning(f"Timeout waiting for {operation} response")
+            return None
+
+    async def discover(self) -> List[Portal]:
+        """Request the portal list from the current world."""
+        await self._mark_active()
+        if not self.connected:
+            raise ConnectionError("Not connected")
+
+        discovering = self.state in (PortalState.CONNECTED, PortalState.ARRIVED)
+        if discovering:
+            self.state = PortalState.DISCOVERING
+        try:
+            response = await self._request('discover', 'discover_response')
+        finally:
+            if discovering and self.state == PortalState.DISCOVERING:
+                self._settle_state()
+        return self._portals_from_response(response)
+
+    async def enter(self, portal_id: str, make_before_break: Optional[bool] = None,
+                    **passport_kwargs) -> Dict[str, Any]:
+        """
+        Enter a portal and initiate handoff to destination world.
+
+        Args:
+            portal_id: ID of the portal to enter
+            make_before_break: Pre-connect to the destination (defaults to config)
+            **passport_kwargs: Additional passport data
+
+        Returns:
+            Handoff result dictionary, including `time_to_arrival` and
+            `offline_gap` in seconds
+
+        Raises:
+            HandoffRejectedError: If the world turns the handoff away (after
+                waiting in line; see RiftClawSkill.enter())
+            HandoffError: If handoff fails
+            SecurityError: If signature validation fails
+        """
+        await self._mark_active()
+        if not self.connected:
+            raise ConnectionError("Not connected to any world")
+
+        portal = self._find_portal(portal_id)
+        return await self._admitted(portal.destination_world,
+                                    lambda admitted: self._enter(portal, make_before_break, admitted,
+                                    **passport_kwargs))
+
+    async def _enter(self, portal: Portal, make_before_break: Optional[bool],
+                     admitted: Callable[[], None], **passport_kwargs) -> Dict[str, Any]:
+        """One handoff attempt through `portal`; see enter()."""
+        portal_id = portal.portal_id
+        logger.info(f"Entering portal: {portal.name} -> {portal.destination_world}")
+        transition = self._transition_poem(portal.destination_world)
+
+        passport = self.create_passport(portal.destination_world, **passport_kwargs)
+
+        if make_before_break is None:
+            make_before_break = self.config.get('make_before_break', False)
+
+        self.state = PortalState.HANDOFF_PENDING
+        started = time.monotonic()
+        future = await self.submit('handoff_request', 'handoff_confirm', {
+            'portal_id': portal_id,
+            'passport': passport.to_dict()
+        })
+
+        # Open the destination link while the confirm is in flight
+        speculative = None
+        if make_before_break and portal.destination_url:
+            speculative = asyncio.create_task(self._preconnect(portal.destination_url))
+
+        response = await self._wait_for_response(future, 'handoff_confirm')
+
+        if not response or 'error' in response:
+            if speculative:
+                await self._discard_preconnect(speculative)
+            self._settle_state()
+            if not response:
+                raise HandoffError("Handoff timeout")
+            raise self._rejection_error(response)
+
+        admitted()
+        logger.info(f"Handoff confirmed! Crossing to {portal.destination_world}")
+        old_world = self.current_world
+
+        if speculative and await self._switch_to(speculative, portal.destination_url):
+            offline_gap = 0.0
+        else:
+            offline_gap = await self._reconnect_to(portal.destination_urls)
+
+        return self._arrival_result(
+            old_world, portal, passport, transition,
+            'make_before_break' if speculative else 'break_before_make',
+            started, offline_gap, 0
+        )
+
+    async def enter_any(self, destination_world: str, hedge_after: Optional[float] = None,
+                        **passport_kwargs) -> Dict[str, Any]:
+        """
+        Enter any discovered portal to `destination_world`, hedging slow
+        handoffs through alternate portals; see RiftClawSkill.enter_any().
+
+        The async skill keeps no pool of warm links, so the winner is always
+        reached by a fresh connect and `handoff_mode` is 'break_before_make'.
+        """
+        await self._mark_active()
+        if not self.connected:
+            raise ConnectionError("Not connected to any world")
+
+        self._hedge_candidates(destination_world)
+        return await self._admitted(destination_world, lambda admitted: self._enter_any(
+            destination_world, hedge_after, admitted, **passport_kwargs))
+
+    async def _enter_any(self, destination_world: str, hedge_after: Optional[float],
+                         admitted: Callable[[], None], **passport_kwargs) -> Dict[str, Any]:
+        """One hedged handoff attempt; see enter_any()."""
+        candidates = self._hedge_candidates(destination_world)
+        hedge_after = self._hedge_delay() if hedge_after is None else hedge_after
+        transition = self._transition_poem(destination_world)
+
+        self.state = PortalState.HANDOFF_PENDING
+        started = time.monotonic()
+        deadline = started + self._operation_timeout('handoff_confirm')
+        in_flight: Dict[asyncio.Future, tuple] = {}
+        next_hedge, sent, winner, errors = started, 0, None, []
+
+        while winner is None:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            if candidates and (now >= next_hedge or not in_flight):
+                portal = candidates.pop(0)
+                passport = self.create_passport(destination_world, **passport_kwargs)
+                future = await self.submit('handoff_request', 'handoff_confirm', {
+                    'portal_id': portal.portal_id,
+                    'passport': passport.to_dict()
+                }, deadline - now)
+                in_flight[future] = (portal, passport, now)
+                if sent:
+                    logger.info(f"Handoff not confirmed after {now - started:.2f}s, "
+                                f"hedging through {portal.name}")
+                sent += 1
+                next_hedge = now + hedge_after
+                continue
+            if not in_flight:
+                break
+            until = min(deadline, next_hedge) if candidates else deadline
+            done, _ = await asyncio.wait(in_flight, timeout=max(until - now, 0),
+                                         return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                portal, passport, sent_at = in_flight.pop(future)
+                response = None if future.cancelled() else future.result()
+                if response and 'error' not in response:
+                    winner = (portal, passport, sent_at)
+                    break
+                if response:
+                    errors.append(response)
+
+        cancels = self._withdraw_hedges(in_flight)
+        for frame in cancels:
+            await self._send_frame(frame, 'handoff_cancel')
+        if winner is None:
+            self._settle_state()
+            if errors and not in_flight:
+                raise self._rejection_error(errors[-1])
+            self._record_response_timeout('handoff_confirm')
+            raise HandoffError("Handoff timeout")
+
+        portal, passport, sent_at = winner
+        self._observe_portal(portal, time.monotonic() - sent_at)
+        admitted()
+        logger.info(f"Handoff confirmed via {portal.name}! Crossing to {destination_world}")
+        old_world = self.current_world
+        if cancels:
+            await self._flush_outbox(self.CANCEL_FLUSH_TIMEOUT)
+        offline_gap = await self._reconnect_to(portal.destination_urls)
+
+        return self._arrival_result(old_world, portal, passport, transition,
+                                    'break_before_make', started, offline_gap, sent - 1)
+
+    async def _admitted(self, destination_world: str,
+                        attempt: Callable[[Callable[[], None]], Awaitable[Dict[str, Any]]]
+                        ) -> Dict[str, Any]:
+        """Handoff attempts through the destination's waitlist; see RiftClawSkill._admitted()."""
+        waitlist, deadline = self._admission(destination_world)
+        if waitlist is None:
+            return await attempt(lambda: None)
+        ticket = waitlist.join()
+        try:
+            while True:
+                if not await waitlist.wait_turn_async(ticket, deadline):
+                    raise self._admission_timeout(waitlist)
+                try:
+                    return await attempt(lambda: waitlist.admitted(ticket))
+                except HandoffRejectedError as e:
+                    if not e.rejection.retryable:
+                        raise
+                    retry_in = waitlist.rejected(ticket, e.rejection)
+                    if time.monotonic() + retry_in >= deadline:
+                        raise
+                    logger.info(f"{destination_world} turned the handoff away ({e.rejection.reason}), "
+                                f"next try in {retry_in:.1f}s")
+        finally:
+            waitlist.leave(ticket)
+
+    async def _flush_outbox(self, timeout: float):
+        """Give the writer task up to `timeout` seconds to send what is queued."""
+        if self._outbox is None:
+            return
+        try:
+            await asyncio.wait_for(self._outbox.drained(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _preconnect(self, url: str) -> Tuple[Any, str]:
+        """Open a destination socket and read its first (welcome) frame."""
+        timeout = self._connect_timeout([url])
+        ws = await self._open_socket(url, timeout)
+        try:
+            first_frame = await asyncio.wait_for(ws.recv(), timeout=timeout)
+        except BaseException:
+            await ws.close()
+            raise
+        return ws, first_frame
+
+    async def _discard_preconnect(self, task: asyncio.Task):
+        """Cancel a pre-connect and close its socket if it already opened."""
+        task.cancel()
+        try:
+            ws, _ = await task
+        except (Exception, asyncio.CancelledError):
+            return
+        await ws.close()
+
+    async def _switch_to(self, task: asyncio.Task, url: str) -> bool:
+        """
+        Adopt a pre-opened destination socket, then drop the source one.
+
+        Returns:
+            False if the pre-connect failed (the caller should fall back to
+            a fresh connect)
+        """
+        try:
+            ws, first_frame = await task
+        except Exception as e:
+            logger.warning(f"Pre-connected destination not ready, reconnecting: {e}")
+            return False
+
+        old_ws, old_reader = self.ws, self._reader_task
+        self._adopt_socket(ws, url, first_frame)
+        self.state = PortalState.ARRIVED
+
+        if old_ws:
+            await old_ws.close()
+        if old_reader:
+            await asyncio.gather(old_reader, return_exceptions=True)
+
+        logger.info(f"Arrived at {self.current_world} without going offline")
+        return True
+
+    async def _reconnect_to(self, url: Union[str, List[str], None]) -> float:
+        """
+        Break-before-make arrival: drop the source socket, then connect.
+
+        Returns:
+            Seconds spent without any world connection
+        """
+        offline_since = time.monotonic()
+        await self.disconnect()
+
+        if url:
+            try:
+                await self.connect(url)
+                self.state = PortalState.ARRIVED
+            except Exception as e:
+                logger.error(f"Failed to connect to destination: {e}")
+                self.state = PortalState.DISCONNECTED
+                raise HandoffError(f"Arrival failed: {e}")
+
+        return time.monotonic() - offline_since
+
+
+# Convenience function for quick usage
+async def async_quick_connect(world_url: Optional[str] = None,
+                              config_path: Optional[str] = None) -> AsyncRiftClawSkill:
+    """
+    Quickly create and connect an AsyncRiftClawSkill.
+
+    Args:
+        world_url: URL of world to connect to
+        config_path: Path to config file
+
+    Returns:
+        Connected AsyncRiftClawSkill instance
+    """
+    skill = AsyncRiftClawSkill(config_path)
+    await skill.connect(world_url)
+    return skill
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Canonical JSON - The Bytes Signatures Cover
+====================================================
+A signature covers bytes, so signer and verifier must serialize the same
+message identically. The original recipe, `json.dumps(message,
+sort_keys=True)`, is Python's own output: ", " and ": " separators,
+non-ASCII escaped as \\uXXXX, floats such as 1e-07 and 100.0. A world
+written in JavaScript cannot reproduce it without reimplementing Python.
+
+RFC 8785, the JSON Canonicalization Scheme (JCS), defines the bytes in
+terms every language can produce: no whitespace, keys sorted by UTF-16
+code units, strings escaped minimally and output as UTF-8, and numbers
+formatted as ECMAScript's Number.prototype.toString() does (so
+`JSON.stringify` of a sorted object is already canonical).
+
+Two forms are offered, selected by `security.canonical_json`:
+
+    python    json.dumps(sort_keys=True), the spec's original recipe
+    jcs       RFC 8785
+
+dumps() implements JCS. Messages and passports hold strings, small
+integers and ordinary floats, and for those the result equals what the
+C JSON encoder produces with compact separators and sorted keys once
+integral floats are turned into ints; such values take that fast path.
+Anything else (floats that ECMAScript formats differently, keys outside
+the Basic Multilingual Plane, subclasses) is encoded by the reference
+implementation below. Objects that always carry the same keys, such as
+passports, can be given a Shape: their key order and key text are
+worked out once, and only the values are encoded per call.
+
+Version: 0.1.0
+Author: OpenClaw Framework
+"""
+
+import json
+import math
+from json.encoder import encode_basestring
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# Largest integer a double holds exactly; beyond it JSON numbers lose digits
+MAX_SAFE_INTEGER = 2 ** 53
+
+_float_repr = float.__repr__
+_compact_sorted = json.JSONEncoder(
+    ensure_ascii=False, allow_nan=False, sort_keys=True, separators=(',', ':')
+).encode
+
+
+_MISSING = object()
+
+
+class _SlowPath(Exception):
+    """The fast path cannot guarantee canonical output for this value."""
+
+
+def _prepare(value: Any) -> Any:
+    """
+    A copy of `value` that the C encoder serializes canonically.
+
+    Raises:
+        _SlowPath: If some part needs the reference encoder
+    """
+    kind = type(value)
+    if kind is dict:
+        prepared = {}
+        for key, item in value.items():
+            if type(key) is not str or not (key.isascii() or max(key) <= '\uffff'):
+                raise _SlowPath
+            prepared[key] = item if type(item) is str else _prepare(item)
+        return prepared
+    if kind is str or kind is bool or value is None:
+        return value
+    if kind is float:
+        if value.is_integer():
+            if -MAX_SAFE_INTEGER < value < MAX_SAFE_INTEGER:
+                return int(value)
+        elif 1e-4 <= abs(value) < 1e16:
+            # repr() and ECMAScript agree on plain decimal notation here
+            return value
+        raise _SlowPath
+    if kind is int:
+        if -MAX_SAFE_INTEGER <= value <= MAX_SAFE_INTEGER:
+            return value
+        raise _SlowPath
+    if kind is list or kind is tuple:
+        return [item if type(item) is str else _prepare(item) for item in value]
+    raise _SlowPath
+
+
+def encode_number(value: Any) -> str:
+    """
+    An integer or float as ECMAScript's Number.prototype.toString() writes it.
+
+    Integers are numbers like any other (doubles), so ones beyond 2**53
+    are written as the nearest double, as a JavaScript peer would.
+
+    Raises:
+        ValueError: For NaN and infinities, which JSON cannot represent
+    """
+    if isinstance(value, int) and -MAX_SAFE_INTEGER <= value <= MAX_SAFE_INTEGER:
+        return str(int(value))
+    try:
+        value = float(value)
+    except OverflowError:
+        raise ValueError(f"{value} is too large for a JSON number")
+    if math.isnan(value) or math.isinf(value):
+        raise ValueError(f"{value} is not allowed in canonical JSON")
+    if value == 0:
+        return '0'
+
+    # Shortest round-trip digits, as both repr() and ECMAScript choose them
+    sign = '-' if value < 0 else ''
+    text = repr(abs(value))
+    mantissa, _, exponent = text.partition('e')
+    whole, _, fraction = mantissa.partition('.')
+    fraction = fraction.rstrip('0')
+    if whole.strip('0'):
+        point = len(whole.lstrip('0')) + int(exponent or 0)
+    else:
+        point = int(exponent or 0) - (len(fraction) - len(fraction.lstrip('0')))
+    digits = (whole + fraction).strip('0')
+    count = len(digits)
+
+    # value = 0.digits * 10**point
+    if count <= point <= 21:
+        return sign + digits + '0' * (point - count)
+    if 0 < point <= 21:
+        return sign + digits[:point] + '.' + digits[point:]
+    if -6 < point <= 0:
+        return sign + '0.' + '0' * -point + digits
+    power = point - 1
+    exponent_text = ('+' if power >= 0 else '-') + str(abs(power))
+    if count == 1:
+        return sign + digits + 'e' + exponent_text
+    return sign + digits[0] + '.' + digits[1:] + 'e' + exponent_text
+
+
+def _utf16_order(key: str) -> bytes:
+    return key.encode('utf-16-be', 'surrogatepass')
+
+
+def _encode(value: Any) -> str:
+    """Reference RFC 8785 encoder for any JSON-compatible value."""
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if isinstance(value, (int, float)):
+        return encode_number(value)
+    if isinstance(value, dict):
+        for key in value:
+            if not isinstance(key, str):
+                raise TypeError(f"Canonical JSON keys must be strings, not {type(key).__name__}")
+        members = sorted(value.items(), key=lambda item: _utf16_order(item[0]))
+        return '{' + ','.join(
+            encode_basestring(key) + ':' + _encode(item) for key, item in members
+        ) + '}'
+    if isinstance(value, (list, tuple)):
+        return '[' + ','.join(_encode(item) for item in value) + ']'
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> str:
+    """
+    RFC 8785 canonical JSON text of `value`.
+
+    Raises:
+        ValueError: For NaN or infinite numbers
+        TypeError: For non-string keys or values JSON cannot hold
+    """
+    try:
+        prepared = _prepare(value)
+    except _SlowPath:
+        return _encode(value)
+    return _compact_sorted(prepared)
+
+
+def canonicalize(value: Any) -> bytes:
+    """RFC 8785 canonical UTF-8 bytes of `value` (lone surrogates raise ValueError)."""
+    return dumps(value).encode('utf-8')
+
+
+def _member(value: Any) -> str:
+    """Canonical text of one member value of a shaped object."""
+    kind = type(value)
+    if kind is float:
+        if value.is_integer():
+            if -MAX_SAFE_INTEGER < value < MAX_SAFE_INTEGER:
+                return str(int(value))
+        elif 1e-4 <= abs(value) < 1e16:
+            return _float_repr(value)
+        return encode_number(value)
+    if kind is str:
+        return encode_basestring(value)
+    if kind is dict and all(type(key) is str and key.isascii() for key in value):
+        # Small nested objects such as a position; ASCII sorts the same in UTF-16
+        return '{' + ','.join(
+            [encode_basestring(key) + ':' + _member(value[key]) for key in sorted(value)]
+        ) + '}'
+    return dumps(value)
+
+
+class Shape:
+    """
+    The canonical layout of objects that always have the same keys.
+
+    dumps() of an object with exactly these keys skips sorting and key
+    encoding; any other object is passed to the general dumps().
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self.keys = tuple(sorted(keys, key=_utf16_order))
+        if not self.keys:
+            raise ValueError("A shape needs at least one key")
+        self._members = tuple(
+            (('{' if index == 0 else ',') + encode_basestring(key) + ':', key)
+            for index, key in enumerate(self.keys)
+        )
+
+    def dumps(self, value: Dict[str, Any]) -> str:
+        """RFC 8785 canonical JSON text of `value`."""
+        if type(value) is not dict or len(value) != len(self.keys):
+            return dumps(value)
+        parts = []
+        for prefix, key in self._members:
+            item = value.get(key, _MISSING)
+            if item is _MISSING:
+                return dumps(value)
+            parts.append(prefix + (encode_basestring(item) if type(item) is str else _member(item)))
+        return ''.join(parts) + '}'
+
+
+def _python_dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True)
+
+
+class CanonicalForm:
+    """One way of serializing messages for signing, and its separators."""
+
+    def __init__(self, name: str, dumps: Callable[[Any], str],
+                 item_separator: str, key_separator: str, uses_shapes: bool = False):
+        self.name = name
+        self._dumps = dumps
+        self.item_separator = item_separator
+        self.key_separator = key_separator
+        self.uses_shapes = uses_shapes
+
+    def dumps(self, value: Any, shape: Optional[Shape] = None) -> str:
+        """The text a signature over `value` covers; `shape` is a hint for its keys."""
+        if shape is not None and self.uses_shapes:
+            return shape.dumps(value)
+        return self._dumps(value)
+
+    def encode(self, value: Any, shape: Optional[Shape] = None) -> bytes:
+        """The bytes a signature over `value` covers."""
+        return self.dumps(value, shape).encode('utf-8')
+
+    def append_string(self, text: str, key: str, value: str) -> str:
+        """
+        Add a string member to serialized object `text` (which must not
+        be empty) in this form's style, e.g. a signature after signing.
+        The result is not canonical; the member is meant to be removed
+        again before verification.
+        """
+        return (f'{text[:-1]}{self.item_separator}{encode_basestring(key)}'
+                f'{self.key_separator}{encode_basestring(value)}}}')
+
+    def __repr__(self) -> str:
+        return f"CanonicalForm({self.name!r})"
+
+
+FORMS: Dict[str, CanonicalForm] = {
+    'python': CanonicalForm('python', _python_dumps, ', ', ': '),
+    'jcs': CanonicalForm('jcs', dumps, ',', ':', uses_shapes=True),
+}
+
+
+def get_form(name: str) -> CanonicalForm:
+    """
+    The canonical form called `name` ('python' or 'jcs').
+
+    Raises:
+        ValueError: If there is no such form
+    """
+    try:
+        return FORMS[name]
+    except KeyError:
+        raise ValueError(f"Unknown canonical JSON form {name!r}; use one of {sorted(FORMS)}")
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Connector - Shared Connection Setup
+============================================
+DNS lookups, the TLS context and TLS sessions are process-wide resources:
+every skill that hops between the same worlds would otherwise resolve and
+negotiate from scratch on each connect. ConnectionSetup keeps one
+SSLContext, a TTL-bounded DNS cache and the last TLS session per host, and
+records how long each handshake phase took per URL.
+
+Version: 0.1.0
+Author: OpenClaw Framework
+"""
+
+import asyncio
+import logging
+import socket
+import ssl
+import threading
+import time
+from typing import Dict, List, Optional, Any, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger('riftclaw')
+
+# Per-connect TLS facts kept in the `last` record rather than summed as phases
+TLS_FLAGS = ('tls_resumed', 'tls_resumable')
+
+
+class DNSCache:
+    """getaddrinfo results cached for `ttl` seconds per (host, port)."""
+
+    def __init__(self, ttl: float = 60):
+        """
+        Args:
+            ttl: Seconds a resolution is reused (0 disables caching)
+        """
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[tuple]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, host: str, port: int) -> Optional[List[tuple]]:
+        """Return a fresh cached resolution, or None (counted as a miss)."""
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def store(self, host: str, port: int, addresses: List[tuple]):
+        """Cache a resolution for `ttl` seconds."""
+        if self.ttl > 0:
+            with self._lock:
+                self._entries[(host, port)] = (time.monotonic() + self.ttl, addresses)
+
+    def resolve(self, host: str, port: int) -> List[tuple]:
+        """Resolve `host:port` to TCP addrinfo tuples."""
+        addresses = self.lookup(host, port)
+        if addresses is None:
+            addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+            self.store(host, port, addresses)
+        return addresses
+
+    async def resolve_async(self, host: str, port: int) -> List[tuple]:
+        """resolve() without blocking the event loop."""
+        addresses = self.lookup(host, port)
+        if addresses is None:
+            loop = asyncio.get_running_loop()
+            addresses = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            self.store(host, port, addresses)
+        return addresses
+
+    def invalidate(self, host: str, port: int):
+        """Forget a resolution, e.g. after every address failed."""
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def clear(self):
+        """Forget every resolution."""
+        with self._lock:
+            self._entries.clear()
+
+
+class ConnectionSetup:
+    """
+    DNS, TCP and TLS setup shared by every connection in a process.
+
+    open_socket() hands websocket-client a connected (and for wss://,
+    TLS-wrapped) socket, so only the WebSocket upgrade is left to it.
+    TLS sessions are offered back to the same host on the next connect,
+    letting servers that issue tickets skip the full handshake. The
+    asyncio clients share the DNS cache and SSLContext through
+    websockets_options(), but asyncio gives no way to resume a session.
+    """
+
+    _shared: Optional['ConnectionSetup'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, dns_ttl: float = 60, ssl_context: Optional[ssl.SSLContext] = None):
+        """
+        Args:
+            dns_ttl: Seconds DNS results are reused
+            ssl_context: TLS context for wss:// (a default verifying
+                context if None)
+        """
+        self.dns = DNSCache(dns_ttl)
+        self.ssl_context = ssl_context or self._default_ssl_context()
+        self._sessions: Dict[Tuple[str, int], ssl.SSLSession] = {}
+        self._timings: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> 'ConnectionSetup':
+        """The process-wide instance used by skills by default."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def _default_ssl_context() -> ssl.SSLContext:
+        context = ssl.create_default_context()
+        # Session tickets are on by default; make sure nobody turned them off
+        context.options &= ~ssl.OP_NO_TICKET
+        return context
+
+    def open_socket(self, url: str, timeout: Optional[float] = None) -> socket.socket:
+        """
+        Resolve, connect and (for wss://) TLS-wrap a socket for `url`.
+
+        Args:
+            url: ws:// or wss:// world URL
+            timeout: Seconds allowed for each phase
+
+        Raises:
+            OSError: If resolution fails or every resolved address refuses
+        """
+        host, port, secure = self._endpoint(url)
+        timings: Dict[str, Any] = {}
+
+        started = time.monotonic()
+        addresses = self.dns.resolve(host, port)
+        timings['dns'] = time.monotonic() - started
+
+        mark = time.monotonic()
+        sock = self._connect_tcp(host, port, addresses, timeout)
+        timings['tcp'] = time.monotonic() - mark
+
+        if secure:
+            mark = time.monotonic()
+            session = self._sessions.get((host, port))
+            try:
+                sock = self.ssl_context.wrap_socket(
+                    sock, server_hostname=host, session=session
+                )
+            except Exception:
+                sock.close()
+                raise
+            timings['tls'] = time.monotonic() - mark
+            timings['tls_resumed'] = sock.session_reused
+            self.remember_session(url, sock)
+
+        sock.settimeout(None)
+        timings['setup'] = time.monotonic() - started
+        self.record(url, timings)
+        return sock
+
+    async def websockets_options(self, url: str,
+                                 timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Keyword arguments for `websockets.connect()`: a TCP socket connected
+        through the cached DNS result, plus the shared SSLContext for wss://.
+
+        Every cached address is tried in turn, and the cache entry is
+        dropped if none of them answers. asyncio cannot offer a saved TLS
+        session, so these connects never resume TLS; their records say so
+        with `tls_resumable: False`. The caller records TLS and the upgrade
+        as one `connect` phase.
+
+        Raises:
+            OSError: If resolution fails or every resolved address refuses
+        """
+        host, port, secure = self._endpoint(url)
+        timings: Dict[str, Any] = {}
+
+        started = time.monotonic()
+        addresses = await self.dns.resolve_async(host, port)
+        timings['dns'] = time.monotonic() - started
+
+        mark = time.monotonic()
+        sock = await self._connect_tcp_async(host, port, addresses, timeout)
+        timings['tcp'] = time.monotonic() - mark
+        if secure:
+            timings['tls_resumable'] = False
+        self.record(url, timings)
+
+        options: Dict[str, Any] = {'sock': sock}
+        if secure:
+            options.update(ssl=self.ssl_context, server_hostname=host)
+        return options
+
+    @staticmethod
+    def _endpoint(url: str) -> Tuple[str, int, bool]:
+        parsed = urlparse(url)
+        secure = parsed.scheme == 'wss'
+        return parsed.hostname, parsed.port or (443 if secure else 80), secure
+
+    def _connect_tcp(self, host: str, port: int, addresses: List[tuple],
+                     timeout: Optional[float]) -> socket.socket:
+        last_error: Optional[Exception] = None
+        for family, socktype, proto, _, address in addresses:
+            sock = socket.socket(family, socktype, proto)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.settimeout(timeout)
+            try:
+                sock.connect(address)
+                return sock
+            except OSError as e:
+                sock.close()
+                last_error = e
+
+        self.dns.invalidate(host, port)
+        raise last_error or OSError(f"No addresses for {host}:{port}")
+
+    async def _connect_tcp_async(self, host: str, port: int, addresses: List[tuple],
+                                 timeout: Optional[float]) -> socket.socket:
+        loop = asyncio.get_running_loop()
+        last_error: Optional[Exception] = None
+        for family, socktype, proto, _, address in addresses:
+            sock = socket.socket(family, socktype, proto)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setblocking(False)
+            try:
+                await asyncio.wait_for(loop.sock_connect(sock, address), timeout)
+                return sock
+            except (OSError, asyncio.TimeoutError) as e:
+                sock.close()
+                last_error = e
+            except BaseException:
+                sock.close()
+                raise
+
+        self.dns.invalidate(host, port)
+        raise last_error or OSError(f"No addresses for {host}:{port}")
+
+    def remember_session(self, url: str, sock: Any):
+        """Keep the TLS session of `sock` for the next connect to its host."""
+        session = getattr(sock, 'session', None)
+        if session is None:
+            return
+        host, port, _ = self._endpoint(url)
+        with self._lock:
+            self._sessions[(host, port)] = session
+
+    def record(self, url: str, timings: Dict[str, Any]):
+        """Start a new connect record for `url` with the given phase timings."""
+        with self._lock:
+            stats = self._timings.setdefault(url, {
+                'connects': 0, 'tls_resumed': 0, 'last': {}, 'totals': {}
+            })
+            stats['connects'] += 1
+            stats['tls_resumed'] += 1 if timings.get('tls_resumed') else 0
+            stats['last'] = {}
+        self.record_phase(url, **{k: v for k, v in timings.items() if k not in TLS_FLAGS})
+        flags = {k: timings[k] for k in TLS_FLAGS if k in timings}
+        if flags:
+            with self._lock:
+                self._timings[url]['last'].update(flags)
+
+    def record_phase(self, url: str, **phases: float):
+        """Add phase timings (e.g. ws_upgrade) to the latest connect of `url`."""
+        with self._lock:
+            stats = self._timings.get(url)
+            if not stats:
+                return
+            for phase, seconds in phases.items():
+                stats['last'][phase] = seconds
+                stats['totals'][phase] = stats['totals'].get(phase, 0.0) + seconds
+
+    def timings(self, url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Handshake phase timings (seconds) per URL.
+
+        Returns:
+            {url: {'connects', 'tls_resumed', 'last': {...}, 'mean': {...}}},
+            or just the entry for `url` if given
+        """
+        with self._lock:
+            report = {
+                u: {
+                    'connects': s['connects'],
+                    'tls_resumed': s['tls_resumed'],
+                    'last': dict(s['last']),
+                    'mean': {phase: total / s['connects']
+                             for phase, total in s['totals'].items()}
+                }
+                for u, s in self._timings.items()
+            }
+        if url is not None:
+            return report.get(url, {})
+        return report
+
+    def get_status(self) -> Dict[str, Any]:
+        """DNS cache and TLS session counters."""
+        return {
+            'dns_hits': self.dns.hits,
+            'dns_misses': self.dns.misses,
+            'tls_sessions': len(self._sessions),
+            'urls': len(self._timings)
+        }
+
+    def reset(self):
+        """Drop cached DNS results, TLS sessions and timings."""
+        self.dns.clear()
+        with self._lock:
+            self._sessions.clear()
+            self._timings.clear()
+        logger.debug("Connection setup caches cleared")
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Events - Inbound Message Subscriptions
+===============================================
+Inbound frames are parsed on the connection's reader (a websocket thread,
+or the event loop for asyncio skills). A handler that runs there blocks
+every later frame, including the `handoff_confirm` a traversal is waiting
+on. Subscribers therefore pick where they run: inline on the reader (for
+quick bookkeeping), on a shared thread pool, or on an asyncio loop. Each
+subscription keeps call counts and run-time statistics, and inline
+handlers that hold the reader too long are reported.
+
+Version: 0.1.0
+Author: OpenClaw Framework
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Any
+
+try:
+    from .latency import LatencyStats
+except ImportError:  # Run as a script from skill/
+    from latency import LatencyStats
+
+logger = logging.getLogger('riftclaw')
+
+# Subscribe to this message type to receive every inbound message
+ANY_TYPE = '*'
+
+
+class HandlerMode(Enum):
+    """Where a subscriber runs."""
+    INLINE = "inline"  # On the reader, before the next frame is read
+    THREAD = "thread"  # On the shared handler thread pool
+    ASYNCIO = "asyncio"  # On an asyncio loop (coroutine functions are awaited)
+
+
+class Subscription:
+    """
+    One handler subscribed to one inbound message type.
+
+    Returned by subscribe(); pass it to unsubscribe() or call cancel().
+    """
+
+    def __init__(self, dispatcher: 'EventDispatcher', msg_type: str,
+                 handler: Callable[[Dict[str, Any]], Any],
+                 predicate: Optional[Callable[[Dict[str, Any]], bool]],
+                 mode: HandlerMode, loop: Optional[asyncio.AbstractEventLoop]):
+        self.msg_type = msg_type
+        self.handler = handler
+        self.predicate = predicate
+        self.mode = mode
+        self.loop = loop
+        self.active = True
+        self.latency = LatencyStats()
+        self.calls = 0
+        self.filtered = 0
+        self.errors = 0
+        self.slow_calls = 0
+        self._last_warning = 0.0
+        self._dispatcher = dispatcher
+
+    @property
+    def name(self) -> str:
+        """The handler's qualified name, for logs and status."""
+        return getattr(self.handler, '__qualname__', repr(self.handler))
+
+    def cancel(self):
+        """Stop delivering messages to this handler."""
+        self._dispatcher.unsubscribe(self)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters and handler run times (seconds)."""
+        return {
+            'msg_type': self.msg_type,
+            'handler': self.name,
+            'mode': self.mode.value,
+            'calls': self.calls,
+            'filtered': self.filtered,
+            'errors': self.errors,
+            'slow_calls': self.slow_calls,
+            'ewma': self.latency.ewma,
+            'p50': self.latency.percentile(50),
+            'p99': self.latency.percentile(99),
+            'max': self.latency.max
+        }
+
+    def __repr__(self) -> str:
+        return f"Subscription({self.msg_type!r}, {self.name}, {self.mode.value})"
+
+
+class EventDispatcher:
+    """
+    Delivers inbound messages to subscribers.
+
+    Subscribers of a type run in subscription order as far as their modes
+    allow: inline handlers finish before dispatch() returns, while thread
+    and asyncio handlers may overlap with each other and with later
+    messages. Subscribers to '*' come after those to the message's type.
+    """
+
+    # Seconds between repeated warnings about the same slow inline handler
+    SLOW_WARNING_INTERVAL = 60.0
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    def __init__(self, slow_threshold: float = 0.05, max_workers: Optional[int] = None):
+        """
+        Args:
+            slow_threshold: Seconds an inline handler may hold the reader
+                before it is reported
+            max_workers: Size of the shared thread pool, if this dispatcher
+                is the one that creates it
+        """
+        self.slow_threshold = slow_threshold
+        self.max_workers = max_workers
+        self._subscriptions: Dict[str, List[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'EventDispatcher':
+        """Build a dispatcher from a skill config's `event_handlers` section."""
+        settings = config.get('event_handlers') or {}
+        return cls(
+            slow_threshold=settings.get('slow_threshold', 0.05),
+            max_workers=settings.get('max_workers')
+        )
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """The process-wide pool thread-mode handlers run on."""
+        with self._executor_lock:
+            if EventDispatcher._executor is None:
+                EventDispatcher._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='riftclaw-handler'
+                )
+            return EventDispatcher._executor
+
+    def subscribe(self, msg_type: str, handler: Callable[[Dict[str, Any]], Any],
+                  predicate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                  mode: Any = HandlerMode.INLINE,
+                  loop: Optional[asyncio.AbstractEventLoop] = None) -> Subscription:
+        """
+        Subscribe `handler` to inbound messages of `msg_type`.
+
+        Args:
+            msg_type: Message type to receive, or '*' for every type
+            handler: Called with the message dict; in asyncio mode it may
+                be a coroutine function
+            predicate: Only messages for which this returns True are
+                delivered (evaluated on the reader, so keep it cheap)
+            mode: A HandlerMode or its value ('inline', 'thread', 'asyncio')
+            loop: Loop for asyncio mode (defaults to the running loop)
+
+        Raises:
+            ValueError: If mode is unknown, or asyncio mode has no loop
+        """
+        mode = HandlerMode(mode)
+        if mode is HandlerMode.ASYNCIO and loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                raise ValueError("asyncio mode needs a loop outside a running event loop")
+
+        subscription = Subscription(self, msg_type, handler, predicate, mode, loop)
+        with self._lock:
+            # Copy on write: dispatch() iterates without the lock
+            self._subscriptions[msg_type] = self._subscriptions.get(msg_type, []) + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> bool:
+        """
+        Remove a subscription.
+
+        Returns:
+            False if it was not subscribed
+        """
+        with self._lock:
+            current = self._subscriptions.get(subscription.msg_type, [])
+            if subscription not in current:
+                return False
+            remaining = [s for s in current if s is not subscription]
+            if remaining:
+                self._subscriptions[subscription.msg_type] = remaining
+            else:
+                del self._subscriptions[subscription.msg_type]
+        subscription.active = False
+        return True
+
+    def has_subscribers(self, msg_type: str) -> bool:
+        """Whether any handler is subscribed to `msg_type` (or to every type)."""
+        return msg_type in self._subscriptions or ANY_TYPE in self._subscriptions
+
+    def dispatch(self, msg_type: str, data: Dict[str, Any]) -> int:
+        """
+        Deliver a message to every matching subscriber.
+
+        Returns:
+            Number of subscribers the message was delivered to
+        """
+        delivered = 0
+        subscriptions = self._subscriptions.get(msg_type, [])
+        if msg_type != ANY_TYPE:
+            subscriptions = subscriptions + self._subscriptions.get(ANY_TYPE, [])
+        for subscription in subscriptions:
+            if subscription.predicate is not None:
+                try:
+                    matched = subscription.predicate(data)
+                except Exception as e:
+                    logger.error(f"Predicate of {subscription.name} failed: {e}")
+                    subscription.errors += 1
+                    continue
+                if not matched:
+                    subscription.filtered += 1
+                    continue
+
+            if subscription.mode is HandlerMode.INLINE:
+                elapsed = self._run(subscription, data)
+                if elapsed > self.slow_threshold:
+                    self._report_slow(subscription, elapsed)
+            elif subscription.mode is HandlerMode.THREAD:
+                self._pool().submit(self._run, subscription, data)
+            else:
+                self._schedule(subscription, data)
+            delivered += 1
+        return delivered
+
+    def _run(self, subscription: Subscription, data: Dict[str, Any]) -> float:
+        """Call a handler, recording its run time and any error."""
+        started = time.monotonic()
+        try:
+            if subscription.active:
+                subscription.handler(data)
+        except Exception as e:
+            subscription.errors += 1
+            logger.error(f"Handler {subscription.name} for {subscription.msg_type} failed: {e}")
+        elapsed = time.monotonic() - started
+        subscription.calls += 1
+        subscription.latency.record(elapsed)
+        return elapsed
+
+    async def _run_async(self, subscription: Subscription, data: Dict[str, Any]):
+        """Run an asyncio-mode handler, awaiting it if it is a coroutine."""
+        started = time.monotonic()
+        try:
+            if subscription.active:
+                result = subscription.handler(data)
+                if asyncio.iscoroutine(result):
+                    await result
+        except Exception as e:
+            subscription.errors += 1
+            logger.error(f"Handler {subscription.name} for {subscription.msg_type} failed: {e}")
+        subscription.calls += 1
+        subscription.latency.record(time.monotonic() - started)
+
+    def _schedule(self, subscription: Subscription, data: Dict[str, Any]):
+        """Start an asyncio-mode handler on its loop, from any thread."""
+        loop = subscription.loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            loop.create_task(self._run_async(subscription, data))
+        elif not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self._run_async(subscription, data), loop)
+
+    def _report_slow(self, subscription: Subscription, elapsed: float):
+        subscription.slow_calls += 1
+        now = time.monotonic()
+        if now - subscription._last_warning >= self.SLOW_WARNING_INTERVAL:
+            subscription._last_warning = now
+            logger.warning(
+                f"Inline handler {subscription.name} for {subscription.msg_type} "
+                f"blocked the reader for {elapsed * 1000:.0f}ms "
+                f"({subscription.slow_calls} slow calls); consider mode='thread'"
+            )
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Snapshots of every subscription, grouped by message type."""
+        with self._lock:
+            subscriptions = [s for subs in self._subscriptions.values() for s in subs]
+        return [s.snapshot() for s in subscriptions]
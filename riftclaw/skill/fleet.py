@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Fleet - Many Agents on One IO Thread
+=============================================
+Drives thousands of agent identities from a single event loop thread.
+Each agent is an AsyncRiftClawSkill; callers get synchronous handles with
+the familiar connect/discover/enter methods.
+
+Version: 0.1.0
+Author: OpenClaw Framework
+"""
+
+import asyncio
+import copy
+import threading
+from typing import Dict, List, Optional, Any, Iterator
+
+from .riftclaw import RiftClawSkill, Portal, RiftError, merge_config, logger
+from .async_riftclaw import AsyncRiftClawSkill
+from .multiplex import AsyncMultiplexedSession, MultiplexChannel
+
+
+class FleetAgent:
+    """
+    Synchronous handle to one agent driven by a RiftClawFleet.
+
+    Methods block the calling thread until the fleet's IO thread finishes
+    the operation. Do not call them from the IO thread itself.
+    """
+
+    def __init__(self, fleet: 'RiftClawFleet', skill: AsyncRiftClawSkill):
+        self.fleet = fleet
+        self.skill = skill
+
+    @property
+    def agent_id(self) -> str:
+        """Agent UUID."""
+        return self.skill.config['agent_id']
+
+    @property
+    def agent_name(self) -> str:
+        """Human-readable agent name."""
+        return self.skill.config['agent_name']
+
+    def connect(self, url: Optional[str] = None) -> bool:
+        """Connect this agent to a world."""
+        return self.fleet.run(self.skill.connect(url))
+
+    def disconnect(self):
+        """Disconnect this agent from its current world."""
+        return self.fleet.run(self.skill.disconnect())
+
+    def discover(self) -> List[Portal]:
+        """Discover portals in the agent's current world."""
+        return self.fleet.run(self.skill.discover())
+
+    def enter(self, portal_id: str, **passport_kwargs) -> Dict[str, Any]:
+        """Enter a portal; see RiftClawSkill.enter()."""
+        return self.fleet.run(self.skill.enter(portal_id, **passport_kwargs))
+
+    def hibernate(self) -> Optional[Dict[str, Any]]:
+        """Release this agent's socket until it is next used; see RiftClawSkill.hibernate()."""
+        return self.fleet.run(self.skill.hibernate())
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get this agent's skill status."""
+        return self.skill.get_status()
+
+    def __repr__(self) -> str:
+        return f"FleetAgent({self.agent_name!r}, {self.agent_id!r})"
+
+
+class RiftClawFleet:
+    """
+    Runs many agent identities over one event loop thread.
+
+    Each entry in `agent_configs` is a config override dict (agent_name,
+    agent_id, default_world, security.key_path, ...) merged on top of the
+    shared base config. The base config file is parsed once for the fleet.
+    Agents without their own key_path get a fresh in-memory key so that
+    identities are never shared by accident.
+
+    With `agents_per_socket` above 1, connect_all() packs agents onto
+    multiplexed sockets: each agent still signs with its own key, but a
+    relay sees one connection per group instead of one per agent.
+    """
+
+    def __init__(self, agent_configs: List[Dict[str, Any]],
+                 config_path: Optional[str] = None,
+                 max_concurrency: int = 100,
+                 agents_per_socket: int = 1):
+        """
+        Initialize the fleet.
+
+        Args:
+            agent_configs: One config override dict per agent
+            config_path: Shared YAML config (auto-detected if None)
+            max_concurrency: Maximum connects in flight at once
+            agents_per_socket: Agents sharing one multiplexed socket in
+                connect_all() (1 gives every agent its own socket)
+        """
+        if config_path is None:
+            config_path = RiftClawSkill._find_config_file()
+        self._base_config = RiftClawSkill.load_config(config_path)
+        self._base_config['security']['key_path'] = None
+
+        self.max_concurrency = max_concurrency
+        self.agents_per_socket = max(1, agents_per_socket)
+        self.sessions: List[AsyncMultiplexedSession] = []
+        self.loop = asyncio.new_event_loop()
+        self._thread: Optional[threading.Thread] = None
+
+        self.agents: List[FleetAgent] = []
+        self._by_id: Dict[str, FleetAgent] = {}
+        self.add_agents(agent_configs)
+
+        logger.info(f"Fleet initialized with {len(self.agents)} agents")
+
+    def add_agents(self, agent_configs: List[Dict[str, Any]]) -> List[FleetAgent]:
+        """
+        Add agents to the fleet (they start disconnected).
+
+        Args:
+            agent_configs: One config override dict per agent
+
+        Returns:
+            Handles for the new agents
+        """
+        added = []
+        for overrides in agent_configs:
+            config = merge_config(copy.deepcopy(self._base_config), overrides)
+            agent = FleetAgent(self, AsyncRiftClawSkill(config=config))
+            self.agents.append(agent)
+            self._by_id[agent.agent_id] = agent
+            added.append(agent)
+        return added
+
+    def start(self):
+        """Start the fleet's IO thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name='riftclaw-fleet', daemon=True
+        )
+        self._thread.start()
+
+    def run(self, coro, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the fleet loop and wait for its result.
+
+        Args:
+            coro: Coroutine to schedule
+            timeout: Seconds to wait (None waits forever)
+        """
+        if not self._thread or not self._thread.is_alive():
+            raise RiftError("Fleet not started - call start() first")
+        if threading.current_thread() is self._thread:
+            raise RiftError("Blocking fleet call from the fleet IO thread")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def connect_all(self, url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Connect every agent with bounded concurrency.
+
+        Args:
+            url: World URL for all agents (defaults to each agent's config)
+
+        Returns:
+            Mapping of agent_id to True or the exception that stopped it
+        """
+        return self.run(self._connect_all(url))
+
+    async def _connect_all(self, url: Optional[str]) -> Dict[str, Any]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def connect_one(agent: FleetAgent):
+            async with semaphore:
+                return await agent.skill.connect(url)
+
+        async def connect_group(group: List[FleetAgent]):
+            async with semaphore:
+                config = group[0].skill.config
+                target_url = group[0].skill._resolve_target_url(url)
+                session = AsyncMultiplexedSession(target_url, send_queue=config.get('send_queue'),
+                                                  rate_limits=config.get('rate_limits'),
+                                                  keepalive=config.get('keepalive'))
+                await session.open(config.get('connection_timeout', 30))
+            self.sessions.append(session)
+            for agent in group:
+                await session.attach(agent.skill)
+            return [True] * len(group)
+
+        if self.agents_per_socket > 1:
+            size = self.agents_per_socket
+            groups = [self.agents[i:i + size] for i in range(0, len(self.agents), size)]
+            outcomes = await asyncio.gather(
+                *(connect_group(group) for group in groups),
+                return_exceptions=True
+            )
+            results = []
+            for group, outcome in zip(groups, outcomes):
+                results.extend([outcome] * len(group) if isinstance(outcome, BaseException)
+                               else outcome)
+        else:
+            results = await asyncio.gather(
+                *(connect_one(agent) for agent in self.agents),
+                return_exceptions=True
+            )
+        connected = sum(1 for r in results if r is True)
+        logger.info(f"Fleet connected {connected}/{len(self.agents)} agents")
+        return {agent.agent_id: r for agent, r in zip(self.agents, results)}
+
+    def disconnect_all(self):
+        """Disconnect every connected agent."""
+        async def disconnect_all():
+            await asyncio.gather(
+                *(a.skill.disconnect() for a in self.agents if a.skill.ws),
+                return_exceptions=True
+            )
+            sessions, self.sessions = self.sessions, []
+            await asyncio.gather(*(s.close() for s in sessions), return_exceptions=True)
+        self.run(disconnect_all())
+
+    def stop(self):
+        """Disconnect all agents and stop the IO thread."""
+        if not self._thread or not self._thread.is_alive():
+            return
+        self.disconnect_all()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def get(self, agent_id: str) -> Optional[FleetAgent]:
+        """Look up an agent handle by agent_id."""
+        return self._by_id.get(agent_id)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get fleet-wide status counts."""
+        states: Dict[str, int] = {}
+        for agent in self.agents:
+            state = agent.skill.state.value
+            states[state] = states.get(state, 0) + 1
+        return {
+            'agents': len(self.agents),
+            'connected': sum(1 for a in self.agents if a.skill.connected),
+            'sockets': len(self.sessions) + sum(
+                1 for a in self.agents
+                if a.skill.ws and not isinstance(a.skill.ws, MultiplexChannel)
+            ),
+            'states': states,
+            'running': bool(self._thread and self._thread.is_alive())
+        }
+
+    def __len__(self) -> int:
+        return len(self.agents)
+
+    def __iter__(self) -> Iterator[FleetAgent]:
+        return iter(self.agents)
+
+    def __enter__(self) -> 'RiftClawFleet':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Keepalive - Application Pings for Thread-Based Skills
+==============================================================
+A half-open TCP connection looks healthy until the OS gives up on it,
+which can take minutes. Skills therefore ping their world and drop the
+link after a few unanswered pings. RiftClawSkill instances share one
+scheduler thread instead of each running its own; asyncio skills use a
+task per agent on their loop. The same tick hibernates agents that have
+been idle for too long.
+
+Version: 0.1.0
+Author: OpenClaw Framework
+"""
+
+import logging
+import threading
+import time
+import weakref
+from typing import Optional
+
+logger = logging.getLogger('riftclaw')
+
+
+class KeepaliveScheduler:
+    """
+    One daemon thread that drives the keepalive of every registered skill.
+
+    Skills provide `_tick(now)`, which sends a ping, declares the peer dead
+    or hibernates an idle agent when due, and returns the seconds until it
+    next wants to run (None while it has no link). Skills are held weakly, so a skill
+    that is dropped stops being pinged.
+    """
+
+    # Upper bound on a sleep, so idle skills that connect are picked up
+    IDLE_POLL = 1.0
+
+    _shared: Optional['KeepaliveScheduler'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._skills: 'weakref.WeakSet' = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def shared(cls) -> 'KeepaliveScheduler':
+        """The process-wide scheduler."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def register(self, skill):
+        """Start ticking `skill`, and the scheduler thread if needed."""
+        with self._lock:
+            self._skills.add(skill)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        # A newly connected skill should ping on its own schedule, not ours
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                skills = list(self._skills)
+            wait = self.IDLE_POLL
+            for skill in skills:
+                try:
+                    delay = skill._tick(now)
+                except Exception as e:
+                    logger.error(f"Keepalive tick failed: {e}")
+                    continue
+                if delay is not None:
+                    wait = min(wait, delay)
+            del skills
+            self._wake.wait(max(wait, 0.0))
+            self._wake.clear()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Latency - Round-Trip Statistics
+========================================
+A smoothed average tells you how a world usually behaves; the tail tells
+you how long to wait before giving up on it. LatencyStats keeps both: an
+EWMA with mean deviation in the style of TCP's SRTT/RTTVAR (RFC 6298) and
+percentiles over a sliding window of recent samples. AdaptiveTimeouts turns
+them into per-world, per-operation deadlines.
+
+Version: 0.1.0
+Author: OpenClaw Framework
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Dict, Optional, Any, Tuple
+
+
+class LatencyStats:
+    """EWMA, deviation and windowed percentiles of latency samples (seconds)."""
+
+    def __init__(self, alpha: float = 0.125, beta: float = 0.25, window: int = 256):
+        """
+        Args:
+            alpha: EWMA gain for the smoothed latency
+            beta: EWMA gain for the mean deviation
+            window: Recent samples kept for percentiles
+        """
+        self.alpha = alpha
+        self.beta = beta
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.last: Optional[float] = None
+        self.ewma: Optional[float] = None
+        self.deviation: Optional[float] = None
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float):
+        """Add one latency sample."""
+        with self._lock:
+            self.count += 1
+            self.last = seconds
+            self._samples.append(seconds)
+            if self.ewma is None:
+                self.ewma, self.deviation = seconds, seconds / 2
+            else:
+                self.deviation += self.beta * (abs(seconds - self.ewma) - self.deviation)
+                self.ewma += self.alpha * (seconds - self.ewma)
+            self.min = seconds if self.min is None else min(self.min, seconds)
+            self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile (0-100) of the window, or None without samples."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(math.ceil(q / 100 * len(samples)), 1)
+        return samples[rank - 1]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters, EWMA and p50/p90/p99 for status reporting."""
+        return {
+            'samples': self.count,
+            'last': self.last,
+            'ewma': self.ewma,
+            'deviation': self.deviation,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99)
+        }
+
+
+class AdaptiveTimeouts:
+    """
+    Per-world, per-operation deadlines derived from observed latencies.
+    
+    Latencies are kept per (url, operation) and shared by every skill in
+    the process, since they describe the world rather than the agent. Once
+    a pair has `min_samples` observations its deadline is the configured
+    percentile plus four mean deviations (at least `margin` seconds),
+    clamped between `floor` and the caller's ceiling. Each timeout doubles
+    the pair's deadline until the next success, so a world that slowed
+    down is not cut off by estimates from when it was fast.
+    """
+    
+    # Doublings applied after consecutive timeouts, at most
+    MAX_BACKOFF = 6
+    
+    _stats: Dict[Tuple[str, str], LatencyStats] = {}
+    _backoff: Dict[Tuple[str, str], int] = {}
+    _registry_lock = threading.Lock()
+    
+    def __init__(self, enabled: bool = True, percentile: float = 99,
+                 margin: float = 0.25, min_samples: int = 5, floor: float = 0.5):
+        """
+        Args:
+            enabled: Use observed latencies (otherwise deadlines are the ceilings)
+            percentile: Latency percentile a deadline starts from
+            margin: Minimum seconds added on top of the percentile
+            min_samples: Observations before a pair's deadline adapts
+            floor: Shortest deadline in seconds
+        """
+        self.enabled = enabled
+        self.percentile = percentile
+        self.margin = margin
+        self.min_samples = min_samples
+        self.floor = floor
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'AdaptiveTimeouts':
+        """Settings from a skill config's `adaptive_timeouts` section."""
+        settings = config.get('adaptive_timeouts') or {}
+        return cls(
+            enabled=settings.get('enabled', True),
+            percentile=settings.get('percentile', 99),
+            margin=settings.get('margin', 0.25),
+            min_samples=settings.get('min_samples', 5),
+            floor=settings.get('floor', 0.5)
+        )
+    
+    @classmethod
+    def stats_for(cls, url: str, operation: str) -> LatencyStats:
+        """The process-wide latency statistics for an operation on a world."""
+        with cls._registry_lock:
+            stats = cls._stats.get((url, operation))
+            if stats is None:
+                stats = cls._stats[(url, operation)] = LatencyStats()
+            return stats
+    
+    @classmethod
+    def reset_all(cls):
+        """Forget every observation (mainly for tests and benchmarks)."""
+        with cls._registry_lock:
+            cls._stats.clear()
+            cls._backoff.clear()
+    
+    def observe(self, url: str, operation: str, seconds: float):
+        """Record a completed operation and clear any timeout backoff."""
+        self.stats_for(url, operation).record(seconds)
+        with self._registry_lock:
+            self._backoff.pop((url, operation), None)
+    
+    def timed_out(self, url: str, operation: str):
+        """Record a timeout; the next deadline for the pair doubles."""
+        key = (url, operation)
+        with self._registry_lock:
+            self._backoff[key] = min(self._backoff.get(key, 0) + 1, self.MAX_BACKOFF)
+    
+    def timeout(self, url: Optional[str], operation: str, ceiling: float) -> float:
+        """Seconds to wait for `operation` on `url`, never more than `ceiling`."""
+        if not self.enabled or not url:
+            return ceiling
+        with self._registry_lock:
+            stats = self._stats.get((url, operation))
+            backoff = self._backoff.get((url, operation), 0)
+        if stats is None or stats.count < self.min_samples:
+            return ceiling
+        estimate = stats.percentile(self.percentile) + max(self.margin, 4 * stats.deviation)
+        return min(max(estimate, self.floor) * 2 ** backoff, ceiling)
+    
+    def snapshot(self, url: str, ceilings: Dict[str, float]) -> Dict[str, Any]:
+        """Current deadline, sample count and percentiles per operation on `url`."""
+        report = {}
+        for operation, ceiling in ceilings.items():
+            with self._registry_lock:
+                stats = self._stats.get((url, operation))
+                backoff = self._backoff.get((url, operation), 0)
+            report[operation] = {
+                'timeout': self.timeout(url, operation, ceiling),
+                'ceiling': ceiling,
+                'samples': stats.count if stats else 0,
+                'p50': stats.percentile(50) if stats else None,
+                'p99': stats.percentile(99) if stats else None,
+                'backoff': backoff
+            }
+        return report
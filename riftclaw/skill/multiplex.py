@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Multiplexing - Many Agent Identities on One Socket
+===========================================================
+Every outbound frame already names its sender (`agent_id`) and every
+request carries a `request_id`, so one WebSocket to a relay can carry many
+agents. Each agent keeps its own skill, key and signatures; only the
+socket is shared. Inbound frames are routed back by echoed `request_id`,
+then by `agent_id`, and anything addressed to nobody in particular
+(welcome, socket-wide errors) goes to every agent.
+
+Agents on a shared socket do not ping it themselves. The session pings
+once per interval (signed by one of its agents), keeps the round-trip
+statistics and drops the socket after too many missed pongs, which
+disconnects every agent on it.
+
+Version: 0.1.0
+Author: OpenClaw Framework
+"""
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+from .connector import ConnectionSetup
+from .keepalive import KeepaliveScheduler
+from .latency import LatencyStats
+from .outbound import Lane, OutboundQueue, drain
+from .riftclaw import (
+    RiftClawSkill,
+    WorldConnection,
+    PortalState,
+    RiftError,
+    ConnectionError,
+    logger,
+)
+
+
+class MultiplexChannel:
+    """
+    One agent's slice of a shared session.
+
+    Stands in for both the WorldConnection and the socket a skill normally
+    owns, so the skill's connect/send/close paths work unchanged.
+    """
+
+    def __init__(self, session: '_MultiplexSessionBase', skill: RiftClawSkill):
+        self.session = session
+        self.skill = skill
+        self.url = session.url
+        self.ws = self
+        self.thread = None
+
+    @property
+    def agent_id(self) -> str:
+        """Agent UUID this channel carries."""
+        return self.skill.config['agent_id']
+
+    @property
+    def alive(self) -> bool:
+        """True while the shared socket is open."""
+        return self.session.alive
+
+    @property
+    def welcome(self) -> Optional[Dict[str, Any]]:
+        """The shared socket's welcome message."""
+        return self.session.welcome
+
+    @property
+    def outbox(self) -> Optional[OutboundQueue]:
+        """The shared socket's send queue."""
+        return self.session.outbox
+
+    def attach(self, owner: RiftClawSkill):
+        """Start routing frames to the skill, replaying open and welcome."""
+        self.session._register(self)
+        owner._on_open(self)
+        if self.session.welcome_frame:
+            owner._on_message(self, self.session.welcome_frame)
+
+    def detach(self):
+        """Stop routing frames to the skill."""
+        self.session._unregister(self)
+
+    def send(self, frame: str, lane: Lane = Lane.REQUEST,
+             coalesce_key: Optional[str] = None, request_id: Optional[str] = None) -> bool:
+        """Queue a frame on the shared socket; a reply to `request_id` comes back here."""
+        self.session._track(self, request_id)
+        return self.session._send(frame, lane, coalesce_key)
+
+    def close(self, timeout: Optional[float] = None):
+        """Leave the session; the shared socket stays open for others."""
+        self.detach()
+
+    def __repr__(self) -> str:
+        return f"MultiplexChannel({self.agent_id!r}, {self.url!r})"
+
+
+class AsyncMultiplexChannel(MultiplexChannel):
+    """MultiplexChannel for AsyncRiftClawSkill, whose sockets are awaited."""
+
+    async def send(self, frame: str, lane: Lane = Lane.REQUEST,
+                   coalesce_key: Optional[str] = None, request_id: Optional[str] = None) -> bool:
+        """Queue a frame on the shared socket; a reply to `request_id` comes back here."""
+        self.session._track(self, request_id)
+        return self.session._send(frame, lane, coalesce_key)
+
+    async def close(self, timeout: Optional[float] = None):
+        """Leave the session; the shared socket stays open for others."""
+        self.detach()
+
+
+class _MultiplexSessionBase:
+    """Channel registry and inbound demultiplexing shared by both sessions."""
+
+    # Outstanding request_ids remembered for routing; oldest are forgotten first
+    MAX_ROUTES = 65536
+
+    def __init__(self, url: str, keepalive: Optional[Dict[str, Any]] = None):
+        self.url = url
+        settings = {**RiftClawSkill.DEFAULT_CONFIG['keepalive'], **(keepalive or {})}
+        self.keepalive_interval = settings['interval']
+        self.max_missed = settings['max_missed']
+        self.rtt = LatencyStats()
+        self._pings: 'OrderedDict[str, float]' = OrderedDict()
+        self._missed_pongs = 0
+        self._next_ping = 0.0
+        self._keepalive_stats = {'pings': 0, 'pongs': 0, 'dead_peers': 0}
+        self.welcome: Optional[Dict[str, Any]] = None
+        self.welcome_frame: Optional[str] = None
+        self._channels: Dict[str, MultiplexChannel] = {}
+        self._routes: 'OrderedDict[str, MultiplexChannel]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.frames_in = 0
+        self.frames_out = 0
+        self.routed_by_request = 0
+        self.routed_by_agent = 0
+        self.broadcasts = 0
+
+    @property
+    def alive(self) -> bool:
+        raise NotImplementedError
+
+    @property
+    def outbox(self) -> Optional[OutboundQueue]:
+        """Send queue of the shared socket, while open."""
+        raise NotImplementedError
+
+    def _register(self, channel: MultiplexChannel):
+        with self._lock:
+            existing = self._channels.get(channel.agent_id)
+            if existing and existing is not channel:
+                raise RiftError(f"Agent {channel.agent_id} already on this session")
+            self._channels[channel.agent_id] = channel
+
+    def _unregister(self, channel: MultiplexChannel):
+        with self._lock:
+            if self._channels.get(channel.agent_id) is channel:
+                del self._channels[channel.agent_id]
+            for request_id in [r for r, c in self._routes.items() if c is channel]:
+                del self._routes[request_id]
+
+    def _track(self, channel: MultiplexChannel, request_id: Optional[str]):
+        """Remember which channel sent a request so its reply finds it."""
+        with self._lock:
+            self.frames_out += 1
+            if request_id:
+                self._routes[request_id] = channel
+                while len(self._routes) > self.MAX_ROUTES:
+                    self._routes.popitem(last=False)
+
+    def _reset_keepalive(self):
+        """Forget outstanding pings; the first ping on a new socket waits an interval."""
+        with self._lock:
+            self._pings.clear()
+            self._missed_pongs = 0
+            self._next_ping = time.monotonic() + self.keepalive_interval
+
+    def _tick(self, now: float) -> Optional[float]:
+        """
+        Ping the shared socket if due, or abort it after too many missed pongs.
+
+        Returns:
+            Seconds until the next ping, or None while there is nothing to ping
+        """
+        if not self.keepalive_interval or not self.alive:
+            return None
+        with self._lock:
+            if now < self._next_ping:
+                return self._next_ping - now
+            self._next_ping = now + self.keepalive_interval
+            if self._pings:
+                self._missed_pongs += 1
+            missed = self._missed_pongs
+            # Pings are signed like any frame; any attached agent can sign
+            channel = next(iter(self._channels.values()), None)
+            request_id = None
+            if missed < self.max_missed and channel is not None:
+                request_id = uuid.uuid4().hex
+                self._pings[request_id] = now
+                while len(self._pings) > self.max_missed:
+                    self._pings.popitem(last=False)
+        if missed >= self.max_missed:
+            logger.warning(f"No pong from {self.url} for {missed} pings, dropping the shared socket")
+            self._keepalive_stats['dead_peers'] += 1
+            self._reset_keepalive()
+            self._abort()
+            return None
+        if request_id is not None:
+            frame = channel.skill._build_frame('ping', request_id=request_id)
+            if self._send(frame, Lane.CONTROL, None):
+                self._keepalive_stats['pings'] += 1
+        return self.keepalive_interval
+
+    def _handle_pong(self, data: Dict[str, Any]) -> bool:
+        """
+        Record a pong to the session's own ping.
+
+        Returns:
+            False if the pong answers someone else's ping
+        """
+        request_id = data.get('request_id')
+        now = time.monotonic()
+        with self._lock:
+            if request_id in self._pings:
+                sent_at = self._pings[request_id]
+            elif not request_id and self._pings:
+                # Worlds that do not echo IDs answer pings in order
+                sent_at = next(iter(self._pings.values()))
+            else:
+                return False
+            while self._pings and next(iter(self._pings.values())) <= sent_at:
+                self._pings.popitem(last=False)
+            self._missed_pongs = 0
+            self._keepalive_stats['pongs'] += 1
+            skills = [channel.skill for channel in self._channels.values()]
+        self.rtt.record(now - sent_at)
+        # Each agent's status shows the round trip of the link it uses
+        for skill in skills:
+            skill._rtt_stats(self.url).record(now - sent_at)
+        return True
+
+    def _abort(self):
+        """Tear down the shared socket without waiting on the peer."""
+        raise NotImplementedError
+
+    def _new_outbox(self) -> OutboundQueue:
+        """Send queue for the shared socket; its governor is shared by every agent."""
+        return OutboundQueue.from_config(
+            {'send_queue': self.send_queue, 'rate_limits': self.rate_limits}, self.url
+        )
+
+    def _recipients(self, data: Dict[str, Any]) -> List[MultiplexChannel]:
+        """Pick the channels an inbound frame belongs to."""
+        with self._lock:
+            self.frames_in += 1
+            request_id = data.get('request_id')
+            if request_id and request_id in self._routes:
+                self.routed_by_request += 1
+                return [self._routes.pop(request_id)]
+
+            channel = self._channels.get(data.get('agent_id'))
+            if channel:
+                self.routed_by_agent += 1
+                return [channel]
+
+            self.broadcasts += 1
+            return list(self._channels.values())
+
+    def _dispatch(self, message: str):
+        """Route one inbound frame to its agent(s)."""
+        try:
+            data = json.loads(message)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse multiplexed message: {e}")
+            return
+
+        if data.get('type') == 'welcome' and self.welcome is None:
+            self.welcome, self.welcome_frame = data, message
+        if data.get('type') == 'pong' and self._handle_pong(data):
+            return
+
+        for channel in self._recipients(data):
+            channel.skill._on_message(channel, message)
+
+    def _close_channels(self, close_status_code=None, close_msg=None) -> List[MultiplexChannel]:
+        """Drop every channel, telling each skill its socket closed."""
+        with self._lock:
+            channels = list(self._channels.values())
+            self._channels.clear()
+            self._routes.clear()
+        for channel in channels:
+            channel.skill._on_close(channel, close_status_code, close_msg)
+        return channels
+
+    @property
+    def agents(self) -> List[str]:
+        """agent_ids currently attached."""
+        return list(self._channels)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Session routing counters."""
+        return {
+            'url': self.url,
+            'alive': self.alive,
+            'agents': len(self._channels),
+            'pending_routes': len(self._routes),
+            'frames_in': self.frames_in,
+            'frames_out': self.frames_out,
+            'routed_by_request': self.routed_by_request,
+            'routed_by_agent': self.routed_by_agent,
+            'broadcasts': self.broadcasts,
+            'keepalive': {
+                'interval': self.keepalive_interval,
+                'max_missed': self.max_missed,
+                'missed': self._missed_pongs,
+                **self._keepalive_stats
+            },
+            'rtt': self.rtt.snapshot(),
+            'send_queue': self.outbox.stats() if self.outbox is not None else {},
+            'rate_limits': self.outbox.governor.stats() if self.outbox is not None and self.outbox.governor else {}
+        }
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+
+class MultiplexedSession(_MultiplexSessionBase):
+    """
+    One WebSocket shared by many RiftClawSkill identities.
+
+    Usage:
+        session = MultiplexedSession("wss://relay.example.com").open()
+        for skill in skills:
+            session.attach(skill)
+        skills[0].discover()
+
+    Attached skills behave as if connected: discover(), enter() and
+    get_status() work as usual. Entering a portal moves that agent onto
+    its own socket to the destination; disconnect() leaves the session.
+    """
+
+    def __init__(self, url: str, setup: Optional[ConnectionSetup] = None,
+                 send_queue: Optional[Dict[str, Any]] = None,
+                 rate_limits: Optional[Dict[str, Any]] = None,
+                 keepalive: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            url: WebSocket URL of the relay or world
+            setup: DNS/TLS setup (the process-wide one if None)
+            send_queue: Send queue limits, as in the skill config's
+                `send_queue` section (defaults if None)
+            rate_limits: Rate limits shared by the attached agents, as in
+                the skill config's `rate_limits` section (defaults if None)
+            keepalive: Ping interval and missed-pong limit for the shared
+                socket, as in the skill config's `keepalive` section
+        """
+        super().__init__(url, keepalive)
+        self.setup = setup or ConnectionSetup.shared()
+        self.send_queue = send_queue or {}
+        self.rate_limits = rate_limits if rate_limits is not None else RiftClawSkill.DEFAULT_CONFIG['rate_limits']
+        self._connection: Optional[WorldConnection] = None
+
+    @property
+    def alive(self) -> bool:
+        """True while the shared socket is open."""
+        return bool(self._connection and self._connection.alive)
+
+    @property
+    def outbox(self) -> Optional[OutboundQueue]:
+        """Send queue of the shared socket, while open."""
+        return self._connection.outbox if self._connection else None
+
+    def open(self, timeout: float = 30) -> 'MultiplexedSession':
+        """
+        Open the shared socket and wait for the welcome.
+
+        Raises:
+            ConnectionError: If the socket does not open in time
+        """
+        connection = WorldConnection(
+            self.url, setup=self.setup, timeout=timeout,
+            outbox=self._new_outbox()
+        )
+        connection.attach(self)
+        self._connection = connection.start()
+
+        if not connection.welcomed.wait(timeout) or not connection.alive:
+            connection.detach()
+            connection.close()
+            self._connection = None
+            raise ConnectionError(f"Multiplexed session to {self.url} failed to open")
+
+        # The reader thread may still be dispatching the welcome
+        if self.welcome is None:
+            self.welcome, self.welcome_frame = connection.welcome, connection.welcome_frame
+        self._reset_keepalive()
+        if self.keepalive_interval:
+            KeepaliveScheduler.shared().register(self)
+        logger.info(f"Multiplexed session open to {self.url}")
+        return self
+
+    def attach(self, skill: RiftClawSkill) -> MultiplexChannel:
+        """Put an agent onto the shared socket."""
+        if not self.alive:
+            raise ConnectionError("Multiplexed session is not open")
+
+        if skill.ws:
+            skill.disconnect(park=False)
+        channel = MultiplexChannel(self, skill)
+        skill.state = PortalState.CONNECTING
+        skill._adopt(channel)
+        return channel
+
+    def close(self):
+        """Close the shared socket and disconnect every attached agent."""
+        connection, self._connection = self._connection, None
+        if connection:
+            connection.detach()
+            connection.close(timeout=5)
+        self._close_channels(None, 'session closed')
+
+    def _send(self, frame: str, lane: Lane, coalesce_key: Optional[str]) -> bool:
+        if not self._connection:
+            raise ConnectionError("Multiplexed session is closed")
+        return self._connection.send(frame, lane, coalesce_key)
+
+    def _abort(self):
+        connection = self._connection
+        if connection:
+            connection.abort()
+
+    # WorldConnection owner callbacks
+
+    def _on_open(self, ws):
+        logger.debug(f"Multiplexed socket open to {self.url}")
+
+    def _on_message(self, ws, message: str):
+        self._dispatch(message)
+
+    def _on_error(self, ws, error):
+        logger.error(f"Multiplexed session error: {error}")
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        logger.info(f"Multiplexed session closed: {close_status_code} - {close_msg}")
+        self._close_channels(close_status_code, close_msg)
+
+    def __enter__(self) -> 'MultiplexedSession':
+        if not self.alive:
+            self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class AsyncMultiplexedSession(_MultiplexSessionBase):
+    """
+    One asyncio WebSocket shared by many AsyncRiftClawSkill identities.
+
+    Same routing as MultiplexedSession; a single reader task feeds every
+    attached agent.
+    """
+
+    def __init__(self, url: str, setup: Optional[ConnectionSetup] = None,
+                 send_queue: Optional[Dict[str, Any]] = None,
+                 rate_limits: Optional[Dict[str, Any]] = None,
+                 keepalive: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            url: WebSocket URL of the relay or world
+            setup: DNS/TLS setup (the process-wide one if None)
+            send_queue: Send queue limits, as in the skill config's
+                `send_queue` section (defaults if None)
+            rate_limits: Rate limits shared by the attached agents, as in
+                the skill config's `rate_limits` section (defaults if None)
+            keepalive: Ping interval and missed-pong limit for the shared
+                socket, as in the skill config's `keepalive` section
+        """
+        super().__init__(url, keepalive)
+        self.setup = setup or ConnectionSetup.shared()
+        self.send_queue = send_queue or {}
+        self.rate_limits = rate_limits if rate_limits is not None else RiftClawSkill.DEFAULT_CONFIG['rate_limits']
+        self._ws = None
+        self._outbox: Optional[OutboundQueue] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        """True while the shared socket is open."""
+        return self._ws is not None
+
+    @property
+    def outbox(self) -> Optional[OutboundQueue]:
+        """Send queue of the shared socket, while open."""
+        return self._outbox
+
+    async def open(self, timeout: float = 30) -> 'AsyncMultiplexedSession':
+        """
+        Open the shared socket and wait for the welcome.
+
+        Raises:
+            ConnectionError: If the socket does not open in time
+        """
+        if websockets is None:
+            raise RiftError("websockets not installed")
+
+        try:
+            options = await self.setup.websockets_options(self.url, timeout)
+            started = time.monotonic()
+            ws = await websockets.connect(
+                self.url, open_timeout=timeout, compression=None, **options
+            )
+            self.setup.record_phase(self.url, connect=time.monotonic() - started)
+            first_frame = await asyncio.wait_for(ws.recv(), timeout=timeout)
+        except Exception as e:
+            raise ConnectionError(f"Multiplexed session to {self.url} failed to open: {e}")
+
+        self._ws = ws
+        self._outbox = self._new_outbox()
+        self._writer_task = asyncio.create_task(drain(self._outbox, ws.send))
+        self._dispatch(first_frame)
+        self._reader_task = asyncio.create_task(self._read_loop(ws))
+        self._reset_keepalive()
+        if self.keepalive_interval:
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+        logger.info(f"Multiplexed session open to {self.url}")
+        return self
+
+    async def attach(self, skill) -> AsyncMultiplexChannel:
+        """Put an AsyncRiftClawSkill onto the shared socket."""
+        if not self.alive:
+            raise ConnectionError("Multiplexed session is not open")
+
+        if skill.ws:
+            await skill.disconnect()
+        channel = AsyncMultiplexChannel(self, skill)
+        skill.state = PortalState.CONNECTING
+        skill.ws = channel
+        channel.attach(skill)
+        return channel
+
+    async def close(self):
+        """Close the shared socket and disconnect every attached agent."""
+        ws, self._ws = self._ws, None
+        self._close_outbox()
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+        if ws:
+            await ws.close()
+        for task in (self._reader_task, self._writer_task, self._keepalive_task):
+            if task:
+                await asyncio.gather(task, return_exceptions=True)
+        self._reader_task = self._writer_task = self._keepalive_task = None
+        self._detach_skills(self._close_channels(None, 'session closed'))
+
+    def _send(self, frame: str, lane: Lane, coalesce_key: Optional[str]) -> bool:
+        if self._outbox is None:
+            raise ConnectionError("Multiplexed session is closed")
+        return self._outbox.put(frame, lane, coalesce_key)
+
+    def _abort(self):
+        transport = getattr(self._ws, 'transport', None)
+        if transport is not None:
+            transport.abort()
+
+    async def _keepalive_loop(self):
+        """Ping the shared socket until it goes away."""
+        while True:
+            delay = self._tick(time.monotonic())
+            if delay is None:
+                return
+            await asyncio.sleep(delay)
+
+    def _close_outbox(self):
+        outbox, self._outbox = self._outbox, None
+        if outbox is not None:
+            outbox.close()
+
+    async def _read_loop(self, ws):
+        close_code, close_reason = None, None
+        try:
+            async for message in ws:
+                self._dispatch(message)
+        except websockets.ConnectionClosed as e:
+            close_code, close_reason = e.code, e.reason
+        except Exception as e:
+            logger.error(f"Multiplexed session error: {e}")
+        finally:
+            if ws is self._ws:
+                self._ws = None
+                self._close_outbox()
+                self._detach_skills(self._close_channels(close_code, close_reason))
+
+    @staticmethod
+    def _detach_skills(channels: List[MultiplexChannel]):
+        for channel in channels:
+            if channel.skill.ws is channel:
+                channel.skill.ws = None
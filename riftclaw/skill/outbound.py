@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Outbound - Prioritised Send Queues
+===========================================
+Writing straight to a socket from agent code lets one slow link stall the
+agent, puts no bound on buffered memory, and queues a handoff behind
+whatever bulk traffic was sent first. Each connection instead gets an
+OutboundQueue drained by a single writer: control frames (handoffs,
+keepalives) go before requests such as discover, which go before
+telemetry. Under backpressure telemetry is coalesced or dropped first.
+A queue may carry the link's RateGovernor, whose socket-wide budget the
+writer spends before each frame.
+
+Version: 0.1.0
+Author: OpenClaw Framework
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Awaitable, Callable, Dict, Optional, Any
+
+try:
+    from .ratelimit import RateGovernor
+except ImportError:  # Run as a script from skill/
+    from ratelimit import RateGovernor
+
+logger = logging.getLogger('riftclaw')
+
+
+class Lane(IntEnum):
+    """Send priority; lower values are written first."""
+    CONTROL = 0  # Handoffs, keepalives, replays after a resume
+    REQUEST = 1  # discover and other request/response traffic
+    TELEMETRY = 2  # Fire-and-forget updates; coalesced or dropped first
+
+
+# Lanes for known message types; anything else uses the caller's default
+MESSAGE_LANES: Dict[str, Lane] = {
+    'handoff_request': Lane.CONTROL,
+    'handoff_confirm': Lane.CONTROL,
+    'handoff_rejected': Lane.CONTROL,
+    'handoff_cancel': Lane.CONTROL,
+    'register_world': Lane.CONTROL,
+    'ping': Lane.CONTROL,
+    'pong': Lane.CONTROL,
+    'discover': Lane.REQUEST,
+}
+
+# What happens to telemetry that arrives while the queue is full
+TELEMETRY_POLICIES = ('drop_oldest', 'drop_newest')
+
+
+def lane_for(msg_type: str, default: Lane = Lane.REQUEST) -> Lane:
+    """Lane a message type is sent on."""
+    return MESSAGE_LANES.get(msg_type, default)
+
+
+class _Entry:
+    __slots__ = ('frame', 'size', 'key', 'enqueued_at')
+
+    def __init__(self, frame: str, key: Optional[str]):
+        self.frame = frame
+        self.size = len(frame)
+        self.key = key
+        self.enqueued_at = time.monotonic()
+
+
+class OutboundQueue:
+    """
+    Bounded, prioritised queue of wire frames for one connection.
+
+    The queue is capped by message count and by bytes. Frames with a
+    `coalesce_key` replace a queued frame with the same key in place
+    (latest value wins, original position kept). When full, telemetry is
+    evicted to make room for higher lanes; telemetry itself is then
+    dropped according to `telemetry_policy`. Control and request frames
+    are never dropped once queued: put() refuses them instead.
+    """
+
+    def __init__(self, max_messages: int = 1024, max_bytes: int = 1 << 20,
+                 telemetry_policy: str = 'drop_oldest',
+                 notify: Optional[Callable[[], None]] = None,
+                 governor: Optional[RateGovernor] = None):
+        """
+        Args:
+            max_messages: Frames held across all lanes
+            max_bytes: Bytes held across all lanes
+            telemetry_policy: 'drop_oldest' evicts queued telemetry for new
+                telemetry; 'drop_newest' refuses the new frame
+            notify: Called (outside the lock) after each put, when
+                get_nowait() empties the queue, and on close
+            governor: Rate limits of the link this queue feeds
+        """
+        if telemetry_policy not in TELEMETRY_POLICIES:
+            raise ValueError(f"Unknown telemetry_policy: {telemetry_policy}")
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.telemetry_policy = telemetry_policy
+        self.notify = notify
+        self.governor = governor
+        self._lanes = {lane: deque() for lane in Lane}
+        self._keyed: Dict[Lane, Dict[str, _Entry]] = {lane: {} for lane in Lane}
+        self._count = 0
+        self._bytes = 0
+        self._closed = False
+        self._ready = threading.Condition()
+        # Set through drain()'s notify hook; created on the writer's loop
+        self._drained: Optional[asyncio.Event] = None
+        self._stats = {
+            lane: {'queued': 0, 'sent': 0, 'dropped': 0, 'coalesced': 0,
+                   'rejected': 0, 'wait_total': 0.0, 'wait_max': 0.0}
+            for lane in Lane
+        }
+        self.peak_messages = 0
+        self.peak_bytes = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], url: Optional[str] = None,
+                    **kwargs) -> 'OutboundQueue':
+        """
+        Build a queue from a skill config's `send_queue` section, with a
+        governor for the link to `url` from its `rate_limits` section.
+        """
+        settings = config.get('send_queue') or {}
+        return cls(
+            max_messages=settings.get('max_messages', 1024),
+            max_bytes=settings.get('max_bytes', 1 << 20),
+            telemetry_policy=settings.get('telemetry_policy', 'drop_oldest'),
+            governor=RateGovernor.from_config(config, url),
+            **kwargs
+        )
+
+    @property
+    def closed(self) -> bool:
+        """True once the connection behind the queue is gone."""
+        return self._closed
+
+    def put(self, frame: str, lane: Lane = Lane.REQUEST,
+            coalesce_key: Optional[str] = None) -> bool:
+        """
+        Queue a frame for the writer.
+
+        Returns:
+            True if queued (or coalesced into a queued frame); False if it
+            was dropped or refused for lack of room, or the queue is closed
+        """
+        with self._ready:
+            if self._closed:
+                return False
+            stats = self._stats[lane]
+
+            queued = self._keyed[lane].get(coalesce_key) if coalesce_key else None
+            if queued is not None:
+                grow = len(frame) - queued.size
+                if grow > 0 and not self._make_room(lane, grow, messages=0):
+                    return self._refuse(lane)
+                if self._keyed[lane].get(coalesce_key) is not queued:
+                    # Evicted while making room for its own replacement
+                    queued = None
+
+            if queued is not None:
+                self._bytes += len(frame) - queued.size
+                queued.frame, queued.size = frame, len(frame)
+                self.peak_bytes = max(self.peak_bytes, self._bytes)
+                stats['coalesced'] += 1
+                self._ready.notify()
+            elif self._make_room(lane, len(frame)):
+                entry = _Entry(frame, coalesce_key)
+                self._lanes[lane].append(entry)
+                if coalesce_key:
+                    self._keyed[lane][coalesce_key] = entry
+                self._count += 1
+                self._bytes += entry.size
+                self.peak_messages = max(self.peak_messages, self._count)
+                self.peak_bytes = max(self.peak_bytes, self._bytes)
+                stats['queued'] += 1
+                self._ready.notify()
+            else:
+                return self._refuse(lane)
+
+        if self.notify:
+            self.notify()
+        return True
+
+    def _refuse(self, lane: Lane) -> bool:
+        """Count a frame put() turned away (caller holds the lock)."""
+        self._stats[lane]['dropped' if lane == Lane.TELEMETRY else 'rejected'] += 1
+        return False
+
+    def _make_room(self, lane: Lane, size: int, messages: int = 1) -> bool:
+        """
+        Evict telemetry until `messages` more frames and `size` more bytes
+        fit (caller holds the lock).
+        """
+        def full() -> bool:
+            return (self._count + messages > self.max_messages
+                    or self._bytes + size > self.max_bytes)
+
+        if not full():
+            return True
+        if lane == Lane.TELEMETRY and self.telemetry_policy == 'drop_newest':
+            return False
+
+        telemetry = self._lanes[Lane.TELEMETRY]
+        while full() and telemetry:
+            self._discard(Lane.TELEMETRY, telemetry.popleft())
+            self._stats[Lane.TELEMETRY]['dropped'] += 1
+        return not full()
+
+    def _discard(self, lane: Lane, entry: _Entry):
+        self._count -= 1
+        self._bytes -= entry.size
+        if entry.key and self._keyed[lane].get(entry.key) is entry:
+            del self._keyed[lane][entry.key]
+
+    def get_nowait(self) -> Optional[str]:
+        """Highest-priority queued frame, or None if the queue is empty."""
+        with self._ready:
+            frame = self._pop()
+            emptied = frame is not None and not self._count
+        if emptied and self.notify:
+            self.notify()
+        return frame
+
+    def get(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Wait for the next frame (writer threads).
+
+        Returns:
+            A frame, or None once the queue is closed or `timeout` passes
+        """
+        with self._ready:
+            self._ready.wait_for(lambda: self._count or self._closed, timeout)
+            return self._pop()
+
+    def _pop(self) -> Optional[str]:
+        for lane, entries in self._lanes.items():
+            if entries:
+                entry = entries.popleft()
+                self._discard(lane, entry)
+                waited = time.monotonic() - entry.enqueued_at
+                stats = self._stats[lane]
+                stats['sent'] += 1
+                stats['wait_total'] += waited
+                stats['wait_max'] = max(stats['wait_max'], waited)
+                if not self._count:
+                    self._ready.notify_all()
+                return entry.frame
+        return None
+
+    def pace(self) -> bool:
+        """
+        Wait until the link's rate budget allows another frame (writer
+        threads).
+
+        Returns:
+            False if the queue was closed meanwhile
+        """
+        wait = self.governor.pace() if self.governor else 0.0
+        with self._ready:
+            if wait:
+                self._ready.wait_for(lambda: self._closed, wait)
+            return not self._closed
+
+    def wait_empty(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the writer has taken every queued frame (writer threads).
+
+        Returns:
+            True if the queue emptied, False on timeout
+        """
+        with self._ready:
+            return self._ready.wait_for(lambda: not self._count, timeout)
+
+    async def drained(self):
+        """
+        Wait until the writer has taken every queued frame or the queue
+        closed (on the loop running drain(); bound it with
+        asyncio.wait_for()).
+        """
+        if self._drained is None:
+            self._drained = asyncio.Event()
+        while self._count and not self._closed:
+            self._drained.clear()
+            await self._drained.wait()
+
+    def close(self):
+        """Stop accepting frames, drop what is queued and wake the writer."""
+        with self._ready:
+            self._closed = True
+            for lane, entries in self._lanes.items():
+                self._stats[lane]['dropped'] += len(entries)
+                entries.clear()
+                self._keyed[lane].clear()
+            self._count = self._bytes = 0
+            self._ready.notify_all()
+        if self.notify:
+            self.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        """Depth, high-water marks and per-lane counters and wait times (seconds)."""
+        with self._ready:
+            lanes = {}
+            for lane, stats in self._stats.items():
+                report = {k: v for k, v in stats.items() if k != 'wait_total'}
+                report['depth'] = len(self._lanes[lane])
+                report['wait_mean'] = stats['wait_total'] / stats['sent'] if stats['sent'] else 0.0
+                lanes[lane.name.lower()] = report
+            return {
+                'depth': self._count,
+                'bytes': self._bytes,
+                'peak_depth': self.peak_messages,
+                'peak_bytes': self.peak_bytes,
+                'max_messages': self.max_messages,
+                'max_bytes': self.max_bytes,
+                'lanes': lanes
+            }
+
+    def __len__(self) -> int:
+        return self._count
+
+
+async def drain(queue: OutboundQueue, send: Callable[[str], Awaitable[Any]]):
+    """
+    Writer coroutine: send queued frames in priority order until the queue
+    is closed. Must run on the loop that calls put(). A failed send closes
+    the queue, since the socket behind it is gone.
+    """
+    wakeup = asyncio.Event()
+
+    def notify():
+        wakeup.set()
+        if queue._drained is not None and (not len(queue) or queue.closed):
+            queue._drained.set()
+
+    queue.notify = notify
+    while True:
+        frame = queue.get_nowait()
+        if frame is not None:
+            wait = queue.governor.pace() if queue.governor else 0.0
+            if wait:
+                await asyncio.sleep(wait)
+                if queue.closed:
+                    return
+            try:
+                await send(frame)
+            except Exception as e:
+                logger.error(f"Send failed: {e}")
+                queue.close()
+                return
+        elif queue.closed:
+            return
+        else:
+            wakeup.clear()
+            # Re-check: a put may have landed between get_nowait and clear
+            if not len(queue) and not queue.closed:
+                await wakeup.wait()
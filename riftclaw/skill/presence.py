@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Presence - One Agent in Several Worlds at Once
+=======================================================
+A skill holds one link and one current world. A scout that watches
+several worlds would otherwise run one skill per world, each parsing the
+config, loading the key and keeping its own caches. A presence keeps one
+identity (config, signing key, connection pool) and opens a session per
+world on top of it, so each extra world costs a socket.
+
+Sessions are named (by default after the URL they joined) and keep their
+name when they travel through a portal. Every inbound message of every
+session is tagged as a WorldEvent and merged into one stream, which can
+be read in order with events() or subscribed to by message type.
+
+Version: 0.1.0
+Author: OpenClaw Framework
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Union
+
+from .async_riftclaw import AsyncRiftClawSkill
+from .events import ANY_TYPE, EventDispatcher, HandlerMode, Subscription
+from .riftclaw import (
+    RiftClawSkill,
+    Portal,
+    RiftError,
+    ConnectionError,
+    logger,
+)
+
+
+@dataclass
+class WorldEvent:
+    """An inbound message, tagged with the session and world it came from."""
+    session: str
+    world: Optional[str]
+    msg_type: str
+    data: Dict[str, Any]
+    received_at: float = field(default_factory=time.time)
+
+
+class _PresenceBase:
+    """Sessions and the merged event stream shared by both presences."""
+
+    skill_class = RiftClawSkill
+
+    def __init__(self, config_path: Optional[str] = None,
+                 config: Optional[Dict[str, Any]] = None,
+                 max_events: int = 10000):
+        """
+        Args:
+            config_path: Path to YAML configuration file (auto-detected if None)
+            config: Overrides merged on top of the file config
+            max_events: Events buffered for events(); the oldest are
+                dropped when readers fall behind
+        """
+        self.identity = self.skill_class(config_path, config)
+        self.max_events = max_events
+        self.sessions: Dict[str, RiftClawSkill] = {}
+        self._feeds: Dict[str, Subscription] = {}
+        self._events = EventDispatcher.from_config(self.identity.config)
+        self.published = 0
+        self.dropped = 0
+
+    @property
+    def agent_id(self) -> str:
+        """The agent UUID every session acts as."""
+        return self.identity.config['agent_id']
+
+    def session(self, name: str) -> RiftClawSkill:
+        """
+        The skill behind a session.
+
+        Raises:
+            RiftError: If there is no session of that name
+        """
+        skill = self.sessions.get(name)
+        if skill is None:
+            raise RiftError(f"No session named {name!r}")
+        return skill
+
+    def worlds(self) -> Dict[str, Optional[str]]:
+        """Current world of each session."""
+        return {name: skill.current_world for name, skill in self.sessions.items()}
+
+    def _open_session(self, name: str) -> RiftClawSkill:
+        """A new session sharing the identity, feeding the event stream."""
+        if name in self.sessions:
+            raise RiftError(f"Session {name!r} already exists")
+        skill = self.skill_class(identity=self.identity)
+        self._feeds[name] = skill.subscribe(
+            ANY_TYPE, lambda data, name=name, skill=skill: self._publish(name, skill, data)
+        )
+        self.sessions[name] = skill
+        return skill
+
+    def _close_session(self, name: str) -> RiftClawSkill:
+        skill = self.sessions.pop(name)
+        self._feeds.pop(name).cancel()
+        return skill
+
+    def _publish(self, name: str, skill: RiftClawSkill, data: Dict[str, Any]):
+        """Tag an inbound message (on the session's reader) and pass it on."""
+        event = WorldEvent(name, skill.current_world, data.get('type', 'unknown'), data)
+        self.published += 1
+        self._enqueue(event)
+        self._events.dispatch(event.msg_type, event)
+
+    def _enqueue(self, event: WorldEvent):
+        raise NotImplementedError
+
+    def subscribe(self, msg_type: str, handler: Callable[[WorldEvent], Any],
+                  predicate: Optional[Callable[[WorldEvent], bool]] = None,
+                  mode: Union[HandlerMode, str] = HandlerMode.INLINE,
+                  loop: Any = None) -> Subscription:
+        """
+        Receive messages of a type ('*' for all) from every session.
+
+        Handlers and predicates get WorldEvents; modes are as for
+        RiftClawSkill.subscribe().
+
+        Returns:
+            Subscription; pass it to unsubscribe() or call its cancel()
+        """
+        return self._events.subscribe(msg_type, handler, predicate, mode, loop)
+
+    def unsubscribe(self, subscription: Subscription) -> bool:
+        """Remove a subscription made with subscribe()."""
+        return self._events.unsubscribe(subscription)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Sessions, their worlds and the event stream's counters."""
+        return {
+            'agent_id': self.agent_id,
+            'sessions': {
+                name: {
+                    'world': skill.current_world,
+                    'state': skill.state.value,
+                    'connected': skill.connected,
+                    'discovered_portals': len(skill._portals),
+                    'pending_requests': len(skill._pending_requests)
+                }
+                for name, skill in self.sessions.items()
+            },
+            'events': {
+                'published': self.published,
+                'queued': self._queued(),
+                'dropped': self.dropped
+            },
+            'subscribers': self._events.stats()
+        }
+
+    def _queued(self) -> int:
+        raise NotImplementedError
+
+
+class MultiWorldPresence(_PresenceBase):
+    """
+    One agent identity with concurrent sessions to several worlds.
+
+    Each session is a RiftClawSkill created from the shared identity, so
+    it signs with the same key and uses the same config. Methods that
+    act in a world take the session's name.
+    """
+
+    def __init__(self, config_path: Optional[str] = None,
+                 config: Optional[Dict[str, Any]] = None,
+                 max_events: int = 10000):
+        super().__init__(config_path, config, max_events)
+        self._queue: 'queue.Queue[WorldEvent]' = queue.Queue(maxsize=max_events)
+        self._queue_lock = threading.Lock()
+
+    def join(self, url: Union[str, List[str]], name: Optional[str] = None) -> RiftClawSkill:
+        """
+        Open a session to another world.
+
+        Args:
+            url: World URL, or a list of mirror URLs
+            name: Session name (defaults to the URL)
+
+        Returns:
+            The session's skill
+
+        Raises:
+            RiftError: If a session of that name exists
+            ConnectionError: If the world cannot be reached
+        """
+        name = name or (url if isinstance(url, str) else url[0])
+        skill = self._open_session(name)
+        try:
+            if not skill.connect(url):
+                raise ConnectionError(f"Could not join {name}")
+        except Exception:
+            self._close_session(name)
+            raise
+        logger.info(f"Session {name} joined {skill.current_world}")
+        return skill
+
+    def leave(self, name: str):
+        """Disconnect a session and forget it."""
+        self._close_session(name).disconnect(park=False)
+
+    def close(self):
+        """Leave every world."""
+        for name in list(self.sessions):
+            self.leave(name)
+
+    def discover(self, name: str) -> List[Portal]:
+        """Discover portals in one session's world."""
+        return self.session(name).discover()
+
+    def discover_all(self) -> Dict[str, List[Portal]]:
+        """
+        Discover portals in every session's world.
+
+        The requests go out together, so this takes about as long as the
+        slowest world. Sessions whose request fails map to an empty list.
+        """
+        futures = {
+            name: skill.submit('discover', 'discover_response')
+            for name, skill in self.sessions.items() if skill.connected
+        }
+        portals = {}
+        for name, future in futures.items():
+            skill = self.sessions[name]
+            response = skill._wait_for_response(future, 'discover_response')
+            portals[name] = skill._portals_from_response(response)
+        return portals
+
+    def enter(self, name: str, portal_id: str, **passport_kwargs) -> Dict[str, Any]:
+        """Move a session through a portal; see RiftClawSkill.enter()."""
+        return self.session(name).enter(portal_id, **passport_kwargs)
+
+    def enter_any(self, name: str, destination_world: str, **passport_kwargs) -> Dict[str, Any]:
+        """Move a session to a world; see RiftClawSkill.enter_any()."""
+        return self.session(name).enter_any(destination_world, **passport_kwargs)
+
+    def _enqueue(self, event: WorldEvent):
+        # The lock orders session readers; next_event() callers run free,
+        # so the queue may empty or fill between any two calls here
+        with self._queue_lock:
+            while True:
+                try:
+                    self._queue.put_nowait(event)
+                    return
+                except queue.Full:
+                    pass
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def _queued(self) -> int:
+        return self._queue.qsize()
+
+    def next_event(self, timeout: Optional[float] = None) -> Optional[WorldEvent]:
+        """The next event from any session, or None after `timeout` seconds."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def events(self, timeout: Optional[float] = None) -> Iterator[WorldEvent]:
+        """
+        Events from every session in arrival order.
+
+        Args:
+            timeout: Stop after this many seconds without an event (None
+                waits forever)
+        """
+        while True:
+            event = self.next_event(timeout)
+            if event is None:
+                return
+            yield event
+
+    def __enter__(self) -> 'MultiWorldPresence':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AsyncMultiWorldPresence(_PresenceBase):
+    """MultiWorldPresence on an asyncio loop; sessions are AsyncRiftClawSkills."""
+
+    skill_class = AsyncRiftClawSkill
+
+    def __init__(self, config_path: Optional[str] = None,
+                 config: Optional[Dict[str, Any]] = None,
+                 max_events: int = 10000):
+        super().__init__(config_path, config, max_events)
+        # Created on first use, inside the loop the sessions run on
+        self._event_queue: 'Optional[asyncio.Queue[WorldEvent]]' = None
+
+    @property
+    def _queue(self) -> 'asyncio.Queue[WorldEvent]':
+        if self._event_queue is None:
+            self._event_queue = asyncio.Queue(maxsize=self.max_events)
+        return self._event_queue
+
+    async def join(self, url: Union[str, List[str]], name: Optional[str] = None) -> AsyncRiftClawSkill:
+        """Open a session to another world; see MultiWorldPresence.join()."""
+        name = name or (url if isinstance(url, str) else url[0])
+        skill = self._open_session(name)
+        try:
+            if not await skill.connect(url):
+                raise ConnectionError(f"Could not join {name}")
+        except Exception:
+            self._close_session(name)
+            raise
+        logger.info(f"Session {name} joined {skill.current_world}")
+        return skill
+
+    async def leave(self, name: str):
+        """Disconnect a session and forget it."""
+        await self._close_session(name).disconnect()
+
+    async def close(self):
+        """Leave every world."""
+        for name in list(self.sessions):
+            await self.leave(name)
+
+    async def discover(self, name: str) -> List[Portal]:
+        """Discover portals in one session's world."""
+        return await self.session(name).discover()
+
+    async def discover_all(self) -> Dict[str, List[Portal]]:
+        """Discover portals in every session's world at once; failures map to []."""
+        names = [name for name, skill in self.sessions.items() if skill.connected]
+        results = await asyncio.gather(
+            *(self.sessions[name].discover() for name in names), return_exceptions=True
+        )
+        return {
+            name: [] if isinstance(result, BaseException) else result
+            for name, result in zip(names, results)
+        }
+
+    async def enter(self, name: str, portal_id: str, **passport_kwargs) -> Dict[str, Any]:
+        """Move a session through a portal; see RiftClawSkill.enter()."""
+        return await self.session(name).enter(portal_id, **passport_kwargs)
+
+    async def enter_any(self, name: str, destination_world: str,
+                        **passport_kwargs) -> Dict[str, Any]:
+        """Move a session to a world; see RiftClawSkill.enter_any()."""
+        return await self.session(name).enter_any(destination_world, **passport_kwargs)
+
+    def _enqueue(self, event: WorldEvent):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    def _queued(self) -> int:
+        return self._event_queue.qsize() if self._event_queue is not None else 0
+
+    async def next_event(self, timeout: Optional[float] = None) -> Optional[WorldEvent]:
+        """The next event from any session, or None after `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def events(self, timeout: Optional[float] = None) -> AsyncIterator[WorldEvent]:
+        """Events from every session in arrival order; see MultiWorldPresence.events()."""
+        while True:
+            event = await self.next_event(timeout)
+            if event is None:
+                return
+            yield event
+
+    async def __aenter__(self) -> 'AsyncMultiWorldPresence':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
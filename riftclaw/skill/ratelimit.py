@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Rate Limits - Staying Within a World's Request Budget
+==============================================================
+Worlds may rate limit (the spec suggests 10 discovers a minute and one
+handoff_request per portal every 5 seconds), and the relay allows a fixed
+number of frames per socket. A request sent over budget is rejected with
+RATE_LIMITED and costs a round trip for nothing, so each link carries a
+RateGovernor that spends tokens before frames go out:
+
+    '*'                 every frame on the socket, paced by the writer
+    '<message type>'    each agent's messages of that type (submit() and
+                        send() wait for a token)
+    per: 'portal'       one bucket per agent and portal_id for that type
+
+Limits come from the config, from the world's `welcome` (`rate_limits`)
+and from RATE_LIMITED errors, and are remembered per world URL so a new
+link starts with what earlier links learned. Agents multiplexed on one
+socket share its queue, and with it one governor: the socket-wide budget
+is spent by all of them, per-type budgets stay per agent.
+
+Version: 0.1.0
+Author: OpenClaw Framework
+"""
+
+import bisect
+import logging
+from collections import deque
+import threading
+import time
+from typing import Dict, List, Optional, Any, Tuple
+
+logger = logging.getLogger('riftclaw')
+
+# Scope of the limit on every frame sent over one socket
+LINK_SCOPE = '*'
+
+
+class TokenBucket:
+    """
+    `limit` tokens, each returned `window` seconds after it is spent.
+
+    A bucket refilled at a steady rate lets up to twice its limit through
+    in one window (a full burst, then the refill), which a world counting
+    requests over a sliding window rejects. Returning each token exactly
+    one window after use never puts more than `limit` messages in any
+    window and still allows bursts of `limit`.
+
+    reserve() takes a token even when none is back yet and says how long
+    the caller must wait for it, so concurrent callers are spaced out in
+    the order they asked instead of all waking at the same moment.
+    """
+
+    # Seconds added to each window, since frames sent exactly one window
+    # apart can arrive less than one window apart
+    SLACK = 0.1
+
+    def __init__(self, limit: float, window: float):
+        """
+        Args:
+            limit: Messages per window (and the largest burst)
+            window: Window length in seconds
+        """
+        self._lock = threading.Lock()
+        self.limit = int(limit)
+        self.window = float(window)
+        # When each spent token comes back, soonest first
+        self._returns: List[float] = []
+        self.waits = 0
+        self.waited = 0.0
+
+    def configure(self, limit: float, window: float):
+        """Change the limit, keeping track of the tokens already spent."""
+        with self._lock:
+            shift = float(window) - self.window
+            self.limit, self.window = int(limit), float(window)
+            self._returns = [at + shift for at in self._returns[-self.limit:]]
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Take a token.
+
+        Args:
+            max_wait: Longest acceptable wait in seconds (None: any)
+
+        Returns:
+            Seconds until the token may be used (0.0 if now), or None if
+            that would exceed `max_wait`; nothing is taken then
+        """
+        with self._lock:
+            now = time.monotonic()
+            full = len(self._returns) >= self.limit
+            use_at = max(now, self._returns[0]) if full else now
+            wait = use_at - now
+            if max_wait is not None and wait > max_wait:
+                return None
+            if full:
+                self._returns.pop(0)
+            bisect.insort(self._returns, use_at + self.window + self.SLACK)
+            if wait:
+                self.waits += 1
+                self.waited += wait
+            return wait
+
+    def delay(self, ahead: int = 0) -> float:
+        """Seconds until a token is free after `ahead` more are taken."""
+        with self._lock:
+            now = time.monotonic()
+            index = len(self._returns) + ahead - self.limit
+            if index < 0 or not self._returns:
+                return 0.0
+            cycles, index = divmod(index, len(self._returns))
+            return max(0.0, self._returns[index] - now) + cycles * (self.window + self.SLACK)
+
+    def hold(self, seconds: float):
+        """Give out no tokens for `seconds` (the world said to back off)."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            spent = [max(at, until) for at in self._returns]
+            self._returns = [until] * (self.limit - len(spent)) + spent
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Limit, tokens available now and time spent waiting."""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                'limit': self.limit,
+                'window': self.window,
+                'tokens': self.limit - sum(1 for at in self._returns if at > now),
+                'waits': self.waits,
+                'waited': self.waited
+            }
+
+
+class RateGovernor:
+    """
+    Token buckets for one link to one world.
+
+    Limits are given per scope as `{'limit': n, 'window': seconds}`, plus
+    `'per': 'portal'` for a separate bucket per portal_id. Message type
+    scopes have a bucket per agent. Scopes without a limit are not
+    throttled.
+    """
+
+    # Backoff after a RATE_LIMITED error that does not say how long
+    DEFAULT_RETRY_AFTER = 1.0
+    # Frame send times kept to estimate a limit no one stated
+    SENT_HISTORY = 1024
+
+    _learned: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, url: Optional[str] = None,
+                 limits: Optional[Dict[str, Dict[str, Any]]] = None,
+                 max_wait: Optional[float] = 30.0):
+        """
+        Args:
+            url: World URL; limits learned for it earlier apply too
+            limits: Limits per scope (message type, or '*' for every frame)
+            max_wait: Longest a request waits for budget before it fails
+        """
+        self.url = url
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._limits: Dict[str, Dict[str, Any]] = dict(limits or {})
+        if url:
+            with self._registry_lock:
+                self._limits.update(self._learned.get(url, {}))
+        self._buckets: Dict[Tuple[str, Optional[str], Optional[str]], TokenBucket] = {}
+        self._sent = deque(maxlen=self.SENT_HISTORY)
+        self._held_until: Dict[str, float] = {}
+        self.rate_limited = 0
+        self.refused = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], url: Optional[str] = None) -> Optional['RateGovernor']:
+        """
+        A governor from a skill config's `rate_limits` section, or None
+        if rate limiting is disabled.
+        """
+        settings = config.get('rate_limits') or {}
+        if not settings.get('enabled', True):
+            return None
+        return cls(url, settings.get('limits'), settings.get('max_wait', 30.0))
+
+    @classmethod
+    def forget(cls, url: Optional[str] = None):
+        """Drop learned limits for one world, or all (mainly for tests)."""
+        with cls._registry_lock:
+            if url is None:
+                cls._learned.clear()
+            else:
+                cls._learned.pop(url, None)
+
+    def _bucket(self, scope: str, agent_id: Optional[str] = None,
+                portal_id: Optional[str] = None) -> Optional[TokenBucket]:
+        with self._lock:
+            limit = self._limits.get(scope)
+            if not limit:
+                return None
+            key = (scope, agent_id, portal_id if limit.get('per') == 'portal' else None)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(limit['limit'], limit['window'])
+            return bucket
+
+    def pace(self) -> float:
+        """Seconds the writer waits before sending the next frame."""
+        bucket = self._bucket(LINK_SCOPE)
+        wait = bucket.reserve() if bucket else 0.0
+        self._sent.append(time.monotonic() + wait)
+        return wait
+
+    def backlog(self, queued: int = 0) -> float:
+        """Seconds a frame queued behind `queued` others waits for the socket budget."""
+        bucket = self._bucket(LINK_SCOPE)
+        return bucket.delay(queued) if bucket else 0.0
+
+    def reserve(self, msg_type: str, agent_id: Optional[str] = None,
+                portal_id: Optional[str] = None) -> Optional[float]:
+        """
+        Budget for one outbound message of `msg_type` from `agent_id`.
+
+        Returns:
+            Seconds to wait before sending it, or None if the wait would
+            exceed `max_wait` (the message should not be sent)
+        """
+        bucket = self._bucket(msg_type, agent_id, portal_id)
+        if bucket is None:
+            return 0.0
+        wait = bucket.reserve(self.max_wait)
+        if wait is None:
+            self.refused += 1
+            logger.warning(f"{msg_type} over the rate limit of {self.url or 'this world'}")
+        return wait
+
+    def learn(self, limits: Optional[Dict[str, Any]]):
+        """
+        Adopt limits a world advertised, e.g. in its welcome:
+        `{'*': {'limit': 30, 'window': 60}, 'discover': {...}}`.
+        """
+        if not isinstance(limits, dict):
+            return
+        learned = {
+            scope: dict(limit) for scope, limit in limits.items()
+            if isinstance(limit, dict) and limit.get('limit') and limit.get('window')
+        }
+        if not learned:
+            return
+        with self._lock:
+            self._limits.update(learned)
+            for (scope, _, _), bucket in self._buckets.items():
+                if scope in learned:
+                    bucket.configure(learned[scope]['limit'], learned[scope]['window'])
+        if self.url:
+            with self._registry_lock:
+                self._learned.setdefault(self.url, {}).update(learned)
+        logger.debug(f"Rate limits for {self.url}: {learned}")
+
+    def limited(self, error: Dict[str, Any], agent_id: Optional[str] = None):
+        """
+        Handle a RATE_LIMITED error: adopt any limit it states and hold
+        the scope (`scope`, default '*') for `retry_after` seconds.
+
+        Without a stated limit, a scope that was already limited gets
+        half its rate. The socket scope, when it had no limit, is limited
+        to a little less than the frames sent in the window before the
+        error; other scopes to one message per `retry_after`. Errors for
+        frames sent before the backoff began (one burst usually draws
+        several) tighten nothing further.
+        """
+        self.rate_limited += 1
+        scope = error.get('scope') or LINK_SCOPE
+        agent_id = None if scope == LINK_SCOPE else agent_id
+        retry_after = error.get('retry_after') or self.DEFAULT_RETRY_AFTER
+        now = time.monotonic()
+        with self._lock:
+            limit = self._limits.get(scope)
+            held = self._held_until.get(scope, 0.0) > now
+            self._held_until[scope] = max(self._held_until.get(scope, 0.0), now + retry_after)
+        if error.get('limit') and error.get('window'):
+            self.learn({scope: {**(limit or {}), 'limit': error['limit'], 'window': error['window']}})
+        elif held:
+            pass
+        elif limit:
+            self.learn({scope: {**limit, 'window': limit['window'] * 2}})
+        elif scope == LINK_SCOPE:
+            window = max(retry_after, self.DEFAULT_RETRY_AFTER)
+            sent = sum(1 for at in self._sent if at > now - window)
+            self.learn({scope: {'limit': max(1, sent - 1), 'window': window}})
+        else:
+            self.learn({scope: {'limit': 1, 'window': retry_after}})
+        bucket = self._bucket(scope, agent_id, error.get('portal_id'))
+        bucket.hold(retry_after)
+        logger.warning(f"Rate limited by {self.url or 'world'} ({scope}), "
+                       f"backing off {retry_after:.1f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        """Limits in force, bucket levels and counters."""
+        with self._lock:
+            buckets = list(self._buckets.items())
+            limits = dict(self._limits)
+        return {
+            'limits': limits,
+            'buckets': {
+                ':'.join(part for part in key if part): bucket.snapshot()
+                for key, bucket in buckets
+            },
+            'rate_limited': self.rate_limited,
+            'refused': self.refused
+        }
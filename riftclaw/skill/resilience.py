@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Resilience - Retry Backoff, Circuit Breakers and Session Resume
+========================================================================
+When a world goes down, a fleet retrying on a fixed interval reconnects
+in lockstep and stampedes the world the moment it returns. RetryPolicy
+spreads retries with exponential backoff and full jitter; CircuitBreaker
+fails fast per URL while a world is known bad and lets a single probe
+through to test recovery. Breakers are shared by every skill in the
+process.
+
+OutboundJournal and InboundDeduper let a skill resume after a dropped
+link: unanswered requests are re-sent under their original request_id
+(the world's idempotency key), and replies the world repeats are dropped.
+
+Version: 0.1.0
+Author: OpenClaw Framework
+"""
+
+import random
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Dict, List, Optional, Any, Tuple
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: sleep U(0, min(cap, base * 2**n))."""
+
+    def __init__(self, base_delay: float = 0.5, max_delay: float = 30,
+                 max_retries: int = 3):
+        """
+        Args:
+            base_delay: Backoff ceiling after the first failure, in seconds
+            max_delay: Upper bound on any single delay
+            max_retries: Attempts before giving up
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retries = max_retries
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'RetryPolicy':
+        """Build a policy from a skill config (`retry` section and max_retries)."""
+        retry = config.get('retry') or {}
+        return cls(
+            base_delay=retry.get('base_delay', 0.5),
+            max_delay=retry.get('max_delay', 30),
+            max_retries=config.get('max_retries', 3)
+        )
+
+    def ceiling(self, attempt: int) -> float:
+        """Largest delay after the `attempt`-th failure (1-based)."""
+        return min(self.max_delay, self.base_delay * 2 ** max(attempt - 1, 0))
+
+    def delay(self, attempt: int) -> float:
+        """Jittered delay to sleep after the `attempt`-th failure."""
+        return random.uniform(0, self.ceiling(attempt))
+
+
+class BreakerState(Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"  # Healthy: attempts pass
+    OPEN = "open"  # Known bad: attempts fail fast
+    HALF_OPEN = "half_open"  # Cooling off: one probe at a time
+
+
+class CircuitBreaker:
+    """
+    Per-URL circuit breaker.
+
+    `failure_threshold` consecutive failures open the breaker. After
+    `reset_timeout` seconds one probe is allowed (half-open); its success
+    closes the breaker and its failure re-opens it. A probe that never
+    reports back frees its slot after another `reset_timeout`.
+    """
+
+    _registry: Dict[str, 'CircuitBreaker'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, url: str, failure_threshold: int = 5, reset_timeout: float = 30):
+        """
+        Args:
+            url: URL this breaker guards
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds open before a probe is allowed
+        """
+        self.url = url
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probe_started: Optional[float] = None
+        self.times_opened = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_url(cls, url: str, **settings) -> 'CircuitBreaker':
+        """The process-wide breaker for `url`, created with `settings` if new."""
+        with cls._registry_lock:
+            breaker = cls._registry.get(url)
+            if breaker is None:
+                breaker = cls._registry[url] = cls(url, **settings)
+            return breaker
+
+    @classmethod
+    def from_config(cls, url: str, config: Dict[str, Any]) -> 'CircuitBreaker':
+        """The process-wide breaker for `url`, using a skill config's settings."""
+        settings = config.get('circuit_breaker') or {}
+        return cls.for_url(
+            url,
+            failure_threshold=settings.get('failure_threshold', 5),
+            reset_timeout=settings.get('reset_timeout', 30)
+        )
+
+    @classmethod
+    def snapshot_all(cls) -> Dict[str, Dict[str, Any]]:
+        """Status of every breaker in the process."""
+        with cls._registry_lock:
+            breakers = list(cls._registry.values())
+        return {breaker.url: breaker.snapshot() for breaker in breakers}
+
+    @classmethod
+    def reset_all(cls):
+        """Forget every breaker (mainly for tests and benchmarks)."""
+        with cls._registry_lock:
+            cls._registry.clear()
+
+    def allow(self) -> bool:
+        """Whether an attempt may go ahead now; counts rejections."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == BreakerState.OPEN and now - self.opened_at >= self.reset_timeout:
+                self.state = BreakerState.HALF_OPEN
+                self.probe_started = None
+
+            if self.state == BreakerState.CLOSED:
+                return True
+            if self.state == BreakerState.HALF_OPEN and (
+                self.probe_started is None or now - self.probe_started >= self.reset_timeout
+            ):
+                self.probe_started = now
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        """An attempt succeeded: close the breaker."""
+        with self._lock:
+            self.state = BreakerState.CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self.probe_started = None
+
+    def record_failure(self):
+        """An attempt failed: open after the threshold, or re-open a probe."""
+        with self._lock:
+            self.failures += 1
+            if self.state == BreakerState.HALF_OPEN or (
+                self.state == BreakerState.CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.state = BreakerState.OPEN
+                self.opened_at = time.monotonic()
+                self.probe_started = None
+                self.times_opened += 1
+
+    def retry_after(self) -> float:
+        """Seconds until the next probe is allowed (0 if attempts pass now)."""
+        with self._lock:
+            if self.state != BreakerState.OPEN:
+                return 0.0
+            return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State and counters for status reporting."""
+        return {
+            'state': self.state.value,
+            'failures': self.failures,
+            'times_opened': self.times_opened,
+            'rejected': self.rejected,
+            'retry_after': self.retry_after()
+        }
+
+
+class OutboundJournal:
+    """
+    Bounded record of signed request frames still awaiting a response.
+
+    Frames are kept verbatim, so a replay carries the original request_id,
+    timestamp and signature. When full, the oldest entry is forgotten (it
+    can then only time out, not be replayed).
+    """
+
+    def __init__(self, max_size: int = 256):
+        """
+        Args:
+            max_size: Unacknowledged frames kept (0 disables the journal)
+        """
+        self.max_size = max_size
+        self._frames: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.overflowed = 0
+
+    def record(self, request_id: str, frame: str):
+        """Remember `frame` until `request_id` is acknowledged."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._frames[request_id] = frame
+            self._frames.move_to_end(request_id)
+            self.recorded += 1
+            while len(self._frames) > self.max_size:
+                self._frames.popitem(last=False)
+                self.overflowed += 1
+
+    def ack(self, request_id: str) -> bool:
+        """Forget a frame once its response arrived or it expired."""
+        with self._lock:
+            return self._frames.pop(request_id, None) is not None
+
+    def unacked(self) -> List[Tuple[str, str]]:
+        """(request_id, frame) pairs in send order."""
+        with self._lock:
+            return list(self._frames.items())
+
+    def clear(self):
+        """Forget every frame."""
+        with self._lock:
+            self._frames.clear()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
+class InboundDeduper:
+    """
+    Sliding window of recently handled inbound frame keys.
+
+    After a resume the world may answer a replayed request a second time;
+    the copy carries the same (type, request_id) and is dropped.
+    """
+
+    def __init__(self, window: int = 1024):
+        """
+        Args:
+            window: Keys remembered (0 disables deduplication)
+        """
+        self.window = window
+        self._seen: 'OrderedDict[Tuple[str, str], None]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.duplicates = 0
+
+    def seen(self, key: Optional[Tuple[str, str]]) -> bool:
+        """Record `key`; True if it was already in the window."""
+        if key is None or self.window <= 0:
+            return False
+        with self._lock:
+            if key in self._seen:
+                self.duplicates += 1
+                return True
+            self._seen[key] = None
+            if len(self._seen) > self.window:
+                self._seen.popitem(last=False)
+            return False
+
+    def clear(self):
+        """Forget every key."""
+        with self._lock:
+            self._seen.clear()
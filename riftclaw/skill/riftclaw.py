@@ -9,6 +9,8 @@ Version: 0.1.0
 Author: OpenClaw Framework
 """
 
+import copy
+import dataclasses
 import json
 import hashlib
 import base64
@@ -16,9 +18,15 @@ import time
 import uuid
 import logging
 import threading
-from typing import Dict, List, Optional, Callable, Any
+from collections import OrderedDict, deque
+from concurrent.futures import (
+    Future, CancelledError, FIRST_COMPLETED, TimeoutError as FutureTimeoutError,
+    wait as wait_futures
+)
+from typing import Dict, List, Mapping, Optional, Callable, Any, Union
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
+from types import MappingProxyType
 from enum import Enum
 
 try:
@@ -39,6 +47,29 @@ except ImportError:
     WebSocketApp = None
     WebSocketException = Exception
 
+try:
+    from .admission import AdmissionWaitlist, Rejection
+    from .canonical import CanonicalForm, FORMS as CANONICAL_FORMS, Shape, get_form
+    from .connector import ConnectionSetup
+    from .events import EventDispatcher, HandlerMode, Subscription
+    from .keepalive import KeepaliveScheduler
+    from .latency import AdaptiveTimeouts, LatencyStats
+    from .outbound import Lane, OutboundQueue, lane_for
+    from .ratelimit import RateGovernor
+    from .transport import Transport, open_transport, transport_class
+    from .resilience import RetryPolicy, CircuitBreaker, OutboundJournal, InboundDeduper
+except ImportError:  # Run as a script from skill/
+    from admission import AdmissionWaitlist, Rejection
+    from canonical import CanonicalForm, FORMS as CANONICAL_FORMS, Shape, get_form
+    from connector import ConnectionSetup
+    from events import EventDispatcher, HandlerMode, Subscription
+    from keepalive import KeepaliveScheduler
+    from latency import AdaptiveTimeouts, LatencyStats
+    from outbound import Lane, OutboundQueue, lane_for
+    from ratelimit import RateGovernor
+    from transport import Transport, open_transport, transport_class
+    from resilience import RetryPolicy, CircuitBreaker, OutboundJournal, InboundDeduper
+
 
 # Configure logging
 logging.basicConfig(
@@ -68,6 +99,23 @@ class HandoffError(RiftError):
     pass
 
 
+class HandoffRejectedError(HandoffError):
+    """Raised when the world turns a handoff away; `rejection` says why."""
+    
+    def __init__(self, message: str, rejection: Rejection):
+        super().__init__(message)
+        self.rejection = rejection
+        self.retry_after = rejection.retry_after
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised when every target URL's circuit breaker is open."""
+    
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class PortalState(Enum):
     """States for portal traversal."""
     DISCONNECTED = "disconnected"
@@ -77,19 +125,148 @@ class PortalState(Enum):
     HANDOFF_PENDING = "handoff_pending"
     TRANSITIONING = "transitioning"
     ARRIVED = "arrived"
+    HIBERNATED = "hibernated"
 
 
-@dataclass
+class PortalStateMachine:
+    """
+    Validated PortalState transitions with waiters and dwell times.
+    
+    DISCONNECTED and CONNECTING may be entered from any state (connection
+    loss and reconnects); every other transition must follow the traversal
+    flow in the protocol spec. Waiters block on a condition rather than
+    polling, and time spent in each state is accumulated.
+    """
+    
+    TRANSITIONS = {
+        PortalState.CONNECTING: {PortalState.CONNECTED},
+        PortalState.CONNECTED: {PortalState.DISCOVERING, PortalState.HANDOFF_PENDING,
+                                PortalState.ARRIVED, PortalState.HIBERNATED},
+        PortalState.DISCOVERING: {PortalState.CONNECTED, PortalState.HANDOFF_PENDING},
+        PortalState.HANDOFF_PENDING: {PortalState.TRANSITIONING, PortalState.CONNECTED},
+        PortalState.TRANSITIONING: {PortalState.CONNECTED, PortalState.ARRIVED},
+        PortalState.ARRIVED: {PortalState.CONNECTED, PortalState.DISCOVERING,
+                              PortalState.HANDOFF_PENDING, PortalState.HIBERNATED},
+        PortalState.HIBERNATED: set(),
+        PortalState.DISCONNECTED: set(),
+    }
+    ALWAYS_ALLOWED = {PortalState.DISCONNECTED, PortalState.CONNECTING}
+    
+    def __init__(self, initial: PortalState = PortalState.DISCONNECTED):
+        self._state = initial
+        self._condition = threading.Condition()
+        self._entered_at = time.monotonic()
+        self._dwell: Dict[PortalState, float] = {state: 0.0 for state in PortalState}
+        self._entries: Dict[PortalState, int] = {state: 0 for state in PortalState}
+        self._entries[initial] = 1
+        self._listeners: List[Callable[[PortalState, PortalState], None]] = []
+    
+    @property
+    def state(self) -> PortalState:
+        """Current state."""
+        return self._state
+    
+    def can_transition(self, new_state: PortalState) -> bool:
+        """Check whether moving to `new_state` is allowed right now."""
+        return (new_state == self._state
+                or new_state in self.ALWAYS_ALLOWED
+                or new_state in self.TRANSITIONS[self._state])
+    
+    def transition(self, new_state: PortalState):
+        """
+        Move to `new_state` and wake anyone waiting on it.
+        
+        Raises:
+            RiftError: If the transition is not allowed
+        """
+        with self._condition:
+            old_state = self._state
+            if new_state == old_state:
+                return
+            if not self.can_transition(new_state):
+                raise RiftError(f"Invalid state transition {old_state.value} -> {new_state.value}")
+            
+            now = time.monotonic()
+            self._dwell[old_state] += now - self._entered_at
+            self._entered_at = now
+            self._entries[new_state] += 1
+            self._state = new_state
+            self._condition.notify_all()
+            listeners = list(self._listeners)
+        
+        logger.debug(f"State {old_state.value} -> {new_state.value}")
+        for listener in listeners:
+            try:
+                listener(old_state, new_state)
+            except Exception as e:
+                logger.error(f"State listener failed: {e}")
+    
+    def wait_for_state(self, states, timeout: Optional[float] = None) -> Optional[PortalState]:
+        """
+        Block until the machine is in one of `states`.
+        
+        Args:
+            states: A PortalState or a collection of them
+            timeout: Seconds to wait (None waits forever)
+            
+        Returns:
+            The state reached, or None on timeout
+        """
+        targets = {states} if isinstance(states, PortalState) else set(states)
+        with self._condition:
+            if self._condition.wait_for(lambda: self._state in targets, timeout):
+                return self._state
+            return None
+    
+    def add_listener(self, listener: Callable[[PortalState, PortalState], None]):
+        """Call `listener(old_state, new_state)` after every transition."""
+        with self._condition:
+            self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[PortalState, PortalState], None]):
+        """Stop notifying `listener`."""
+        with self._condition:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+    
+    def dwell_times(self) -> Dict[str, float]:
+        """Total seconds spent in each state, including the current one."""
+        with self._condition:
+            dwell = dict(self._dwell)
+            dwell[self._state] += time.monotonic() - self._entered_at
+        return {state.value: round(seconds, 6) for state, seconds in dwell.items()}
+    
+    def entry_counts(self) -> Dict[str, int]:
+        """Number of times each state has been entered."""
+        with self._condition:
+            return {state.value: count for state, count in self._entries.items()}
+
+
+# Signed passport fields, for the canonical encoder's fast path
+PASSPORT_SHAPE = Shape((
+    "agent_id", "agent_name", "source_world", "target_world", "position",
+    "inventory_hash", "inventory", "memory_summary", "reputation", "timestamp", "nonce"
+))
+
+# Fields of a message without payload (ping, discover)
+MESSAGE_SHAPE = Shape(("type", "agent_id", "timestamp", "request_id"))
+
+
+@dataclass(frozen=True)
 class AgentPassport:
     """
     Digital passport for cross-world agent traversal.
     Contains identity, state, and cryptographic proof.
+    
+    Passports are immutable, position included (it is a read-only
+    mapping): use replace() for a changed copy. Canonical bytes, hashes
+    and the wire dict are therefore computed only once.
     """
     agent_id: str
     agent_name: str
     source_world: str
     target_world: str
-    position: Dict[str, float] = field(default_factory=dict)
+    position: Mapping[str, float] = field(default_factory=dict)
     inventory_hash: str = ""
     inventory: str = ""  # JSON string of items for cross-world sync
     memory_summary: str = ""
@@ -98,14 +275,27 @@ class AgentPassport:
     nonce: str = field(default_factory=lambda: str(uuid.uuid4()))
     signature: Optional[str] = None
     
-    def to_bytes(self) -> bytes:
-        """Serialize passport to bytes for signing (excludes signature)."""
-        data = {
+    def __post_init__(self):
+        # A read-only view of our own copy, so neither the caller's dict nor
+        # anyone holding the passport can change what was signed
+        object.__setattr__(self, 'position', MappingProxyType(dict(self.position)))
+        object.__setattr__(self, '_memo', {})
+    
+    def __hash__(self) -> int:
+        return hash((self.compute_hash(), self.signature))
+    
+    def __reduce__(self):
+        # Mapping proxies cannot be pickled or deep-copied; rebuild from fields
+        return type(self).from_dict, (self.to_dict(),)
+    
+    def signed_fields(self) -> Dict[str, Any]:
+        """The fields a passport signature covers (all but the signature)."""
+        return {
             "agent_id": self.agent_id,
             "agent_name": self.agent_name,
             "source_world": self.source_world,
             "target_world": self.target_world,
-            "position": self.position,
+            "position": dict(self.position),
             "inventory_hash": self.inventory_hash,
             "inventory": self.inventory,
             "memory_summary": self.memory_summary,
@@ -113,15 +303,53 @@ class AgentPassport:
             "timestamp": self.timestamp,
             "nonce": self.nonce
         }
-        return json.dumps(data, sort_keys=True).encode('utf-8')
     
-    def compute_hash(self) -> str:
-        """Compute hash of passport contents."""
-        return hashlib.sha256(self.to_bytes()).hexdigest()
+    def to_bytes(self, form: str = 'python') -> bytes:
+        """
+        Serialize passport to bytes for signing (excludes signature).
+        
+        Args:
+            form: Canonical JSON form, 'python' or 'jcs' (RFC 8785)
+        """
+        memo = self._memo
+        key = ('bytes', form)
+        if key not in memo:
+            memo[key] = get_form(form).encode(self.signed_fields(), PASSPORT_SHAPE)
+        return memo[key]
+    
+    def compute_hash(self, form: str = 'python') -> str:
+        """Compute hash of passport contents (SHA-256 of to_bytes(form))."""
+        memo = self._memo
+        key = ('hash', form)
+        if key not in memo:
+            memo[key] = hashlib.sha256(self.to_bytes(form)).hexdigest()
+        return memo[key]
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for transmission."""
-        return asdict(self)
+        """Convert to dictionary for transmission (a fresh copy on every call)."""
+        wire = self._memo.get('wire')
+        if wire is None:
+            wire = self._memo['wire'] = {**self.signed_fields(), "signature": self.signature}
+        return {**wire, "position": dict(self.position)}
+    
+    def replace(self, **changes) -> 'AgentPassport':
+        """
+        A copy with some fields changed; this passport is left as it is.
+        
+        Changing a signed field drops the signature (unless a new one is
+        given), since it no longer covers the content. Cached
+        serializations carry over when the signed content is unchanged.
+        """
+        unknown = changes.keys() - self.__dataclass_fields__.keys()
+        if unknown:
+            raise TypeError(f"AgentPassport has no field(s) {sorted(unknown)}")
+        resigned = any(name in PASSPORT_SHAPE.keys for name in changes)
+        if resigned:
+            changes.setdefault('signature', None)
+        passport = dataclasses.replace(self, **changes)
+        if not resigned:
+            passport._memo.update((k, v) for k, v in self._memo.items() if k != 'wire')
+        return passport
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'AgentPassport':
@@ -139,6 +367,12 @@ class Portal:
     position: Dict[str, float] = field(default_factory=dict)
     requires_auth: bool = False
     metadata: Dict[str, Any] = field(default_factory=dict)
+    mirror_urls: List[str] = field(default_factory=list)
+    
+    @property
+    def destination_urls(self) -> List[str]:
+        """Primary destination URL followed by its mirrors."""
+        return [url for url in dict.fromkeys([self.destination_url, *self.mirror_urls]) if url]
     
     @classmethod
     def from_discovery(cls, data: Dict[str, Any]) -> 'Portal':
@@ -150,10 +384,355 @@ class Portal:
             destination_url=data.get('destination_url', ''),
             position=data.get('position', {}),
             requires_auth=data.get('requires_auth', False),
-            metadata=data.get('metadata', {})
+            metadata=data.get('metadata', {}),
+            mirror_urls=list(data.get('mirror_urls') or [])
         )
 
 
+def merge_config(config: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep merge `overrides` into `config` in place for nested dicts."""
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(config.get(key), dict):
+            merge_config(config[key], value)
+        else:
+            config[key] = value
+    return config
+
+
+class WorldConnection:
+    """
+    A link to one world, run on its own thread.
+    
+    The transport comes from the URL scheme (WebSocket, WebSocket over a
+    Unix socket, or in-process loopback); see transport.py. Until an owner
+    skill attaches, inbound frames are buffered and the world's `welcome`
+    is recorded. A link can therefore be opened speculatively and adopted
+    later without losing messages. Outbound frames go through a
+    prioritised queue drained by a writer thread, so senders never block
+    on the socket.
+    """
+    
+    def __init__(self, url: str, max_buffer: int = 256,
+                 setup: Optional[ConnectionSetup] = None,
+                 timeout: Optional[float] = None,
+                 signal: Optional[threading.Event] = None,
+                 outbox: Optional[OutboundQueue] = None,
+                 transport: Optional[Transport] = None):
+        """
+        Args:
+            url: URL of the world (ws://, wss://, ws+unix://, loop://)
+            max_buffer: Frames kept while no owner is attached
+            setup: Shared DNS/TLS setup that opens the socket (websocket-client
+                does it itself if None)
+            timeout: Seconds allowed for DNS, TCP and TLS setup
+            signal: Event set whenever this link is welcomed or closes
+            outbox: Send queue for this link (default limits if None)
+            transport: Transport to run (chosen from the URL scheme if None)
+        """
+        self.url = url
+        self.setup = setup
+        self.timeout = timeout
+        self.signal = signal
+        try:
+            # Named `ws` because owners use it to tell this link's callbacks
+            # from those of a link they have replaced
+            self.ws = transport if transport is not None else open_transport(url, setup, timeout)
+        except ValueError as e:
+            raise RiftError(str(e))
+        self.thread: Optional[threading.Thread] = None
+        self.welcome: Optional[Dict[str, Any]] = None
+        self.opened = threading.Event()
+        self.welcomed = threading.Event()
+        self.closed = threading.Event()
+        self.started_at: Optional[float] = None
+        self._owner: Optional['RiftClawSkill'] = None
+        self._lock = threading.RLock()
+        self._buffer: deque = deque(maxlen=max_buffer)
+        self.welcome_frame: Optional[str] = None
+        self._welcome_delivered = False
+        self.outbox = outbox if outbox is not None else OutboundQueue()
+        self._writer: Optional[threading.Thread] = None
+    
+    @property
+    def world_name(self) -> Optional[str]:
+        """World name from the welcome message, once received."""
+        return self.welcome.get('world_name') if self.welcome else None
+    
+    @property
+    def alive(self) -> bool:
+        """True while the socket is open."""
+        return self.opened.is_set() and not self.closed.is_set()
+    
+    def start(self) -> 'WorldConnection':
+        """Run the socket on a daemon thread."""
+        self.started_at = time.monotonic()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+    
+    def _run(self):
+        self.ws.run(self._on_open, self._on_message, self._on_error, self._on_close)
+    
+    def attach(self, owner: 'RiftClawSkill'):
+        """
+        Route this link's callbacks to `owner`, replaying anything buffered.
+        
+        The open event and the world's welcome are replayed too, so adopting
+        an already-open (or previously owned) link looks the same to the
+        owner as a fresh connect.
+        """
+        with self._lock:
+            self._owner = owner
+            if self.opened.is_set():
+                owner._on_open(self.ws)
+            if self._welcome_delivered:
+                owner._on_message(self.ws, self.welcome_frame)
+            while self._buffer:
+                message = self._buffer.popleft()
+                owner._on_message(self.ws, message)
+                if message is self.welcome_frame:
+                    self._welcome_delivered = True
+            if self.closed.is_set():
+                owner._on_close(self.ws, None, 'closed before attach')
+    
+    def detach(self):
+        """Stop routing callbacks; later frames are buffered again."""
+        with self._lock:
+            self._owner = None
+    
+    def send(self, frame: str, lane: Lane = Lane.REQUEST,
+             coalesce_key: Optional[str] = None, request_id: Optional[str] = None) -> bool:
+        """
+        Queue a raw frame for the writer thread.
+        
+        `request_id` is only needed by shared links, which route replies
+        by it; an own socket ignores it.
+        
+        Returns:
+            False if the frame was dropped or refused (queue full or closed)
+        """
+        return self.outbox.put(frame, lane, coalesce_key)
+    
+    def _write_loop(self):
+        """Writer thread: drain the send queue until the link closes."""
+        while True:
+            frame = self.outbox.get()
+            if frame is None or not self.outbox.pace():
+                return
+            try:
+                self.ws.send(frame)
+            except Exception as e:
+                logger.error(f"Send failed: {e}")
+                self.outbox.close()
+                return
+    
+    def close(self, timeout: Optional[float] = None):
+        """
+        Close the socket.
+        
+        Args:
+            timeout: Seconds to wait for the thread to exit (None: don't wait)
+        """
+        self.outbox.close()
+        self.ws.close()
+        if timeout and self.thread and self.thread.is_alive():
+            self.thread.join(timeout=timeout)
+    
+    def abort(self):
+        """
+        Drop the link without a closing handshake, for a peer that stopped
+        answering. The reader thread wakes and reports the close as usual.
+        """
+        self.outbox.close()
+        self.ws.abort()
+    
+    def _on_open(self, ws):
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+        with self._lock:
+            self.opened.set()
+            if self._owner:
+                self._owner._on_open(ws)
+    
+    def _on_message(self, ws, message: str):
+        if not self.welcomed.is_set():
+            try:
+                data = json.loads(message)
+                if isinstance(data, dict) and data.get('type') == 'welcome':
+                    self.welcome = data
+                    self.welcome_frame = message
+                    self.welcomed.set()
+                    if self.signal:
+                        self.signal.set()
+                    # TLS 1.3 tickets arrive after the handshake
+                    self.ws.remember_session()
+            except json.JSONDecodeError:
+                pass
+        with self._lock:
+            if self._owner:
+                self._owner._on_message(ws, message)
+                if message is self.welcome_frame:
+                    self._welcome_delivered = True
+            else:
+                self._buffer.append(message)
+    
+    def _on_error(self, ws, error):
+        with self._lock:
+            if self._owner:
+                self._owner._on_error(ws, error)
+    
+    def _on_close(self, ws, close_status_code, close_msg):
+        self.outbox.close()
+        with self._lock:
+            self.closed.set()
+            if self.signal:
+                self.signal.set()
+            if self._owner:
+                self._owner._on_close(ws, close_status_code, close_msg)
+
+
+class ConnectionPool:
+    """
+    LRU pool of parked WorldConnections, keyed by world URL.
+    
+    Leaving a world parks its link here instead of closing it, so coming
+    back skips the TCP/TLS/WebSocket handshake and the welcome exchange.
+    Links idle for longer than `idle_ttl` and the least recently parked
+    links beyond `max_size` are closed.
+    """
+    
+    def __init__(self, max_size: int = 4, idle_ttl: float = 300):
+        """
+        Args:
+            max_size: Maximum parked links (0 disables pooling)
+            idle_ttl: Seconds a parked link is kept before it is closed
+        """
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self._parked: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def park(self, connection: WorldConnection) -> bool:
+        """
+        Keep a detached link warm for later reuse.
+        
+        Returns:
+            False if the link was closed instead (pooling disabled or the
+            link is already dead)
+        """
+        if self.max_size <= 0 or not connection.alive:
+            connection.close()
+            return False
+        
+        with self._lock:
+            replaced = self._parked.pop(connection.url, None)
+            self._parked[connection.url] = (connection, time.monotonic())
+            stale = self._expire_locked()
+            while len(self._parked) > self.max_size:
+                _, (evicted, _) = self._parked.popitem(last=False)
+                stale.append(evicted)
+                self.evictions += 1
+        
+        if replaced:
+            stale.append(replaced[0])
+        for link in stale:
+            link.close()
+        logger.debug(f"Parked connection to {connection.url}")
+        return True
+    
+    def checkout(self, url: str) -> Optional[WorldConnection]:
+        """Take a live parked link for `url` out of the pool, if any."""
+        if self.max_size <= 0:
+            return None
+        
+        with self._lock:
+            stale = self._expire_locked()
+            entry = self._parked.pop(url, None)
+            connection = entry[0] if entry else None
+            if connection and not connection.alive:
+                stale.append(connection)
+                connection = None
+            if connection:
+                self.hits += 1
+            else:
+                self.misses += 1
+        
+        for link in stale:
+            link.close()
+        return connection
+    
+    def sweep(self) -> int:
+        """Close links idle past the TTL; returns how many were closed."""
+        with self._lock:
+            stale = self._expire_locked()
+        for link in stale:
+            link.close()
+        return len(stale)
+    
+    def clear(self):
+        """Close every parked link."""
+        with self._lock:
+            links = [connection for connection, _ in self._parked.values()]
+            self._parked.clear()
+        for link in links:
+            link.close()
+    
+    def _expire_locked(self) -> List[WorldConnection]:
+        """Remove idle or dead links; caller holds the lock and closes them."""
+        now = time.monotonic()
+        stale = []
+        for url, (connection, parked_at) in list(self._parked.items()):
+            if now - parked_at > self.idle_ttl or not connection.alive:
+                del self._parked[url]
+                stale.append(connection)
+                self.expirations += 1
+        return stale
+    
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, hit rate and eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._parked),
+                'max_size': self.max_size,
+                'worlds': list(self._parked),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+    
+    def __len__(self) -> int:
+        return len(self._parked)
+    
+    def __contains__(self, url: str) -> bool:
+        return url in self._parked
+
+
+@dataclass
+class PendingRequest:
+    """An outbound request awaiting its response."""
+    request_id: str
+    operation: str  # Response type that completes the request
+    future: Any  # concurrent.futures.Future or asyncio.Future
+    deadline: float
+    url: Optional[str] = None  # World the request was sent to
+    started_at: float = 0.0  # time.monotonic() when registered
+
+
+# Response types whose latency sets adaptive deadlines, and the operation
+# name it is tracked under
+TIMED_OPERATIONS = {'discover_response': 'discover', 'handoff_confirm': 'handoff'}
+
+# Inbound frames that only keep a link up; receiving them is not activity
+LINK_MESSAGES = frozenset({'welcome', 'ping', 'pong'})
+
+
 class RiftClawSkill:
     """
     Main skill class for cross-world portal traversal.
@@ -165,20 +744,87 @@ class RiftClawSkill:
     - Traverse between worlds with poetic transitions
     """
     
+    # Seconds enter_any() waits for handoff_cancel frames to go out before
+    # leaving the source world
+    CANCEL_FLUSH_TIMEOUT = 0.5
+    
     DEFAULT_CONFIG = {
         'agent_id': None,  # Auto-generated if not provided
         'agent_name': 'RiftWalker',
         'default_world': None,
         'connection_timeout': 30,
         'handoff_timeout': 60,
-        'auto_reconnect': True,
+        'adaptive_timeouts': {
+            'enabled': True,  # Derive deadlines from observed latency per world
+            'percentile': 99,  # Latency percentile each deadline starts from
+            'margin': 0.25,  # Minimum seconds added on top of the percentile
+            'min_samples': 5,  # Observations before a world's deadlines adapt
+            'floor': 0.5  # Shortest deadline; the *_timeout values are the ceilings
+        },
+        'auto_reconnect': True,  # Reconnect in the background when a link drops
+        'reconnect': {
+            'journal_size': 256,  # Unanswered requests kept for replay after a drop
+            'dedupe_window': 1024,  # Recent replies remembered to drop repeats
+            'give_up_after': 300  # Seconds of failed reconnects before staying offline
+        },
+        'keepalive': {
+            'interval': 15,  # Seconds between application pings (0 disables)
+            'max_missed': 3  # Unanswered pings before the link is declared dead
+        },
+        'hibernation': {
+            'idle_after': 0  # Seconds without activity before the link is released (0 disables)
+        },
         'max_retries': 3,
+        'retry': {
+            'base_delay': 0.5,  # Backoff ceiling after the first failure (full jitter)
+            'max_delay': 30
+        },
+        'circuit_breaker': {
+            'failure_threshold': 5,  # Consecutive failures before failing fast
+            'reset_timeout': 30  # Seconds before a probe is let through
+        },
+        'make_before_break': False,  # Pre-connect to the destination during handoff
+        'rate_limits': {
+            'enabled': True,
+            'max_wait': 30.0,  # Longest a request waits for budget before it fails
+            'limits': {  # Per message type; '*' for every frame on the socket
+                'discover': {'limit': 10, 'window': 60},
+                'handoff_request': {'limit': 1, 'window': 5, 'per': 'portal'}
+            }
+        },
+        'admission': {
+            'max_wait': 60,  # Seconds enter() waits in line for a full world (0 disables)
+            'jitter': 0.25  # Fraction of retry_after added at random to each wait
+        },
+        'hedged_handoff': {
+            'percentile': 95,  # Handoff latency percentile after which enter_any() hedges
+            'initial_delay': 2.0,  # Hedge delay until enough handoffs have been timed
+            'max_hedges': 1  # Extra requests through alternate portals
+        },
+        'world_mirrors': {},  # URL -> list of mirror URLs raced on connect
+        'connect_stagger': 0.25,  # Seconds between staggered mirror attempts
+        'shared_connection_setup': True,  # Process-wide DNS cache and TLS session reuse
+        'send_queue': {
+            'max_messages': 1024,  # Frames queued per connection
+            'max_bytes': 1048576,  # Bytes queued per connection
+            'telemetry_policy': 'drop_oldest'  # Or 'drop_newest' when telemetry overflows
+        },
+        'event_handlers': {
+            'slow_threshold': 0.05,  # Seconds an inline handler may block the reader before a warning
+            'max_workers': 4  # Shared thread pool for mode='thread' subscribers
+        },
+        'connection_pool': {
+            'max_size': 0,  # Warm connections kept to visited worlds (0 disables)
+            'idle_ttl': 300  # Seconds before a parked connection is closed
+        },
         'log_level': 'INFO',
         'poetic_mode': True,
         'security': {
             'require_signatures': True,
             'verify_destinations': True,
-            'key_path': None  # Auto-generate if not provided
+            'key_path': None,  # Auto-generate if not provided
+            'signing_key': None,  # Base64 Ed25519 seed, used instead of key_path if set
+            'canonical_json': 'python'  # Bytes signatures cover: 'python' or 'jcs' (RFC 8785)
         }
     }
     
@@ -229,24 +875,34 @@ class RiftClawSkill:
         }
     }
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None,
+                 config: Optional[Dict[str, Any]] = None,
+                 identity: Optional['RiftClawSkill'] = None):
         """
         Initialize the RiftClaw skill.
         
         Args:
             config_path: Path to YAML configuration file (auto-detected if None)
+            config: Overrides merged on top of the file config. When given
+                without config_path, no config file is searched for.
+            identity: Another skill of the same agent, e.g. its session in
+                a different world. Its config, keys and connection pool are
+                shared instead of loaded again (config_path and config are
+                ignored).
         """
-        # Auto-detect config if not provided
-        if config_path is None:
-            config_path = self._find_config_file()
-        
-        self.config = self.load_config(config_path)
-        self._setup_logging()
-        
-        # Debug: Print loaded config
-        print(f"[RiftClaw] Loaded default_world: {self.config.get('default_world')}")
-        print(f"[RiftClaw] Config path used: {config_path or 'None (using defaults)'}")
-        logger.info(f"Loaded default_world: {self.config.get('default_world')}")
+        if identity is not None:
+            self.config = identity.config
+        else:
+            # Auto-detect config if not provided
+            if config_path is None and config is None:
+                config_path = self._find_config_file()
+            
+            self.config = self.load_config(config_path)
+            if config:
+                merge_config(self.config, config)
+            self._setup_logging()
+            
+            logger.info(f"Loaded default_world: {self.config.get('default_world')}")
         
         # Generate agent ID if not provided
         if not self.config.get('agent_id'):
@@ -254,32 +910,106 @@ class RiftClawSkill:
             logger.info(f"Generated agent ID: {self.config['agent_id']}")
         
         # Cryptographic identity
+        self._canonical: CanonicalForm = get_form(
+            self.config.get('security', {}).get('canonical_json') or 'python'
+        )
         self._signing_key: Optional[nacl.signing.SigningKey] = None
         self._verify_key: Optional[nacl.signing.VerifyKey] = None
-        self._load_or_generate_keys()
+        if identity is not None:
+            self._signing_key, self._verify_key = identity._signing_key, identity._verify_key
+        else:
+            self._load_or_generate_keys()
         
         # Connection state
-        self.ws: Optional[WebSocketApp] = None
+        self.ws: Optional[Any] = None  # Active link's transport, or a multiplex channel
         self.ws_thread: Optional[threading.Thread] = None
+        self._connection: Optional[WorldConnection] = None
+        self._setup: Optional[ConnectionSetup] = (
+            ConnectionSetup.shared() if self.config.get('shared_connection_setup', True) else None
+        )
+        pool_config = self.config.get('connection_pool') or {}
+        self._pool = identity._pool if identity is not None else ConnectionPool(
+            max_size=pool_config.get('max_size', 0),
+            idle_ttl=pool_config.get('idle_ttl', 300)
+        )
         self.current_world: Optional[str] = None
-        self.state = PortalState.DISCONNECTED
+        self._state = PortalStateMachine()
         self.connected = False
         self._message_handlers: Dict[str, Callable] = {}
-        self._pending_responses: Dict[str, threading.Event] = {}
-        self._response_data: Dict[str, Any] = {}
+        self._events = EventDispatcher.from_config(self.config)
+        self._pending_requests: Dict[str, PendingRequest] = {}
+        self._requests_lock = threading.Lock()
         self._portals: List[Portal] = []
+        self._target_urls: List[str] = []
+        self._connect_stats = {
+            'attempts': 0, 'failures': 0, 'retries': 0,
+            'circuit_rejections': 0, 'last_delay': 0.0
+        }
+        self._timeouts = AdaptiveTimeouts.from_config(self.config)
+        
+        # Session resume after dropped links
+        reconnect_config = self.config.get('reconnect') or {}
+        self._journal = OutboundJournal(reconnect_config.get('journal_size', 256))
+        self._inbound_seen = InboundDeduper(reconnect_config.get('dedupe_window', 1024))
+        self._reconnecting = False
+        self._resume_lock = threading.Lock()
+        self._reconnect_thread: Optional[threading.Thread] = None
+        self._reconnect_stop = threading.Event()
+        self._recovery_stats = {
+            'drops': 0, 'recoveries': 0, 'failed_recoveries': 0, 'replayed': 0,
+            'last_time_to_recover': None, 'total_time_to_recover': 0.0
+        }
+        
+        # Keepalive pings and round-trip times per world URL
+        self._rtt: Dict[str, LatencyStats] = {}
+        self._pings: 'OrderedDict[str, float]' = OrderedDict()
+        self._keepalive_lock = threading.Lock()
+        self._missed_pongs = 0
+        self._next_ping = 0.0
+        self._keepalive_stats = {'pings': 0, 'pongs': 0, 'dead_peers': 0}
+        
+        # Idle hibernation: the serialized session while the link is released
+        self._hibernation: Optional[str] = None
+        self._hibernate_lock = threading.RLock()
+        self._last_activity = time.monotonic()
+        self._hibernation_stats = {
+            'hibernations': 0, 'wakes': 0, 'failed_wakes': 0, 'last_wake_seconds': None
+        }
         
         # Register default message handlers
         self._register_default_handlers()
         
         logger.info(f"RiftClaw skill initialized for agent: {self.config['agent_name']}")
     
+    @property
+    def state(self) -> PortalState:
+        """Current traversal state."""
+        return self._state.state
+    
+    @state.setter
+    def state(self, new_state: PortalState):
+        self._state.transition(new_state)
+    
+    def wait_for_state(self, states, timeout: Optional[float] = None) -> Optional[PortalState]:
+        """
+        Block until the skill reaches one of `states`.
+        
+        Args:
+            states: A PortalState or a collection of them
+            timeout: Seconds to wait (None waits forever)
+            
+        Returns:
+            The state reached, or None on timeout
+        """
+        return self._state.wait_for_state(states, timeout)
+    
     def _setup_logging(self):
         """Configure logging based on config."""
         level = getattr(logging, self.config.get('log_level', 'INFO').upper())
         logger.setLevel(level)
     
-    def _find_config_file(self) -> Optional[str]:
+    @classmethod
+    def _find_config_file(cls) -> Optional[str]:
         """
         Auto-detect config file in common locations.
         
@@ -299,18 +1029,17 @@ class RiftClawSkill:
             Path(__file__).parent / 'riftclaw_config.yaml',
         ]
         
-        print(f"[RiftClaw] Searching for config file...")
         for path in search_paths:
-            abs_path = path.absolute()
-            print(f"[RiftClaw] Checking: {abs_path}")
+            logger.debug(f"Looking for config at {path.absolute()}")
             if path.exists():
-                print(f"[RiftClaw] ✓ Found config at: {abs_path}")
+                logger.debug(f"Found config at {path.absolute()}")
                 return str(path)
         
-        print(f"[RiftClaw] ✗ No config file found in search paths")
+        logger.debug("No config file found in search paths")
         return None
     
-    def load_config(self, config_path: Optional[str] = None) -> Dict[str, Any]:
+    @classmethod
+    def load_config(cls, config_path: Optional[str] = None) -> Dict[str, Any]:
         """
         Load configuration from YAML file with default fallback.
         
@@ -320,37 +1049,25 @@ class RiftClawSkill:
         Returns:
             Merged configuration dictionary
         """
-        config = self.DEFAULT_CONFIG.copy()
-        print(f"[RiftClaw] Starting with default config. default_world = {config.get('default_world')}")
+        config = copy.deepcopy(cls.DEFAULT_CONFIG)
         
         if config_path and yaml:
             try:
                 path = Path(config_path)
-                print(f"[RiftClaw] Looking for config at: {path.absolute()}")
                 if path.exists():
                     with open(path, 'r') as f:
                         user_config = yaml.safe_load(f)
-                        print(f"[RiftClaw] YAML loaded: {user_config}")
                         if user_config:
-                            # Deep merge for nested dicts
-                            for key, value in user_config.items():
-                                if isinstance(value, dict) and key in config:
-                                    config[key].update(value)
-                                else:
-                                    config[key] = value
-                            print(f"[RiftClaw] Config merged. default_world now = {config.get('default_world')}")
+                            merge_config(config, user_config)
                     logger.info(f"Loaded config from {config_path}")
                 else:
-                    print(f"[RiftClaw] WARNING: Config file not found at {path.absolute()}")
                     logger.warning(f"Config file not found: {config_path}")
             except Exception as e:
-                print(f"[RiftClaw] ERROR loading config: {e}")
                 logger.error(f"Failed to load config: {e}")
         elif config_path and not yaml:
-            print("[RiftClaw] WARNING: PyYAML not installed, using default config")
             logger.warning("PyYAML not installed, using default config")
         else:
-            print("[RiftClaw] No config path provided, using defaults")
+            logger.debug("No config path provided, using defaults")
         
         return config
     
@@ -360,7 +1077,18 @@ class RiftClawSkill:
             logger.warning("PyNaCl not installed - signatures disabled")
             return
         
-        key_path = self.config.get('security', {}).get('key_path')
+        security = self.config.get('security', {})
+        key_path = security.get('key_path')
+        
+        # A key handed over in the config, e.g. to a worker process
+        if security.get('signing_key'):
+            try:
+                self._signing_key = nacl.signing.SigningKey(base64.b64decode(security['signing_key']))
+                self._verify_key = self._signing_key.verify_key
+                logger.info("Loaded signing key from config")
+                return
+            except Exception as e:
+                logger.error(f"Failed to load signing_key: {e}")
         
         if key_path:
             try:
@@ -399,21 +1127,24 @@ class RiftClawSkill:
         self._message_handlers['handoff_rejected'] = self._handle_error
         self._message_handlers['error'] = self._handle_error
         self._message_handlers['welcome'] = self._handle_welcome
+        self._message_handlers['pong'] = self._handle_pong
     
     def _handle_portal_list(self, data: Dict[str, Any]):
         """Handle portal discovery response."""
-        portals_data = data.get('portals', [])
-        self._portals = [Portal.from_discovery(p) for p in portals_data]
-        logger.info(f"Discovered {len(self._portals)} portals")
-        self._resolve_pending('discover_response', {'portals': self._portals})
+        portals = [Portal.from_discovery(p) for p in data.get('portals', [])]
+        self._portals = portals
+        logger.info(f"Discovered {len(portals)} portals")
+        self._resolve_pending('discover_response', {'portals': portals},
+                              data.get('request_id'))
     
     def _handle_handoff_response(self, data: Dict[str, Any]):
         """Handle handoff initiation response."""
         if data.get('status') == 'pending':
             logger.info("Handoff pending - awaiting destination confirmation")
-            self.state = PortalState.HANDOFF_PENDING
+            if self._state.can_transition(PortalState.HANDOFF_PENDING):
+                self.state = PortalState.HANDOFF_PENDING
         else:
-            self._resolve_pending('handoff', data)
+            self._resolve_pending('handoff', data, data.get('request_id'))
     
     def _handle_handoff_confirm(self, data: Dict[str, Any]):
         """Handle handoff confirmation from destination world."""
@@ -423,34 +1154,177 @@ class RiftClawSkill:
         if self.config.get('security', {}).get('require_signatures', True):
             if not self.verify_handoff(data):
                 logger.error("Handoff signature validation failed!")
-                self._resolve_pending('handoff_confirm', {'error': 'invalid_signature'})
+                self._resolve_pending('handoff_confirm', {'error': 'invalid_signature'},
+                                      data.get('request_id'))
                 return
         
-        self.state = PortalState.TRANSITIONING
-        self._resolve_pending('handoff_confirm', data)
+        if self.state == PortalState.HANDOFF_PENDING:
+            self.state = PortalState.TRANSITIONING
+        self._resolve_pending('handoff_confirm', data, data.get('request_id'))
     
     def _handle_error(self, data: Dict[str, Any]):
-        """Handle error messages from world."""
-        error_msg = data.get('message', 'Unknown error')
+        """Handle error and handoff_rejected messages from world."""
+        error_msg = data.get('message') or data.get('reason') or 'Unknown error'
         logger.error(f"World error: {error_msg}")
-        # Resolve any pending operation with error
-        for key in list(self._pending_responses.keys()):
-            self._resolve_pending(key, {'error': error_msg})
+        failure = {'error': error_msg, 'rejection': Rejection.from_message(data)}
+        if data.get('code') == 'RATE_LIMITED':
+            governor = self._rate_governor()
+            if governor:
+                governor.limited(data, self.config['agent_id'])
+        
+        # An echoed request_id fails only that request
+        request_id = data.get('request_id')
+        if request_id:
+            with self._requests_lock:
+                pending = self._pending_requests.get(request_id)
+            if pending:
+                self._complete_request(pending, failure)
+            return
+        
+        # Worlds without request IDs: fail every pending operation
+        with self._requests_lock:
+            pending_requests = list(self._pending_requests.values())
+        for pending in pending_requests:
+            self._complete_request(pending, failure)
     
     def _handle_welcome(self, data: Dict[str, Any]):
         """Handle welcome message from world."""
         world_name = data.get('world_name', 'Unknown')
         world_version = data.get('version', 'unknown')
         logger.info(f"Welcome to {world_name} v{world_version}")
+        governor = self._rate_governor()
+        if governor:
+            governor.learn(data.get('rate_limits'))
         self.current_world = world_name
         self.connected = True
-        self.state = PortalState.CONNECTED
     
-    def _resolve_pending(self, operation: str, data: Any):
-        """Resolve a pending operation with response data."""
-        self._response_data[operation] = data
-        if operation in self._pending_responses:
-            self._pending_responses[operation].set()
+    def _handle_pong(self, data: Dict[str, Any]):
+        """Handle a pong: record the round trip and reset the missed count."""
+        request_id = data.get('request_id')
+        now = time.monotonic()
+        with self._keepalive_lock:
+            if request_id in self._pings:
+                sent_at = self._pings[request_id]
+            elif not request_id and self._pings:
+                # Worlds that do not echo IDs answer pings in order
+                sent_at = next(iter(self._pings.values()))
+            else:
+                sent_at = None
+            if sent_at is not None:
+                # Earlier pings were lost or overtaken; the link is alive
+                while self._pings and next(iter(self._pings.values())) <= sent_at:
+                    self._pings.popitem(last=False)
+                self._missed_pongs = 0
+                self._keepalive_stats['pongs'] += 1
+        if sent_at is None:
+            # Not a keepalive: someone submit()ed their own ping
+            self._resolve_pending('pong', data, request_id)
+            return
+        url = self._link_url()
+        if url:
+            self._rtt_stats(url).record(now - sent_at)
+    
+    def subscribe(self, msg_type: str, handler: Callable[[Dict[str, Any]], Any],
+                  predicate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                  mode: Union[HandlerMode, str] = HandlerMode.INLINE,
+                  loop: Any = None) -> Subscription:
+        """
+        Receive inbound messages of a type; any number of handlers may subscribe.
+        
+        Built-in protocol handling runs first. Inline handlers run on the
+        reader and delay every later message, so anything slow should use
+        mode='thread' (shared pool) or mode='asyncio'.
+        
+        Args:
+            msg_type: Message type, e.g. 'handoff_confirm' or a custom event
+                ('*' for every message)
+            handler: Called with the message dict (may be a coroutine
+                function in asyncio mode)
+            predicate: Deliver only messages for which this returns True
+            mode: 'inline', 'thread' or 'asyncio'
+            loop: Event loop for asyncio mode (defaults to the running loop)
+            
+        Returns:
+            Subscription; pass it to unsubscribe() or call its cancel()
+        """
+        return self._events.subscribe(msg_type, handler, predicate, mode, loop)
+    
+    def unsubscribe(self, subscription: Subscription) -> bool:
+        """
+        Stop a subscription.
+        
+        Returns:
+            False if it was not subscribed
+        """
+        return self._events.unsubscribe(subscription)
+    
+    def _create_future(self) -> Any:
+        """Create the future a pending request resolves through."""
+        return Future()
+    
+    def _new_request(self, operation: str, timeout: Optional[float] = None) -> str:
+        """
+        Register a request before it is sent.
+        
+        Args:
+            operation: Response message type that completes the request
+            timeout: Seconds until the request expires (defaults to the
+                operation's adaptive deadline)
+            
+        Returns:
+            request_id to send with the message
+        """
+        timeout = timeout or self._operation_timeout(operation)
+        request_id = uuid.uuid4().hex
+        pending = PendingRequest(request_id, operation, self._create_future(),
+                                 time.time() + timeout, self._link_url(), time.monotonic())
+        with self._requests_lock:
+            self._expire_requests()
+            self._pending_requests[request_id] = pending
+        return request_id
+    
+    def _expire_requests(self):
+        """Drop requests past their deadline (caller holds the lock)."""
+        now = time.time()
+        for request_id, pending in list(self._pending_requests.items()):
+            if pending.deadline < now:
+                del self._pending_requests[request_id]
+                self._journal.ack(request_id)
+                if not pending.future.done():
+                    pending.future.set_result(None)
+    
+    def _complete_request(self, pending: PendingRequest, data: Any):
+        """Hand response data to a request's waiter."""
+        with self._requests_lock:
+            self._pending_requests.pop(pending.request_id, None)
+        self._journal.ack(pending.request_id)
+        timed = TIMED_OPERATIONS.get(pending.operation)
+        if timed and pending.url and isinstance(data, dict) and 'error' not in data:
+            self._timeouts.observe(pending.url, timed, time.monotonic() - pending.started_at)
+        if not pending.future.done():
+            pending.future.set_result(data)
+    
+    def _resolve_pending(self, operation: str, data: Any, request_id: Optional[str] = None):
+        """
+        Resolve the pending request that `data` answers.
+        
+        Responses echoing a request_id resolve exactly that request. Worlds
+        that do not echo IDs fall back to the oldest request waiting on
+        the same operation.
+        """
+        with self._requests_lock:
+            if request_id:
+                pending = self._pending_requests.get(request_id)
+            else:
+                pending = next(
+                    (p for p in self._pending_requests.values()
+                     if p.operation == operation and not p.future.done()),
+                    None
+                )
+        if pending:
+            self._complete_request(pending, data)
+        elif request_id:
+            logger.debug(f"Dropping {operation} for unknown request {request_id}")
     
     def _on_message(self, ws, message: str):
         """Handle incoming WebSocket message."""
@@ -458,11 +1332,24 @@ class RiftClawSkill:
             data = json.loads(message)
             msg_type = data.get('type', 'unknown')
             
+            # Worlds may answer a replayed request twice after a resume
+            request_id = data.get('request_id')
+            if request_id and self._inbound_seen.seen((msg_type, request_id)):
+                logger.debug(f"Dropping duplicate {msg_type} for request {request_id}")
+                return
+            
             logger.debug(f"Received {msg_type} message")
             
-            if msg_type in self._message_handlers:
-                self._message_handlers[msg_type](data)
-            else:
+            handler = self._message_handlers.get(msg_type)
+            if handler:
+                handler(data)
+            if self._events.has_subscribers(msg_type):
+                # Someone is listening, so the agent is not idle (keepalive
+                # traffic aside, or a '*' subscriber would keep it awake)
+                if msg_type not in LINK_MESSAGES:
+                    self._last_activity = time.monotonic()
+                self._events.dispatch(msg_type, data)
+            elif not handler:
                 logger.warning(f"Unknown message type: {msg_type}")
                 
         except json.JSONDecodeError as e:
@@ -473,162 +1360,909 @@ class RiftClawSkill:
     def _on_error(self, ws, error):
         """Handle WebSocket error."""
         logger.error(f"WebSocket error: {error}")
+        if ws is not self.ws:
+            return
         self.connected = False
+        # A failed handshake wakes connect() immediately
+        if self.state == PortalState.CONNECTING:
+            self.state = PortalState.DISCONNECTED
     
     def _on_close(self, ws, close_status_code, close_msg):
         """Handle WebSocket close."""
         logger.info(f"Connection closed: {close_status_code} - {close_msg}")
+        # Sockets we already replaced or abandoned must not touch state
+        if ws is not self.ws:
+            return
+        resumable = self._resumable()
         self.connected = False
         self.state = PortalState.DISCONNECTED
         self.current_world = None
+        # Only the skill's own link is resumed; a multiplexed channel
+        # shares its session's socket
+        if resumable and isinstance(self._connection, WorldConnection):
+            self._start_reconnect(self._reconnect_urls(self._connection.url))
     
     def _on_open(self, ws):
         """Handle WebSocket open."""
         logger.info("WebSocket connection established")
+        if ws is not self.ws:
+            return
         self.connected = True
+        self.state = PortalState.CONNECTED
+        self._last_activity = time.monotonic()
+        if isinstance(self._connection, WorldConnection) and (
+                self._keepalive_settings()[0] or self._idle_after()):
+            KeepaliveScheduler.shared().register(self)
+    
+    def _resolve_target_url(self, url: Union[str, List[str], None] = None) -> str:
+        """Pick the world URL to connect to, falling back to config."""
+        return self._resolve_target_urls(url)[0]
+    
+    def _resolve_target_urls(self, url: Union[str, List[str], None] = None) -> List[str]:
+        """
+        All URLs for the target world: the given URL(s) or default_world,
+        followed by any configured `world_mirrors`, in preference order.
+        """
+        target = url or self.config.get('default_world')
+        urls = [target] if isinstance(target, str) else list(target or [])
+        mirrors = self.config.get('world_mirrors') or {}
+        for primary in list(urls):
+            urls.extend(mirrors.get(primary, []))
+        target_urls = [u for u in dict.fromkeys(urls) if u]
+        
+        if not target_urls:
+            raise ConnectionError(
+                f"No world URL provided.\n"
+                f"Options:\n"
+                f"  1. Pass 'url' parameter: skill.connect(url='wss://...')\n"
+                f"  2. Create 'riftclaw_config.yaml' with 'default_world: wss://...'\n"
+                f"  3. Pass config path: RiftClawSkill(config_path='/path/to/config.yaml')\n"
+                f"Current default_world: {self.config.get('default_world')}"
+            )
+        
+        return target_urls
     
-    def connect(self, url: Optional[str] = None) -> bool:
+    def connect(self, url: Union[str, List[str], None] = None) -> bool:
         """
         Connect to a 3D world via WebSocket.
         
+        Besides ws:// and wss://, URLs may name a relay's Unix socket
+        (ws+unix:///path) or an in-process LoopbackListener (loop://name).
+        
+        With several URLs for the world (a list, or `world_mirrors` in the
+        config), attempts are started `connect_stagger` seconds apart,
+        happy-eyeballs style. The first link whose welcome arrives wins and
+        the others are closed.
+        
         Args:
-            url: WebSocket URL of the world (defaults to config)
+            url: WebSocket URL of the world, or a list of mirror URLs
+                (defaults to config)
             
         Returns:
             True if connection successful, False otherwise
             
         Raises:
             ConnectionError: If connection fails after retries
+            RiftError: If no installed transport handles a URL's scheme
         """
-        if not WebSocketApp:
-            raise RiftError("websocket-client not installed")
+        if threading.current_thread() is not self._reconnect_thread:
+            self._cancel_reconnect()
         
         if self.ws and self.connected:
             logger.warning("Already connected, disconnecting first")
             self.disconnect()
+        # An explicit connect starts a new session (wake() restores the old one)
+        self._hibernation = None
         
-        target_url = url or self.config.get('default_world')
-        
-        if not target_url:
-            raise ConnectionError(
-                f"No world URL provided.\n"
-                f"Options:\n"
-                f"  1. Pass 'url' parameter: skill.connect(url='wss://...')\n"
-                f"  2. Create 'riftclaw_config.yaml' with 'default_world: wss://...'\n"
-                f"  3. Pass config path: RiftClawSkill(config_path='/path/to/config.yaml')\n"
-                f"Current default_world: {self.config.get('default_world')}"
-            )
+        target_urls = self._resolve_target_urls(url)
+        for candidate in target_urls:
+            try:
+                transport_class(candidate)
+            except ValueError as e:
+                raise RiftError(str(e))
+        
+        for candidate in target_urls:
+            pooled = self._pool.checkout(candidate)
+            if pooled:
+                self.state = PortalState.CONNECTING
+                self._adopt(pooled)
+                logger.info(f"Reusing warm connection to {candidate}")
+                return True
         
-        self.state = PortalState.CONNECTING
-        logger.info(f"Connecting to {target_url}...")
+        logger.info(f"Connecting to {', '.join(target_urls)}...")
         
-        max_retries = self.config.get('max_retries', 3)
-        retry_count = 0
+        policy = RetryPolicy.from_config(self.config)
+        attempt = 0
         
-        while retry_count < max_retries:
+        while attempt < policy.max_retries:
+            urls = self._admitted_urls(target_urls)
+            self.state = PortalState.CONNECTING
+            attempt += 1
+            self._connect_stats['attempts'] += 1
             try:
-                self.ws = WebSocketApp(
-                    target_url,
-                    on_open=self._on_open,
-                    on_message=self._on_message,
-                    on_error=self._on_error,
-                    on_close=self._on_close
-                )
-                
-                # Run WebSocket in background thread
-                self.ws_thread = threading.Thread(target=self.ws.run_forever)
-                self.ws_thread.daemon = True
-                self.ws_thread.start()
-                
-                # Wait for connection
-                timeout = self.config.get('connection_timeout', 30)
-                start_time = time.time()
-                while not self.connected and (time.time() - start_time) < timeout:
-                    time.sleep(0.1)
-                
-                if self.connected:
-                    logger.info(f"Successfully connected to {target_url}")
-                    return True
+                if len(urls) > 1:
+                    connection = self._race(urls)
+                    self._adopt(connection)
                 else:
-                    raise ConnectionError("Connection timeout")
+                    # Run WebSocket in background thread
+                    connection = self._new_connection(urls[0])
+                    self._adopt(connection)
+                    self.ws_thread = connection.start().thread
+                    
+                    # Wait for open or failure, whichever the socket reports first
+                    reached = self.wait_for_state(
+                        (PortalState.CONNECTED, PortalState.DISCONNECTED),
+                        self._connect_timeout(urls)
+                    )
+                    if reached is None:
+                        self._record_timeout(urls, 'connect')
+                        raise ConnectionError("Connection timeout")
+                    elif reached != PortalState.CONNECTED:
+                        raise ConnectionError("Connection refused or closed during handshake")
+                
+                self._breaker(connection.url).record_success()
+                self._timeouts.observe(connection.url, 'connect',
+                                       time.monotonic() - connection.started_at)
+                logger.info(f"Successfully connected to {connection.url}")
+                return True
                     
             except Exception as e:
-                retry_count += 1
-                logger.warning(f"Connection attempt {retry_count} failed: {e}")
-                if retry_count >= max_retries:
-                    self.state = PortalState.DISCONNECTED
-                    raise ConnectionError(f"Failed to connect after {max_retries} attempts: {e}")
-                time.sleep(1)
+                # Abandon this attempt's socket so its callbacks are ignored
+                self._release_connection()
+                # Only set while a background reconnect is being cancelled
+                if self._reconnect_stop.wait(self._after_failed_attempt(urls, attempt, policy, e)):
+                    break
         
         return False
     
-    def disconnect(self):
-        """Disconnect from current world."""
-        if self.ws:
-            logger.info("Disconnecting from world...")
-            self.ws.close()
-            self.ws = None
+    def _breaker(self, url: str) -> CircuitBreaker:
+        """Process-wide circuit breaker for a world URL."""
+        return CircuitBreaker.from_config(url, self.config)
+    
+    def _admitted_urls(self, urls: List[str]) -> List[str]:
+        """
+        Target URLs whose circuit breakers let an attempt through.
         
-        if self.ws_thread and self.ws_thread.is_alive():
-            self.ws_thread.join(timeout=5)
+        Raises:
+            CircuitOpenError: If every breaker is open
+        """
+        self._target_urls = urls
+        admitted = [url for url in urls if self._breaker(url).allow()]
+        if admitted:
+            return admitted
+        
+        self._connect_stats['circuit_rejections'] += 1
+        self.state = PortalState.DISCONNECTED
+        retry_after = min(self._breaker(url).retry_after() for url in urls)
+        raise CircuitOpenError(
+            f"Circuit open for {', '.join(urls)}; next probe in {retry_after:.1f}s",
+            retry_after=retry_after
+        )
+    
+    def _after_failed_attempt(self, urls: List[str], attempt: int,
+                              policy: RetryPolicy, error: Exception) -> float:
+        """
+        Record a failed connect attempt against the URLs' breakers.
+        
+        Returns:
+            Jittered backoff to sleep before the next attempt
+            
+        Raises:
+            ConnectionError: If this was the last attempt
+        """
+        for url in urls:
+            self._breaker(url).record_failure()
+        self._connect_stats['failures'] += 1
+        logger.warning(f"Connection attempt {attempt} failed: {error}")
+        
+        if attempt >= policy.max_retries:
+            self.state = PortalState.DISCONNECTED
+            raise ConnectionError(f"Failed to connect after {attempt} attempts: {error}")
+        
+        delay = policy.delay(attempt)
+        self._connect_stats['retries'] += 1
+        self._connect_stats['last_delay'] = delay
+        logger.info(f"Retrying in {delay:.2f}s")
+        return delay
+    
+    def _new_connection(self, url: str, signal: Optional[threading.Event] = None) -> WorldConnection:
+        """Create (but don't start) a link using the shared connection setup."""
+        return WorldConnection(
+            url, setup=self._setup, timeout=self._connect_timeout([url]),
+            signal=signal, outbox=OutboundQueue.from_config(self.config, url)
+        )
+    
+    def _race(self, urls: List[str]) -> WorldConnection:
+        """
+        Race staggered connects to mirror URLs; return the first welcomed link.
+        
+        A new attempt starts every `connect_stagger` seconds, or at once
+        when every running attempt has failed. Losing links are closed.
+        
+        Raises:
+            ConnectionError: If every mirror fails or the connect deadline passes
+        """
+        stagger = self.config.get('connect_stagger', 0.25)
+        deadline = time.monotonic() + self._connect_timeout(urls)
+        signal = threading.Event()
+        waiting = list(urls)
+        attempts: List[WorldConnection] = []
+        next_start = time.monotonic()
+        
+        try:
+            while True:
+                now = time.monotonic()
+                all_failed = all(c.closed.is_set() for c in attempts)
+                if waiting and (now >= next_start or all_failed):
+                    attempts.append(self._new_connection(waiting.pop(0), signal).start())
+                    next_start = now + stagger
+                    all_failed = False
+                
+                winner = next((c for c in attempts if c.welcomed.is_set() and c.alive), None)
+                if winner:
+                    attempts.remove(winner)
+                    logger.debug(f"Mirror race won by {winner.url} after {len(attempts) + 1} attempts")
+                    return winner
+                if all_failed:
+                    raise ConnectionError(f"All {len(urls)} mirrors failed")
+                if now >= deadline:
+                    self._record_timeout(urls, 'connect')
+                    raise ConnectionError("Connection timeout")
+                
+                wake_at = min(next_start, deadline) if waiting else deadline
+                signal.wait(max(wake_at - now, 0))
+                signal.clear()
+        finally:
+            for loser in attempts:
+                loser.close()
+    
+    def _adopt(self, connection: WorldConnection):
+        """Make `connection` the active link and route its callbacks here."""
+        self._connection = connection
+        self.ws = connection.ws
+        self.ws_thread = connection.thread
+        self._reset_keepalive()
+        connection.attach(self)
+    
+    def _release_connection(self, timeout: Optional[float] = None) -> Optional[WorldConnection]:
+        """Detach and close the active link without touching skill state."""
+        connection, self._connection = self._connection, None
+        self.ws = None
+        self.ws_thread = None
+        if connection:
+            connection.detach()
+            connection.close(timeout)
+        return connection
+    
+    def disconnect(self, park: bool = True):
+        """
+        Disconnect from current world.
+        
+        Args:
+            park: Keep the connection warm in the pool for a later
+                connect() (ignored when pooling is disabled)
+        """
+        self._cancel_reconnect()
+        self._hibernation = None
+        if self._connection:
+            logger.info("Disconnecting from world...")
+            if park and self._pool.max_size > 0:
+                connection, self._connection = self._connection, None
+                self.ws = None
+                self.ws_thread = None
+                connection.detach()
+                self._pool.park(connection)
+            else:
+                self._release_connection(timeout=5)
         
         self.connected = False
         self.state = PortalState.DISCONNECTED
         self.current_world = None
         logger.info("Disconnected")
     
-    def _send_message(self, msg_type: str, payload: Dict[str, Any] = None) -> bool:
-        """Send a message to the connected world with flat JSON format and signature."""
-        if not self.ws or not self.connected:
-            logger.error("Not connected")
+    def clear_pool(self):
+        """Close every parked connection in the warm connection pool."""
+        self._pool.clear()
+    
+    def _resumable(self) -> bool:
+        """Whether losing the active link now should start a background reconnect."""
+        return (
+            self.config.get('auto_reconnect', True)
+            and not self._reconnecting
+            and self.state not in (PortalState.DISCONNECTED, PortalState.CONNECTING)
+        )
+    
+    def _reconnect_urls(self, url: str) -> List[str]:
+        """The dropped URL's mirror set from the last connect, or just the URL."""
+        return self._target_urls if url in self._target_urls else [url]
+    
+    def _start_reconnect(self, urls: List[str]):
+        """Reconnect to `urls` on a background thread, then replay the journal."""
+        self._reconnecting = True
+        self._recovery_stats['drops'] += 1
+        self._reconnect_stop.clear()
+        logger.warning(f"Link to {urls[0]} dropped, reconnecting in the background")
+        self._reconnect_thread = threading.Thread(
+            target=self._auto_reconnect, args=(urls, time.monotonic()), daemon=True
+        )
+        self._reconnect_thread.start()
+    
+    def _cancel_reconnect(self):
+        """Stop a background reconnect and wait for it to finish."""
+        thread = self._reconnect_thread
+        if thread is None or thread is threading.current_thread():
+            return
+        self._reconnect_stop.set()
+        thread.join()
+        self._reconnect_stop.clear()
+        self._reconnect_thread = None
+    
+    def _auto_reconnect(self, urls: List[str], dropped_at: float):
+        """Background reconnect loop; runs until resumed, cancelled or given up."""
+        policy = RetryPolicy.from_config(self.config)
+        rounds = 0
+        try:
+            while not self._reconnect_stop.is_set():
+                rounds += 1
+                # The dropped link's thread is exiting; stop routing it here
+                self._release_connection(timeout=1)
+                error: Optional[Exception] = None
+                try:
+                    self.connect(urls)
+                    if self.connected and not self._reconnect_stop.is_set():
+                        with self._resume_lock:
+                            self._replay_journal(
+                                lambda frame, request_id: self._send_frame(
+                                    frame, 'replay', Lane.CONTROL, request_id=request_id
+                                )
+                            )
+                            self._reconnecting = not self.connected
+                        if not self._reconnecting:
+                            self._record_recovery(dropped_at)
+                            return
+                except Exception as e:
+                    error = e
+                if self._reconnect_stop.is_set():
+                    return
+                
+                wait = self._recovery_wait(error, policy, rounds)
+                if self._recovery_expired(dropped_at, wait):
+                    self._abandon_recovery()
+                    return
+                self._reconnect_stop.wait(wait)
+        finally:
+            self._reconnecting = False
+    
+    def _recovery_wait(self, error: Optional[Exception], policy: RetryPolicy,
+                       rounds: int) -> float:
+        """Pause before the next round of reconnect attempts."""
+        if isinstance(error, CircuitOpenError):
+            return error.retry_after
+        # connect() already backed off between its own attempts
+        return policy.delay(policy.max_retries + rounds)
+    
+    def _recovery_expired(self, dropped_at: float, wait: float) -> bool:
+        """Whether waiting `wait` more seconds would exceed reconnect.give_up_after."""
+        give_up_after = (self.config.get('reconnect') or {}).get('give_up_after', 300)
+        return time.monotonic() + wait - dropped_at > give_up_after
+    
+    def _replay_journal(self, send: Callable[[str, str], Any]) -> int:
+        """
+        Re-send journaled frames whose requests are still waiting.
+        
+        Frames go out unchanged: the world recognises a replay by its
+        request_id and answers it without running the request twice.
+        
+        Returns:
+            Number of frames re-sent
+        """
+        frames = self._replayable_frames()
+        for request_id, frame in frames:
+            send(frame, request_id)
+            self._recovery_stats['replayed'] += 1
+        if frames:
+            logger.info(f"Replayed {len(frames)} unanswered requests")
+        return len(frames)
+    
+    def _replayable_frames(self) -> List[tuple]:
+        """Journaled (request_id, frame) pairs whose requests are still waiting."""
+        frames = []
+        for request_id, frame in self._journal.unacked():
+            with self._requests_lock:
+                pending = self._pending_requests.get(request_id)
+            if pending is None or pending.future.done():
+                self._journal.ack(request_id)
+            else:
+                frames.append((request_id, frame))
+        return frames
+    
+    def _record_recovery(self, dropped_at: float):
+        """Count a completed resume and its time-to-recover."""
+        elapsed = time.monotonic() - dropped_at
+        self._recovery_stats['recoveries'] += 1
+        self._recovery_stats['last_time_to_recover'] = elapsed
+        self._recovery_stats['total_time_to_recover'] += elapsed
+        logger.info(f"Link recovered in {elapsed:.2f}s")
+    
+    def _abandon_recovery(self):
+        """Give up reconnecting: fail every request that was waiting on a resume."""
+        self._recovery_stats['failed_recoveries'] += 1
+        logger.error("Giving up on reconnect; staying offline")
+        with self._requests_lock:
+            pending_requests = list(self._pending_requests.values())
+        for pending in pending_requests:
+            self._complete_request(pending, None)
+    
+    def _recovery_status(self) -> Dict[str, Any]:
+        """Auto-reconnect counters, including time-to-recover in seconds."""
+        stats = self._recovery_stats
+        return {
+            'reconnecting': self._reconnecting,
+            'drops': stats['drops'],
+            'recoveries': stats['recoveries'],
+            'failed_recoveries': stats['failed_recoveries'],
+            'replayed': stats['replayed'],
+            'duplicates_dropped': self._inbound_seen.duplicates,
+            'journal': len(self._journal),
+            'journal_overflows': self._journal.overflowed,
+            'last_time_to_recover': stats['last_time_to_recover'],
+            'mean_time_to_recover': (
+                stats['total_time_to_recover'] / stats['recoveries']
+                if stats['recoveries'] else None
+            )
+        }
+    
+    def _operation_timeout(self, operation: str) -> float:
+        """Deadline for a request completed by `operation` on the current world."""
+        ceiling = self.config.get('handoff_timeout', 60)
+        timed = TIMED_OPERATIONS.get(operation)
+        return self._timeouts.timeout(self._link_url(), timed, ceiling) if timed else ceiling
+    
+    def _connect_timeout(self, urls: List[str]) -> float:
+        """Connect deadline for a set of mirrors: the most patient of theirs."""
+        ceiling = self.config.get('connection_timeout', 30)
+        return max(self._timeouts.timeout(url, 'connect', ceiling) for url in urls)
+    
+    def _record_timeout(self, urls: List[str], timed: str):
+        """Back off the adaptive deadline of `timed` on each URL after a timeout."""
+        for url in urls:
+            self._timeouts.timed_out(url, timed)
+    
+    def _record_response_timeout(self, operation: str):
+        """Back off the deadline of a request kind that timed out on the current world."""
+        timed = TIMED_OPERATIONS.get(operation)
+        url = self._link_url()
+        if timed and url:
+            self._record_timeout([url], timed)
+    
+    def _timeouts_status(self) -> Dict[str, Any]:
+        """Adaptive deadlines and the latencies behind them, per world URL."""
+        ceilings = {
+            'connect': self.config.get('connection_timeout', 30),
+            'discover': self.config.get('handoff_timeout', 60),
+            'handoff': self.config.get('handoff_timeout', 60)
+        }
+        urls = list(self._target_urls)
+        if self._link_url() and self._link_url() not in urls:
+            urls.append(self._link_url())
+        return {url: self._timeouts.snapshot(url, ceilings) for url in urls}
+    
+    def _keepalive_settings(self) -> tuple:
+        """(interval, max_missed) from the keepalive config."""
+        settings = self.config.get('keepalive') or {}
+        return settings.get('interval', 15), settings.get('max_missed', 3)
+    
+    def _owns_link(self) -> bool:
+        """Whether the active link is this skill's own socket (not a shared one)."""
+        return isinstance(self._connection, WorldConnection)
+    
+    def _link_url(self) -> Optional[str]:
+        """URL of the active link."""
+        return self._connection.url if self._connection else None
+    
+    def _rtt_stats(self, url: str) -> LatencyStats:
+        """Round-trip statistics for a world URL, created on first use."""
+        stats = self._rtt.get(url)
+        if stats is None:
+            stats = self._rtt.setdefault(url, LatencyStats())
+        return stats
+    
+    def _reset_keepalive(self):
+        """Forget outstanding pings; the first ping on a new link waits an interval."""
+        with self._keepalive_lock:
+            self._pings.clear()
+            self._missed_pongs = 0
+            self._next_ping = time.monotonic() + self._keepalive_settings()[0]
+    
+    def _keepalive_tick(self, now: float) -> Optional[float]:
+        """
+        Ping the world if due, or drop the link after too many missed pongs.
+        
+        A ping still unanswered when the next one is due counts as missed.
+        Shared links are pinged by their MultiplexedSession, not by each
+        agent.
+        
+        Returns:
+            Seconds until the next ping, or None while there is nothing to ping
+        """
+        interval, max_missed = self._keepalive_settings()
+        if not interval or not self.connected or not self._owns_link():
+            return None
+        with self._keepalive_lock:
+            if now < self._next_ping:
+                return self._next_ping - now
+            self._next_ping = now + interval
+            if self._pings:
+                self._missed_pongs += 1
+            missed = self._missed_pongs
+            if missed < max_missed:
+                request_id = uuid.uuid4().hex
+                self._pings[request_id] = now
+                while len(self._pings) > max_missed:
+                    self._pings.popitem(last=False)
+        if missed >= max_missed:
+            self._declare_dead(missed)
+            return None
+        if self._send_ping(self._build_frame('ping', request_id=request_id)):
+            self._keepalive_stats['pings'] += 1
+        return interval
+    
+    def _send_ping(self, frame: str) -> bool:
+        """Queue a keepalive ping on the control lane."""
+        return self._send_frame(frame, 'ping')
+    
+    def _declare_dead(self, missed: int):
+        """Drop a link whose world stopped answering pings; auto-reconnect takes over."""
+        logger.warning(f"No pong from {self._link_url()} for {missed} pings, dropping the link")
+        self._keepalive_stats['dead_peers'] += 1
+        self._reset_keepalive()
+        self._abort_link()
+    
+    def _abort_link(self):
+        """Tear down the active link without waiting on the peer."""
+        connection = self._connection
+        if isinstance(connection, WorldConnection):
+            connection.abort()
+    
+    def _keepalive_status(self) -> Dict[str, Any]:
+        """Keepalive settings and ping/pong counters."""
+        interval, max_missed = self._keepalive_settings()
+        return {
+            'interval': interval,
+            'max_missed': max_missed,
+            'missed': self._missed_pongs,
+            **self._keepalive_stats
+        }
+    
+    def _tick(self, now: float) -> Optional[float]:
+        """
+        Scheduler entry point: hibernate if idle, otherwise run the keepalive.
+        
+        Returns:
+            Seconds until the next tick is wanted, or None while there is nothing to do
+        """
+        due = self._hibernation_due(now)
+        if due == 0:
+            if self._hibernate_idle():
+                return None
+            due = None
+        delays = [d for d in (due, self._keepalive_tick(now)) if d is not None]
+        return min(delays) if delays else None
+    
+    def _idle_after(self) -> float:
+        """Seconds without activity before hibernating (0 disables)."""
+        return (self.config.get('hibernation') or {}).get('idle_after', 0)
+    
+    @property
+    def hibernated(self) -> bool:
+        """True while the link is released and the session waits to be woken."""
+        return self._hibernation is not None
+    
+    def _can_hibernate(self) -> bool:
+        """Whether the link can be released without losing a reply or a traversal."""
+        return (
+            self.connected and self._owns_link() and not self._reconnecting
+            and self.state in (PortalState.CONNECTED, PortalState.ARRIVED)
+            and not self._pending_requests
+        )
+    
+    def _hibernation_due(self, now: float) -> Optional[float]:
+        """
+        Seconds until the agent is idle long enough to hibernate (0 if it is).
+        
+        Returns:
+            None if hibernation is off or the agent has no link of its own
+        """
+        idle_after = self._idle_after()
+        if not idle_after or not self.connected or not self._owns_link():
+            return None
+        if not self._can_hibernate():
+            # Busy; look again once it could have been idle for long enough
+            return idle_after
+        return max(self._last_activity + idle_after - now, 0.0)
+    
+    def _hibernate_idle(self) -> bool:
+        """Hibernate from the scheduler, unless a caller is using the skill right now."""
+        if not self._hibernate_lock.acquire(blocking=False):
             return False
-
+        try:
+            # Activity may have arrived since the scheduler looked
+            if self._hibernation_due(time.monotonic()) != 0:
+                return False
+            return self.hibernate() is not None
+        finally:
+            self._hibernate_lock.release()
+    
+    def _save_session(self) -> Dict[str, Any]:
+        """Serialize what a wake needs and drop the in-memory portal cache."""
+        url = self._link_url()
+        snapshot = {
+            'agent_id': self.config['agent_id'],
+            'public_key': self.get_public_key(),
+            'urls': self._reconnect_urls(url),
+            'current_world': self.current_world,
+            'portals': [asdict(portal) for portal in self._portals],
+            'hibernated_at': time.time()
+        }
+        self._hibernation = json.dumps(snapshot)
+        self._portals = []
+        self._hibernation_stats['hibernations'] += 1
+        logger.info(f"Idle, hibernating and releasing the link to {url}")
+        return snapshot
+    
+    def _restore_session(self, snapshot: Dict[str, Any], started: float):
+        """Bring back the portal cache after a wake."""
+        self._portals = [Portal(**portal) for portal in snapshot['portals']]
+        self.current_world = self.current_world or snapshot['current_world']
+        elapsed = time.monotonic() - started
+        self._hibernation_stats['wakes'] += 1
+        self._hibernation_stats['last_wake_seconds'] = elapsed
+        logger.info(f"Woke from hibernation in {elapsed * 1000:.0f}ms")
+    
+    def hibernate(self) -> Optional[Dict[str, Any]]:
+        """
+        Release this agent's link and threads, keeping only what is needed to resume.
+        
+        The world URL, current world and portal cache are serialized and the
+        transport is closed; keys stay loaded. The next discover(), enter(),
+        submit() or send() reconnects transparently. Agents idle for
+        `hibernation.idle_after` seconds are hibernated automatically.
+        
+        Returns:
+            The saved session state, or None if the agent is busy (requests
+            in flight, traversing, reconnecting) or on a shared link
+        """
+        with self._hibernate_lock:
+            if not self._can_hibernate():
+                return None
+            snapshot = self._save_session()
+            self._release_connection()
+            self._pool.clear()
+            self.connected = False
+            self.current_world = None
+            self.state = PortalState.HIBERNATED
+        return snapshot
+    
+    def wake(self) -> bool:
+        """
+        Reconnect a hibernated agent and restore its portal cache.
+        
+        Returns:
+            True if the agent is connected (at once if it was not
+            hibernated); False if the world could not be reached, in which
+            case the agent stays hibernated and the next call tries again
+        """
+        with self._hibernate_lock:
+            saved = self._hibernation
+            if saved is None:
+                return self.connected
+            snapshot = json.loads(saved)
+            started = time.monotonic()
+            woke = False
+            try:
+                woke = self.connect(snapshot['urls'])
+            finally:
+                if not woke:
+                    # Stay hibernated; the next call tries again
+                    self._hibernation = saved
+                    self._hibernation_stats['failed_wakes'] += 1
+            if woke:
+                self._restore_session(snapshot, started)
+        return woke
+    
+    def _mark_active(self):
+        """
+        Note caller activity, waking the agent first if it is hibernated.
+        
+        Raises:
+            ConnectionError: If the world cannot be reached to wake
+        """
+        with self._hibernate_lock:
+            self._last_activity = time.monotonic()
+            if self._hibernation is not None and not self.wake():
+                raise ConnectionError("Could not reconnect to wake from hibernation")
+    
+    def _hibernation_status(self) -> Dict[str, Any]:
+        """Hibernation settings, idle time and wake counters."""
+        return {
+            'idle_after': self._idle_after(),
+            'hibernated': self.hibernated,
+            'idle_for': time.monotonic() - self._last_activity,
+            **self._hibernation_stats
+        }
+    
+    def _build_frame(self, msg_type: str, payload: Dict[str, Any] = None,
+                     request_id: Optional[str] = None) -> str:
+        """
+        Build the signed wire frame for an outbound message.
+        
+        The message is serialized once, in the configured canonical form.
+        Those bytes are what gets signed (exactly what a world following
+        the spec's recipe re-serializes after popping `signature`), and
+        the frame is the same text with the signature spliced in as its
+        last member.
+        """
         payload = payload or {}
         message = {
             "type": msg_type,
             "agent_id": self.config["agent_id"],
             "timestamp": time.time(),
+            "request_id": request_id or uuid.uuid4().hex,
             **payload
         }
+        if not (self._signing_key and nacl):
+            return json.dumps(message)
 
         # Sign the message (exclude signature field)
-        if self._signing_key and nacl:
-            msg_bytes = json.dumps(
-                {k: v for k, v in message.items() if k != "signature"},
-                sort_keys=True
-            ).encode('utf-8')
-            signature = self._signing_key.sign(msg_bytes).signature
-            message["signature"] = base64.b64encode(signature).decode('utf-8')
+        message.pop("signature", None)
+        body = self._canonical.dumps(message, MESSAGE_SHAPE)
+        signature = base64.b64encode(self._signing_key.sign(body.encode('utf-8')).signature)
+        return self._canonical.append_string(body, "signature", signature.decode("ascii"))
+    
+    def _send_message(self, msg_type: str, payload: Dict[str, Any] = None,
+                      request_id: Optional[str] = None) -> bool:
+        """Send a message to the connected world with flat JSON format and signature."""
+        return self._send_frame(self._build_frame(msg_type, payload, request_id), msg_type,
+                                request_id=request_id)
+    
+    def _send_frame(self, frame: str, msg_type: str, lane: Optional[Lane] = None,
+                    coalesce_key: Optional[str] = None, request_id: Optional[str] = None) -> bool:
+        """
+        Queue an already signed frame for the connected world.
+        
+        `request_id` is the one inside the frame, for requests whose reply
+        is awaited; a shared link routes that reply back by it.
+        """
+        if not self._connection or not self.connected:
+            logger.error("Not connected")
+            return False
 
         try:
-            self.ws.send(json.dumps(message))
-            logger.debug(f"Sent {msg_type}")
-            return True
+            if self._connection.send(frame, lane_for(msg_type) if lane is None else lane,
+                                     coalesce_key, request_id):
+                logger.debug(f"Queued {msg_type}")
+                return True
+            logger.warning(f"Send queue full or closed, {msg_type} not sent")
+            return False
         except Exception as e:
             logger.error(f"Send failed: {e}")
             return False
     
-    def _wait_for_response(self, operation: str, timeout: Optional[float] = None) -> Optional[Dict]:
-        """Wait for a response to an operation."""
-        event = threading.Event()
-        self._pending_responses[operation] = event
+    def send(self, msg_type: str, payload: Dict[str, Any] = None,
+             lane: Lane = Lane.TELEMETRY, coalesce_key: Optional[str] = None) -> bool:
+        """
+        Send a fire-and-forget message (no response is awaited).
         
-        timeout = timeout or self.config.get('handoff_timeout', 60)
+        Args:
+            msg_type: Outbound message type
+            payload: Additional message fields
+            lane: Send priority (telemetry by default)
+            coalesce_key: Replace a still-queued message with the same key,
+                e.g. 'position' so only the latest update goes out
+            
+        Returns:
+            False if not connected, the message was dropped under
+            backpressure, or it is too far over the world's rate limit
+        """
+        self._mark_active()
+        wait = self._rate_wait(msg_type, payload)
+        if wait is None:
+            return False
+        if wait:
+            time.sleep(wait)
+        return self._send_frame(self._build_frame(msg_type, payload), msg_type,
+                                lane, coalesce_key)
+    
+    def _journal_frame(self, request_id: str, frame: str) -> bool:
+        """
+        Journal a request frame until it is answered.
         
-        if event.wait(timeout=timeout):
-            del self._pending_responses[operation]
-            return self._response_data.pop(operation, None)
-        else:
-            del self._pending_responses[operation]
+        Returns:
+            True if a reconnect is underway and the frame should wait for
+            the replay instead of being sent now
+        """
+        with self._resume_lock:
+            self._journal.record(request_id, frame)
+            return self._reconnecting and self._journal.max_size > 0
+    
+    def submit(self, msg_type: str, operation: str, payload: Dict[str, Any] = None,
+               timeout: Optional[float] = None) -> Future:
+        """
+        Send a request without waiting for its response.
+        
+        Several requests may be in flight at once; each is correlated to its
+        response by request_id.
+        
+        Args:
+            msg_type: Outbound message type
+            operation: Response message type that completes the request
+            payload: Additional message fields
+            timeout: Seconds until the request expires
+            
+        Returns:
+            Future resolving to the response dict, or None if the send
+            failed or the request expired
+        """
+        self._mark_active()
+        wait = self._rate_wait(msg_type, payload)
+        if wait:
+            time.sleep(wait)
+        request_id = self._new_request(operation, timeout)
+        with self._requests_lock:
+            pending = self._pending_requests[request_id]
+        
+        frame = self._build_frame(msg_type, payload, request_id)
+        if wait is None:
+            self._complete_request(pending, None)
+        elif self._journal_frame(request_id, frame):
+            logger.debug(f"Queued {msg_type} until the link is resumed")
+        elif not self._send_frame(frame, msg_type, request_id=request_id):
+            self._complete_request(pending, None)
+        
+        return pending.future
+    
+    def _request(self, msg_type: str, operation: str, payload: Dict[str, Any] = None,
+                 timeout: Optional[float] = None) -> Optional[Dict]:
+        """Send a request and block until its response, or None on failure/timeout."""
+        timeout = (timeout or self._operation_timeout(operation)) + self._rate_backlog()
+        future = self.submit(msg_type, operation, payload, timeout)
+        return self._wait_for_response(future, operation, timeout)
+    
+    def _wait_for_response(self, future: Future, operation: str,
+                           timeout: Optional[float] = None) -> Optional[Dict]:
+        """Wait for a submitted request's response."""
+        timeout = timeout or self._operation_timeout(operation)
+        
+        try:
+            return future.result(timeout=timeout)
+        except (FutureTimeoutError, CancelledError) as e:
+            future.cancel()
+            if isinstance(e, FutureTimeoutError):
+                self._record_response_timeout(operation)
             logger.warning(f"Timeout waiting for {operation} response")
             return None
     
     def discover(self) -> List[Portal]:
+        self._mark_active()
         if not self.connected:
             raise ConnectionError("Not connected")
     
-        self._send_message('discover')
-        response = self._wait_for_response('discover_response')
+        discovering = self.state in (PortalState.CONNECTED, PortalState.ARRIVED)
+        if discovering:
+            self.state = PortalState.DISCOVERING
+        try:
+            response = self._request('discover', 'discover_response')
+        finally:
+            if discovering and self.state == PortalState.DISCOVERING:
+                self._settle_state()
+        return self._portals_from_response(response)
+    
+    def _settle_state(self):
+        """Return to CONNECTED after an operation, unless the link dropped."""
+        self.state = PortalState.CONNECTED if self.connected else PortalState.DISCONNECTED
+    
+    def _portals_from_response(self, response: Optional[Dict[str, Any]]) -> List[Portal]:
+        """Rebuild the portal cache from a discover response."""
         if not response or 'portals' not in response:
             return []
     
@@ -680,9 +2314,10 @@ class RiftClawSkill:
         
         # Sign the passport
         if self._signing_key and nacl:
-            signature = self._signing_key.sign(passport.to_bytes())
-            passport.signature = base64.b64encode(signature.signature).decode('utf-8')
-            logger.debug(f"Signed passport: {passport.compute_hash()[:16]}...")
+            signature = self._signing_key.sign(passport.to_bytes(self._canonical.name))
+            passport = passport.replace(signature=base64.b64encode(signature.signature).decode('utf-8'))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Signed passport: {passport.compute_hash(self._canonical.name)[:16]}...")
         else:
             logger.warning("No signing key available - passport unsigned")
             if self.config.get('security', {}).get('require_signatures', True):
@@ -690,92 +2325,421 @@ class RiftClawSkill:
         
         return passport
     
-    def enter(self, portal_id: str, **passport_kwargs) -> Dict[str, Any]:
+    def _find_portal(self, portal_id: str) -> Portal:
+        """Look up a discovered portal by ID."""
+        portal = next((p for p in self._portals if p.portal_id == portal_id), None)
+        if not portal:
+            raise HandoffError(f"Portal {portal_id} not found. Run discover() first.")
+        return portal
+    
+    def enter(self, portal_id: str, make_before_break: Optional[bool] = None,
+              **passport_kwargs) -> Dict[str, Any]:
         """
         Enter a portal and initiate handoff to destination world.
         
+        With make-before-break, the destination socket opens as soon as the
+        handoff request is sent, and the source link is closed only after
+        the destination's welcome arrives. A warm pooled link to the
+        destination is always reused when one is available.
+        
+        A handoff turned away for `capacity` or `RATE_LIMITED` is tried
+        again after the world's `retry_after` (plus jitter) for up to
+        `admission.max_wait` seconds. Agents in this process bound for the
+        same world wait in line behind a single probing request.
+        
         Args:
             portal_id: ID of the portal to enter
+            make_before_break: Pre-connect to the destination (defaults to config)
             **passport_kwargs: Additional passport data
             
         Returns:
-            Handoff result dictionary
+            Handoff result dictionary, including the `portal_id` taken,
+            `handoff_mode`, and `time_to_arrival` and `offline_gap` in seconds
             
         Raises:
+            HandoffRejectedError: If the world turns the handoff away
             HandoffError: If handoff fails
             SecurityError: If signature validation fails
         """
+        self._mark_active()
         if not self.connected:
             raise ConnectionError("Not connected to any world")
         
-        # Find portal
-        portal = next((p for p in self._portals if p.portal_id == portal_id), None)
-        if not portal:
-            raise HandoffError(f"Portal {portal_id} not found. Run discover() first.")
-        
+        portal = self._find_portal(portal_id)
+        return self._admitted(portal.destination_world,
+                              lambda admitted: self._enter(portal, make_before_break, admitted,
+                              **passport_kwargs))
+    
+    def _enter(self, portal: Portal, make_before_break: Optional[bool],
+               admitted: Callable[[], None], **passport_kwargs) -> Dict[str, Any]:
+        """
+        One handoff attempt through `portal`; see enter(). `admitted` is
+        called once the handoff is confirmed.
+        """
+        portal_id = portal.portal_id
         logger.info(f"Entering portal: {portal.name} -> {portal.destination_world}")
-        
-        # Generate poetic description
-        if self.config.get('poetic_mode', True):
-            transition = self.describe_transition(
-                self.current_world or 'unknown',
-                portal.destination_world
-            )
-            logger.info(f"Transition: {transition}")
+        transition = self._transition_poem(portal.destination_world)
         
         # Create and sign passport
         passport = self.create_passport(portal.destination_world, **passport_kwargs)
         
+        if make_before_break is None:
+            make_before_break = self.config.get('make_before_break', False)
+        
         # Initiate handoff
         self.state = PortalState.HANDOFF_PENDING
+        started = time.monotonic()
         
-        if not self._send_message('handoff_request', {
+        future = self.submit('handoff_request', 'handoff_confirm', {
             'portal_id': portal_id,
             'passport': passport.to_dict()
-        }):
-            self.state = PortalState.CONNECTED
+        })
+        if future.done() and future.result() is None:
+            self._settle_state()
             raise HandoffError("Failed to send handoff request")
         
-        # Wait for confirmation
-        response = self._wait_for_response('handoff_confirm')
+        # Take a warm link from the pool, or open one while the confirm
+        # is in flight
+        speculative, handoff_mode = None, 'break_before_make'
+        if portal.destination_url:
+            speculative = self._pool.checkout(portal.destination_url)
+            if speculative:
+                handoff_mode = 'pooled'
+            elif make_before_break:
+                speculative = self._new_connection(portal.destination_url).start()
+                handoff_mode = 'make_before_break'
         
-        if not response:
-            self.state = PortalState.CONNECTED
-            raise HandoffError("Handoff timeout")
+        # Wait for confirmation
+        response = self._wait_for_response(future, 'handoff_confirm')
         
-        if 'error' in response:
-            self.state = PortalState.CONNECTED
-            raise HandoffError(f"Handoff rejected: {response['error']}")
+        if not response or 'error' in response:
+            if speculative:
+                self._pool.park(speculative)
+            self._settle_state()
+            if not response:
+                raise HandoffError("Handoff timeout")
+            raise self._rejection_error(response)
         
         # Complete the transition
+        admitted()
         logger.info(f"Handoff confirmed! Crossing to {portal.destination_world}")
+        old_world = self.current_world
+        
+        if speculative and self._switch_to(speculative):
+            offline_gap = 0.0
+        else:
+            offline_gap = self._reconnect_to(portal.destination_urls)
+        
+        return self._arrival_result(old_world, portal, passport, transition, handoff_mode,
+                                    started, offline_gap, 0)
+    
+    def enter_any(self, destination_world: str, hedge_after: Optional[float] = None,
+                  **passport_kwargs) -> Dict[str, Any]:
+        """
+        Enter any discovered portal to `destination_world`, hedging slow handoffs.
+        
+        The request goes through the portal with the best observed confirm
+        time. If it is not confirmed within `hedge_after` seconds, a second
+        signed request goes out through the next portal to the same world,
+        up to `hedged_handoff.max_hedges` extra requests. The first confirm
+        wins and the other requests are withdrawn with `handoff_cancel`.
+        
+        Args:
+            destination_world: World to travel to
+            hedge_after: Seconds before each hedge (defaults to the world's
+                `hedged_handoff.percentile` handoff latency)
+            **passport_kwargs: Additional passport data
+            
+        Returns:
+            Handoff result as from enter(), with the winning `portal_id`
+            and the number of `hedges` (requests sent after the first)
+            
+        Raises:
+            HandoffRejectedError: If the world turns the handoff away (after
+                waiting in line as enter() does)
+            HandoffError: If no discovered portal leads there, or no request
+                was confirmed
+            SecurityError: If a passport cannot be signed
+        """
+        self._mark_active()
+        if not self.connected:
+            raise ConnectionError("Not connected to any world")
+        
+        self._hedge_candidates(destination_world)
+        return self._admitted(destination_world, lambda admitted: self._enter_any(
+            destination_world, hedge_after, admitted, **passport_kwargs))
+    
+    def _enter_any(self, destination_world: str, hedge_after: Optional[float],
+                   admitted: Callable[[], None], **passport_kwargs) -> Dict[str, Any]:
+        """One hedged handoff attempt; see enter_any()."""
+        candidates = self._hedge_candidates(destination_world)
+        hedge_after = self._hedge_delay() if hedge_after is None else hedge_after
+        transition = self._transition_poem(destination_world)
+        
+        self.state = PortalState.HANDOFF_PENDING
+        started = time.monotonic()
+        deadline = started + self._operation_timeout('handoff_confirm')
+        in_flight: Dict[Future, tuple] = {}
+        next_hedge, sent, winner, errors = started, 0, None, []
+        
+        while winner is None:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            if candidates and (now >= next_hedge or not in_flight):
+                portal = candidates.pop(0)
+                passport = self.create_passport(destination_world, **passport_kwargs)
+                future = self.submit('handoff_request', 'handoff_confirm', {
+                    'portal_id': portal.portal_id,
+                    'passport': passport.to_dict()
+                }, deadline - now)
+                in_flight[future] = (portal, passport, now)
+                if sent:
+                    logger.info(f"Handoff not confirmed after {now - started:.2f}s, "
+                                f"hedging through {portal.name}")
+                sent += 1
+                next_hedge = now + hedge_after
+                continue
+            if not in_flight:
+                break
+            until = min(deadline, next_hedge) if candidates else deadline
+            done, _ = wait_futures(in_flight, timeout=max(until - now, 0),
+                                   return_when=FIRST_COMPLETED)
+            for future in done:
+                portal, passport, sent_at = in_flight.pop(future)
+                response = None if future.cancelled() else future.result()
+                if response and 'error' not in response:
+                    winner = (portal, passport, sent_at)
+                    break
+                if response:
+                    errors.append(response)
+        
+        cancels = self._withdraw_hedges(in_flight)
+        for frame in cancels:
+            self._send_frame(frame, 'handoff_cancel')
+        if winner is None:
+            self._settle_state()
+            if errors and not in_flight:
+                raise self._rejection_error(errors[-1])
+            self._record_response_timeout('handoff_confirm')
+            raise HandoffError("Handoff timeout")
         
-        # Disconnect from current world
+        portal, passport, sent_at = winner
+        self._observe_portal(portal, time.monotonic() - sent_at)
+        admitted()
+        logger.info(f"Handoff confirmed via {portal.name}! Crossing to {destination_world}")
         old_world = self.current_world
+        if cancels and self._connection:
+            # Let the cancels out before the source link is closed
+            self._connection.outbox.wait_empty(self.CANCEL_FLUSH_TIMEOUT)
+        speculative = self._pool.checkout(portal.destination_url) if portal.destination_url else None
+        if speculative and self._switch_to(speculative):
+            offline_gap = 0.0
+        else:
+            offline_gap = self._reconnect_to(portal.destination_urls)
+        
+        return self._arrival_result(old_world, portal, passport, transition,
+                                    'pooled' if speculative else 'break_before_make',
+                                    started, offline_gap, sent - 1)
+    
+    def _rejection_error(self, response: Dict[str, Any]) -> HandoffRejectedError:
+        """The error for a handoff answered with `error` or `handoff_rejected`."""
+        rejection = response.get('rejection') or Rejection(str(response['error']))
+        return HandoffRejectedError(f"Handoff rejected: {response['error']}", rejection)
+    
+    def _admission(self, destination_world: str):
+        """
+        Waitlist and deadline for entering `destination_world`, or
+        (None, None) if waiting in line is disabled.
+        """
+        max_wait = (self.config.get('admission') or {}).get('max_wait', 60)
+        if not max_wait:
+            return None, None
+        waitlist = AdmissionWaitlist.from_config(destination_world, self.config)
+        return waitlist, time.monotonic() + max_wait
+    
+    def _admission_timeout(self, waitlist: AdmissionWaitlist) -> HandoffRejectedError:
+        """The error for an agent still in line at its deadline."""
+        rejection = waitlist.last_rejection or Rejection('capacity')
+        return HandoffRejectedError(
+            f"Handoff rejected: {waitlist.destination} still turning agents away "
+            f"({rejection.reason}) after admission.max_wait", rejection)
+    
+    def _admitted(self, destination_world: str,
+                  attempt: Callable[[Callable[[], None]], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run handoff attempts through the destination's waitlist until one
+        is admitted, the world turns us away for good, or time runs out.
+        Each attempt gets a callback to report its confirm, which lets the
+        next agent in line go without waiting for this one's arrival.
+        """
+        waitlist, deadline = self._admission(destination_world)
+        if waitlist is None:
+            return attempt(lambda: None)
+        ticket = waitlist.join()
+        try:
+            while True:
+                if not waitlist.wait_turn(ticket, deadline):
+                    raise self._admission_timeout(waitlist)
+                try:
+                    return attempt(lambda: waitlist.admitted(ticket))
+                except HandoffRejectedError as e:
+                    if not e.rejection.retryable:
+                        raise
+                    retry_in = waitlist.rejected(ticket, e.rejection)
+                    if time.monotonic() + retry_in >= deadline:
+                        raise
+                    logger.info(f"{destination_world} turned the handoff away ({e.rejection.reason}), "
+                                f"next try in {retry_in:.1f}s")
+        finally:
+            waitlist.leave(ticket)
+    
+    def _hedge_settings(self) -> Dict[str, Any]:
+        return self.config.get('hedged_handoff') or {}
+    
+    def _hedge_candidates(self, destination_world: str) -> List[Portal]:
+        """
+        Discovered portals to `destination_world`, fastest observed first
+        (untried portals count as fastest, so they get measured), capped at
+        one plus `max_hedges`.
+        
+        Raises:
+            HandoffError: If none was discovered
+        """
+        portals = [p for p in self._portals if p.destination_world == destination_world]
+        if not portals:
+            raise HandoffError(f"No portal to {destination_world} found. Run discover() first.")
+        url = self._link_url()
+        
+        def observed(portal: Portal) -> float:
+            if not url:
+                return 0.0
+            return AdaptiveTimeouts.stats_for(url, f'handoff:{portal.portal_id}').percentile(50) or 0.0
+        
+        portals.sort(key=observed)
+        return portals[:1 + self._hedge_settings().get('max_hedges', 1)]
+    
+    def _hedge_delay(self) -> float:
+        """Seconds before hedging: the handoff latency percentile for this world."""
+        settings = self._hedge_settings()
+        url = self._link_url()
+        stats = AdaptiveTimeouts.stats_for(url, 'handoff') if url else None
+        if stats is None or stats.count < self._timeouts.min_samples:
+            return settings.get('initial_delay', 2.0)
+        return stats.percentile(settings.get('percentile', 95))
+    
+    def _observe_portal(self, portal: Portal, seconds: float):
+        """Record a portal's confirm time, which orders later hedges."""
+        url = self._link_url()
+        if url:
+            AdaptiveTimeouts.stats_for(url, f'handoff:{portal.portal_id}').record(seconds)
+    
+    def _withdraw_request(self, future: Any) -> Optional[str]:
+        """
+        Stop waiting on a submitted request.
+        
+        Returns:
+            Its request_id, or None if it was already answered
+        """
+        with self._requests_lock:
+            pending = next((p for p in self._pending_requests.values() if p.future is future), None)
+            if pending:
+                del self._pending_requests[pending.request_id]
+        if pending is None:
+            return None
+        self._journal.ack(pending.request_id)
+        future.cancel()
+        return pending.request_id
+    
+    def _withdraw_hedges(self, in_flight: Dict[Any, tuple]) -> List[str]:
+        """
+        Withdraw the handoff requests that lost the race.
+        
+        Returns:
+            Signed `handoff_cancel` frames to send, one per withdrawn request
+        """
+        frames = []
+        now = time.monotonic()
+        for future, (portal, _, sent_at) in in_flight.items():
+            request_id = self._withdraw_request(future)
+            if request_id:
+                # A lower bound, but enough to rank the portal behind the winner
+                self._observe_portal(portal, now - sent_at)
+                frames.append(self._build_frame('handoff_cancel', {'portal_id': portal.portal_id},
+                                                request_id))
+        return frames
+    
+    def _transition_poem(self, destination_world: str) -> Optional[str]:
+        """Log and return a transition description in poetic mode."""
+        if not self.config.get('poetic_mode', True):
+            return None
+        transition = self.describe_transition(self.current_world or 'unknown', destination_world)
+        logger.info(f"Transition: {transition}")
+        return transition
+    
+    def _arrival_result(self, old_world: Optional[str], portal: Portal, passport: AgentPassport,
+                        transition: Optional[str], handoff_mode: str, started: float,
+                        offline_gap: float, hedges: int) -> Dict[str, Any]:
+        """Result dict of enter() and enter_any()."""
+        return {
+            'success': True,
+            'source_world': old_world,
+            'destination_world': portal.destination_world,
+            'portal_id': portal.portal_id,
+            'passport_hash': passport.compute_hash(self._canonical.name),
+            'transition_poem': transition,
+            'handoff_mode': handoff_mode,
+            'hedges': hedges,
+            'time_to_arrival': time.monotonic() - started,
+            'offline_gap': offline_gap
+        }
+    
+    def _switch_to(self, connection: WorldConnection) -> bool:
+        """
+        Adopt a pre-opened destination link, then park the source link.
+        
+        Returns:
+            False if the destination never welcomed us (the link is closed
+            and the caller should fall back to a fresh connect)
+        """
+        timeout = self.config.get('connection_timeout', 30)
+        if not connection.welcomed.wait(timeout) or not connection.alive:
+            logger.warning("Pre-connected destination not ready, reconnecting")
+            connection.close()
+            return False
+        
+        previous = self._connection
+        if previous:
+            previous.detach()
+        self._adopt(connection)
+        self.state = PortalState.ARRIVED
+        if previous:
+            self._pool.park(previous)
+        
+        logger.info(f"Arrived at {self.current_world} without going offline")
+        return True
+    
+    def _reconnect_to(self, url: Union[str, List[str], None]) -> float:
+        """
+        Break-before-make arrival: drop the source link, then connect.
+        
+        Returns:
+            Seconds spent without any world connection
+        """
+        offline_since = time.monotonic()
         self.disconnect()
         
         # Connect to new world if URL provided
-        if portal.destination_url:
+        if url:
             try:
-                # Add passport to connection request
-                connect_data = {
-                    'url': portal.destination_url,
-                    'passport': passport.to_dict()
-                }
-                self.connect(portal.destination_url)
+                self.connect(url)
                 self.state = PortalState.ARRIVED
             except Exception as e:
                 logger.error(f"Failed to connect to destination: {e}")
                 self.state = PortalState.DISCONNECTED
                 raise HandoffError(f"Arrival failed: {e}")
         
-        return {
-            'success': True,
-            'source_world': old_world,
-            'destination_world': portal.destination_world,
-            'passport_hash': passport.compute_hash(),
-            'transition_poem': transition if self.config.get('poetic_mode') else None
-        }
+        return time.monotonic() - offline_since
     
     def verify_handoff(self, response: Dict[str, Any]) -> bool:
         """Validate handoff signature from destination world."""
@@ -810,9 +2774,17 @@ class RiftClawSkill:
                 logger.warning("No sender public key provided, using trust-on-first-use")
                 return True
             
-            # Verify signature
-            message = json.dumps(passport_data, sort_keys=True).encode('utf-8')
-            verify_key.verify(message, signature)
+            # Verify signature, over our canonical form first, then the others
+            forms = [self._canonical] + [
+                form for form in CANONICAL_FORMS.values() if form is not self._canonical
+            ]
+            for form in forms:
+                try:
+                    verify_key.verify(form.encode(passport_data, PASSPORT_SHAPE), signature)
+                    break
+                except BadSignatureError:
+                    if form is forms[-1]:
+                        raise
             
             logger.info("Handoff signature verified successfully")
             return True
@@ -867,11 +2839,76 @@ class RiftClawSkill:
             'agent_id': self.config['agent_id'],
             'agent_name': self.config['agent_name'],
             'discovered_portals': len(self._portals),
+            'state_dwell': self._state.dwell_times(),
+            'pending_requests': len(self._pending_requests),
+            'connection_pool': self._pool.stats(),
+            'handshake': self._handshake_timings(),
+            'connect_retries': dict(self._connect_stats),
+            'circuit_breakers': {url: self._breaker(url).snapshot() for url in self._target_urls},
+            'waitlists': AdmissionWaitlist.snapshot_all(),
+            'recovery': self._recovery_status(),
+            'send_queue': self._send_queue_stats(),
+            'rate_limits': self._rate_governor().stats() if self._rate_governor() else {},
+            'keepalive': self._keepalive_status(),
+            'hibernation': self._hibernation_status(),
+            'timeouts': self._timeouts_status(),
+            'subscribers': self._events.stats(),
+            'rtt': {url: stats.snapshot() for url, stats in list(self._rtt.items())},
             'has_signing_key': self._signing_key is not None
         }
     
+    def _link_outbox(self) -> Optional[OutboundQueue]:
+        """Send queue of the active link (shared with other agents when multiplexed)."""
+        return getattr(self._connection, 'outbox', None)
+    
+    def _send_queue_stats(self) -> Dict[str, Any]:
+        """Depth and wait times of the active link's send queue."""
+        outbox = self._link_outbox()
+        return outbox.stats() if outbox is not None else {}
+    
+    def _rate_governor(self) -> Optional[RateGovernor]:
+        """Rate limits of the active link."""
+        outbox = self._link_outbox()
+        return outbox.governor if outbox is not None else None
+    
+    def _rate_backlog(self) -> float:
+        """
+        Seconds the link's writer will hold a frame queued now to stay
+        within the world's rate limit (added to request deadlines, which
+        should not run out while the frame waits to be sent).
+        """
+        outbox = self._link_outbox()
+        if outbox is None or outbox.governor is None:
+            return 0.0
+        return outbox.governor.backlog(len(outbox))
+    
+    def _rate_wait(self, msg_type: str, payload: Optional[Dict[str, Any]]) -> Optional[float]:
+        """
+        Take rate budget for an outbound message.
+        
+        Returns:
+            Seconds to hold it first, or None if it should not be sent
+            (the wait would exceed `rate_limits.max_wait`)
+        """
+        governor = self._rate_governor()
+        if governor is None:
+            return 0.0
+        wait = governor.reserve(msg_type, self.config['agent_id'], (payload or {}).get('portal_id'))
+        if wait:
+            logger.debug(f"Holding {msg_type} {wait:.2f}s for the world's rate limit")
+        return wait
+    
+    def _handshake_timings(self) -> Dict[str, Any]:
+        """Connection setup timings for the current world URL."""
+        if not self._setup or not self._connection:
+            return {}
+        return self._setup.timings(self._connection.url)
+    
     def list_portals(self) -> List[Portal]:
         """Return list of discovered portals."""
+        saved = self._hibernation
+        if saved is not None:
+            return [Portal(**portal) for portal in json.loads(saved)['portals']]
         return self._portals.copy()
     
     def get_public_key(self) -> Optional[str]:
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Sharded Fleet - Agents Across Worker Processes
+=======================================================
+Passport signing and JSON encoding are CPU-bound, so one process runs out
+of GIL long before the network is busy. ShardedFleet splits the agents
+over worker processes (one per core by default). Each worker drives its
+shard with a RiftClawFleet, and the parent talks to it over a pipe: it
+assigns agents and journeys, and collects results and metrics. If a
+worker dies, its agents are handed to the surviving workers, keeping
+their agent IDs and keys.
+
+Version: 0.1.0
+Author: OpenClaw Framework
+"""
+
+import asyncio
+import base64
+import copy
+import multiprocessing
+import os
+import time
+import uuid
+from collections import deque
+from multiprocessing.connection import Connection, wait
+from typing import Dict, List, Optional, Any, Tuple
+
+try:
+    import nacl.signing
+except ImportError:
+    nacl = None
+
+from .fleet import RiftClawFleet
+from .latency import LatencyStats
+from .riftclaw import HandoffError, RiftError, logger
+
+
+class WorkerDied(RiftError):
+    """A shard's worker process exited while handling a command."""
+    pass
+
+
+class _ShardWorker:
+    """
+    The worker side: one RiftClawFleet and a command loop on its pipe.
+
+    Commands are (name, payload) tuples answered with ('ok', result) or
+    ('error', message), one at a time.
+    """
+
+    # Journey durations kept for percentiles
+    SAMPLE_WINDOW = 4096
+
+    def __init__(self, index: int, conn: Connection, config_path: Optional[str],
+                 max_concurrency: int):
+        self.index = index
+        self.conn = conn
+        self.config_path = config_path
+        self.max_concurrency = max_concurrency
+        self.fleet: Optional[RiftClawFleet] = None
+        self.stats = {'journeys': 0, 'failed': 0, 'hops': 0}
+        self.durations: deque = deque(maxlen=self.SAMPLE_WINDOW)
+
+    def serve(self):
+        while True:
+            try:
+                command, payload = self.conn.recv()
+            except EOFError:
+                break
+            if command == 'stop':
+                break
+            try:
+                self.conn.send(('ok', getattr(self, f'_do_{command}')(payload)))
+            except Exception as e:
+                self.conn.send(('error', f"{type(e).__name__}: {e}"))
+        if self.fleet:
+            self.fleet.stop()
+
+    def _do_adopt(self, configs: List[Dict[str, Any]]) -> int:
+        """Take over agents; returns the shard's new size."""
+        if self.fleet is None:
+            self.fleet = RiftClawFleet(configs, config_path=self.config_path,
+                                       max_concurrency=self.max_concurrency)
+            self.fleet.start()
+        else:
+            self.fleet.add_agents(configs)
+        return len(self.fleet.agents)
+
+    def _do_connect(self, url: Optional[str]) -> Dict[str, Any]:
+        """Connect every agent not yet connected."""
+        async def connect_all():
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def connect_one(agent):
+                if agent.skill.connected:
+                    return True
+                async with semaphore:
+                    return await agent.skill.connect(url)
+
+            agents = self.fleet.agents
+            results = await asyncio.gather(*(connect_one(a) for a in agents),
+                                           return_exceptions=True)
+            return {a.agent_id: r if r is True else f"{type(r).__name__}: {r}"
+                    for a, r in zip(agents, results)}
+        return self.fleet.run(connect_all())
+
+    def _do_journeys(self, journeys: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run journeys concurrently; results are in input order."""
+        async def run_all():
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def run_one(journey):
+                async with semaphore:
+                    return await self._journey(journey)
+            return await asyncio.gather(*(run_one(j) for j in journeys))
+        return self.fleet.run(run_all())
+
+    async def _journey(self, journey: Dict[str, Any]) -> Dict[str, Any]:
+        """Connect if needed, then discover and enter a portal per hop."""
+        agent = self.fleet.get(journey['agent_id'])
+        result = {'agent_id': journey['agent_id'], 'worker': self.index, 'success': False}
+        started = time.perf_counter()
+        portal_ids = journey.get('portal_ids') or [None] * journey.get('hops', 1)
+        try:
+            if agent is None:
+                raise RiftError("Agent not on this worker")
+            skill = agent.skill
+            if not skill.connected and not await skill.connect(journey.get('url')):
+                raise RiftError("Could not connect")
+            worlds = []
+            for portal_id in portal_ids:
+                portals = await skill.discover()
+                if portal_id is None:
+                    if not portals:
+                        raise HandoffError("No portals to enter")
+                    portal_id = portals[0].portal_id
+                arrival = await skill.enter(portal_id, **journey.get('passport', {}))
+                worlds.append(arrival['destination_world'])
+                self.stats['hops'] += 1
+            result.update(success=True, worlds=worlds)
+        except Exception as e:
+            self.stats['failed'] += 1
+            result['error'] = f"{type(e).__name__}: {e}"
+        result['seconds'] = time.perf_counter() - started
+        self.stats['journeys'] += 1
+        self.durations.append(result['seconds'])
+        return result
+
+    def _do_metrics(self, _) -> Dict[str, Any]:
+        """Counters, journey durations and fleet status for merging."""
+        return {
+            'worker': self.index,
+            'pid': os.getpid(),
+            'cpu_seconds': time.process_time(),
+            'durations': list(self.durations),
+            'fleet': self.fleet.get_status() if self.fleet else {},
+            **self.stats
+        }
+
+
+def _worker_main(index: int, conn: Connection, config_path: Optional[str],
+                 max_concurrency: int):
+    """Worker process entry point."""
+    _ShardWorker(index, conn, config_path, max_concurrency).serve()
+
+
+class ShardedFleet:
+    """
+    Shards agents over worker processes, each running a RiftClawFleet.
+
+    Agents are dealt to workers round-robin. Agent IDs and signing keys
+    are fixed in the parent before the configs are sent, so an agent
+    handed to another worker after a crash keeps its identity (agents with
+    a key_path keep loading it from disk). It reconnects on its next
+    journey.
+
+    Methods block until every worker involved has answered. Call them
+    from one thread at a time.
+    """
+
+    def __init__(self, agent_configs: List[Dict[str, Any]],
+                 workers: Optional[int] = None,
+                 config_path: Optional[str] = None,
+                 max_concurrency: int = 100,
+                 start_method: str = 'spawn'):
+        """
+        Args:
+            agent_configs: One config override dict per agent
+            workers: Worker processes (one per CPU core if None)
+            config_path: Shared YAML config, loaded by each worker
+            max_concurrency: Connects or journeys in flight per worker
+            start_method: multiprocessing start method
+        """
+        self.worker_count = max(1, min(workers or os.cpu_count() or 1, len(agent_configs) or 1))
+        self.config_path = config_path
+        self.max_concurrency = max_concurrency
+        self._context = multiprocessing.get_context(start_method)
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        for overrides in agent_configs:
+            config = self._pin_identity(overrides)
+            self._configs[config['agent_id']] = config
+        self._owner: Dict[str, int] = {}
+        self._processes: Dict[int, Any] = {}
+        self._conns: Dict[int, Connection] = {}
+        self._final_metrics: Dict[int, Dict[str, Any]] = {}
+        self._stats = {'worker_deaths': 0, 'rebalanced_agents': 0}
+
+    @staticmethod
+    def _pin_identity(overrides: Dict[str, Any]) -> Dict[str, Any]:
+        """Fix an agent's ID and key so they survive moving between workers."""
+        config = copy.deepcopy(overrides)
+        config.setdefault('agent_id', None)
+        config['agent_id'] = config['agent_id'] or str(uuid.uuid4())
+        security = config.setdefault('security', {})
+        if nacl and not security.get('key_path') and not security.get('signing_key'):
+            seed = bytes(nacl.signing.SigningKey.generate())
+            security['signing_key'] = base64.b64encode(seed).decode('ascii')
+        return config
+
+    @property
+    def agent_ids(self) -> List[str]:
+        """Every agent's ID, in the order the configs were given."""
+        return list(self._configs)
+
+    @property
+    def workers(self) -> List[int]:
+        """Indexes of the live workers."""
+        return sorted(self._conns)
+
+    def start(self):
+        """Start the workers and deal the agents out to them."""
+        if self._conns:
+            return
+        for index in range(self.worker_count):
+            parent, child = self._context.Pipe()
+            process = self._context.Process(
+                target=_worker_main, name=f'riftclaw-shard-{index}', daemon=True,
+                args=(index, child, self.config_path, self.max_concurrency)
+            )
+            process.start()
+            child.close()
+            self._processes[index] = process
+            self._conns[index] = parent
+
+        shards: Dict[int, List[Dict[str, Any]]] = {i: [] for i in self.workers}
+        for n, (agent_id, config) in enumerate(self._configs.items()):
+            index = self.workers[n % len(self.workers)]
+            self._owner[agent_id] = index
+            shards[index].append(config)
+        self._call({i: ('adopt', configs) for i, configs in shards.items()})
+        logger.info(f"Sharded {len(self._configs)} agents over {len(self.workers)} workers")
+
+    def stop(self, timeout: float = 10):
+        """Stop every worker, killing any that do not exit in time."""
+        for index, conn in list(self._conns.items()):
+            try:
+                conn.send(('stop', None))
+            except (OSError, ValueError):
+                pass
+        for index, process in self._processes.items():
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        for conn in self._conns.values():
+            conn.close()
+        self._conns.clear()
+        self._processes.clear()
+
+    def _call(self, commands: Dict[int, Tuple[str, Any]]) -> Dict[int, Any]:
+        """
+        Send one command to each listed worker and wait for every answer.
+
+        Returns:
+            Worker index -> result, or the exception for that worker
+            (WorkerDied if it exited; its agents are rebalanced afterwards)
+        """
+        results: Dict[int, Any] = {}
+        waiting: Dict[Any, int] = {}
+        died = []
+        for index, command in commands.items():
+            conn = self._conns.get(index)
+            if conn is None:
+                results[index] = WorkerDied(f"Worker {index} is not running")
+                continue
+            try:
+                conn.send(command)
+            except (OSError, ValueError) as e:
+                # A broken pipe means the worker is gone, even if not yet reaped
+                results[index] = WorkerDied(f"Worker {index} unreachable: {e}")
+                died.append(index)
+                continue
+            waiting[conn] = index
+            waiting[self._processes[index].sentinel] = index
+
+        while waiting:
+            for ready in wait(list(waiting)):
+                index = waiting.get(ready)
+                if index is None or index in results:
+                    continue
+                conn = self._conns[index]
+                try:
+                    # A dying worker may still have flushed its answer
+                    if not conn.poll():
+                        raise EOFError
+                    status, value = conn.recv()
+                    results[index] = value if status == 'ok' else RiftError(value)
+                except (EOFError, OSError):
+                    results[index] = WorkerDied(f"Worker {index} exited")
+                    died.append(index)
+                waiting = {k: v for k, v in waiting.items() if v != index}
+
+        for index in died:
+            self._lose_worker(index)
+        return results
+
+    def _lose_worker(self, index: int):
+        """Forget a dead worker and deal its agents to the survivors."""
+        conn, process = self._conns.pop(index), self._processes.pop(index)
+        conn.close()
+        process.join(1)
+        if process.is_alive():
+            # Unreachable but still running: its agents must have one owner
+            process.kill()
+            process.join()
+        self._stats['worker_deaths'] += 1
+        orphans = [agent_id for agent_id, owner in self._owner.items() if owner == index]
+        logger.warning(f"Worker {index} (pid {process.pid}) exited with {process.exitcode}, "
+                       f"rebalancing {len(orphans)} agents")
+        if not self._conns:
+            raise RiftError("Every fleet worker has exited")
+
+        shards: Dict[int, List[Dict[str, Any]]] = {i: [] for i in self.workers}
+        for n, agent_id in enumerate(orphans):
+            target = self.workers[n % len(self.workers)]
+            self._owner[agent_id] = target
+            shards[target].append(self._configs[agent_id])
+        self._stats['rebalanced_agents'] += len(orphans)
+        # Another death during the hand-over rebalances again, recursively
+        self._call({i: ('adopt', configs) for i, configs in shards.items() if configs})
+
+    def _by_worker(self, agent_ids: List[str]) -> Dict[int, List[int]]:
+        """Positions in `agent_ids` grouped by owning worker."""
+        groups: Dict[int, List[int]] = {}
+        for position, agent_id in enumerate(agent_ids):
+            if agent_id not in self._owner:
+                raise RiftError(f"Unknown agent: {agent_id}")
+            groups.setdefault(self._owner[agent_id], []).append(position)
+        return groups
+
+    def connect_all(self, url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Connect every agent on every worker.
+
+        Returns:
+            Mapping of agent_id to True or an error message
+        """
+        outcome: Dict[str, Any] = {}
+        for index, result in self._call({i: ('connect', url) for i in self.workers}).items():
+            if isinstance(result, Exception):
+                outcome.update({a: str(result) for a, o in self._owner.items() if o == index})
+            else:
+                outcome.update(result)
+        return outcome
+
+    def run_journeys(self, journeys: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run journeys on the workers that own their agents, in parallel.
+
+        Each journey is a dict with `agent_id` and optionally `url` (used
+        if the agent is not connected), `portal_ids` (entered in turn) or
+        `hops` (enter the first discovered portal this many times; 1 by
+        default) and `passport` (extra passport fields).
+
+        Returns:
+            One result per journey, in order: agent_id, worker, success,
+            seconds, and worlds or error. Journeys on a worker that died
+            fail with its error; its agents are already rebalanced.
+        """
+        groups = self._by_worker([j['agent_id'] for j in journeys])
+        answers = self._call({
+            index: ('journeys', [journeys[p] for p in positions])
+            for index, positions in groups.items()
+        })
+        results: List[Optional[Dict[str, Any]]] = [None] * len(journeys)
+        for index, positions in groups.items():
+            answer = answers[index]
+            for n, position in enumerate(positions):
+                if isinstance(answer, Exception):
+                    results[position] = {'agent_id': journeys[position]['agent_id'],
+                                         'worker': index, 'success': False,
+                                         'error': str(answer)}
+                else:
+                    results[position] = answer[n]
+        return results
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Metrics merged across workers: journey counters, journey duration
+        percentiles, fleet state counts, CPU seconds per worker, and
+        worker deaths and rebalanced agents.
+        """
+        reports = [r for r in self._call({i: ('metrics', None) for i in self.workers}).values()
+                   if not isinstance(r, Exception)]
+        for report in reports:
+            self._final_metrics[report['worker']] = report
+        # Dead workers' last reports keep their counters in the totals
+        reports = list(self._final_metrics.values())
+
+        durations = [d for r in reports for d in r['durations']]
+        latency = LatencyStats(window=max(len(durations), 1))
+        for duration in durations:
+            latency.record(duration)
+        states: Dict[str, int] = {}
+        live = [r for r in reports if r['worker'] in self._conns]
+        for report in live:
+            for state, count in report['fleet'].get('states', {}).items():
+                states[state] = states.get(state, 0) + count
+
+        return {
+            'workers': len(self._conns),
+            'agents': len(self._configs),
+            'agents_per_worker': {i: sum(1 for o in self._owner.values() if o == i)
+                                  for i in self.workers},
+            'connected': sum(r['fleet'].get('connected', 0) for r in live),
+            'sockets': sum(r['fleet'].get('sockets', 0) for r in live),
+            'states': states,
+            'journeys': sum(r['journeys'] for r in reports),
+            'failed': sum(r['failed'] for r in reports),
+            'hops': sum(r['hops'] for r in reports),
+            'journey_seconds': latency.snapshot(),
+            'cpu_seconds': {r['worker']: r['cpu_seconds'] for r in reports},
+            **self._stats
+        }
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+    def __enter__(self) -> 'ShardedFleet':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
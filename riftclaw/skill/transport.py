@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+RiftClaw Transport - Pluggable Links for Thread-Based Skills
+============================================================
+A WorldConnection does not care how frames reach a world, only that text
+frames go both ways. The transport is picked from the URL scheme:
+
+    ws://, wss://      WebSocket over TCP/TLS (websocket-client)
+    ws+unix:///path    WebSocket over a Unix domain socket, for a relay on
+                       the same host (append ':/request/path' if needed)
+    loop://name        In-process loopback to a LoopbackListener: frames
+                       are handed over as str objects, with no socket,
+                       framing or copy
+
+Other schemes can be added with register_transport().
+
+Version: 0.1.0
+Author: OpenClaw Framework
+"""
+
+import logging
+import queue
+import socket
+import threading
+import time
+from typing import Callable, Dict, Optional, Any, Tuple, Type
+from urllib.parse import urlparse
+
+try:
+    from websocket import WebSocketApp
+except ImportError:
+    WebSocketApp = None
+
+logger = logging.getLogger('riftclaw')
+
+
+class Transport:
+    """
+    One link carrying text frames to a world, driven by a WorldConnection.
+
+    run() executes on the connection's thread: it opens the link and then
+    reports events through the callbacks until the link is gone. Each
+    callback receives the transport as its first argument, so owners can
+    tell a current link from a replaced one. send() is called from the
+    connection's writer thread; close() and abort() from any thread.
+    """
+
+    # Whether the transport's dependencies are installed, and which they are
+    available = True
+    requires: Optional[str] = None
+
+    def __init__(self, url: str, setup: Any = None, timeout: Optional[float] = None):
+        """
+        Args:
+            url: World URL
+            setup: Shared ConnectionSetup (used by network transports)
+            timeout: Seconds allowed to establish the link
+        """
+        self.url = url
+        self.setup = setup
+        self.timeout = timeout
+
+    def run(self, on_open: Callable, on_message: Callable,
+            on_error: Callable, on_close: Callable):
+        """Open the link and deliver events until it closes (blocks)."""
+        raise NotImplementedError
+
+    def send(self, frame: str):
+        """Write one frame; raises if the link is gone."""
+        raise NotImplementedError
+
+    def close(self):
+        """Close the link, with a closing handshake where the transport has one."""
+        raise NotImplementedError
+
+    def abort(self):
+        """Drop the link at once, for a peer that stopped answering."""
+        self.close()
+
+    def remember_session(self):
+        """Store resumable session state (TLS tickets) once the world has spoken."""
+
+
+class WebSocketTransport(Transport):
+    """WebSocket over TCP, or TLS for wss:// (websocket-client)."""
+
+    available = WebSocketApp is not None
+    requires = 'websocket-client'
+
+    # Seconds the reader blocks in select() between checks for close()
+    SELECT_TIMEOUT = 1.0
+
+    def __init__(self, url: str, setup: Any = None, timeout: Optional[float] = None):
+        super().__init__(url, setup, timeout)
+        self.app = WebSocketApp(self._app_url())
+        self._socket_ready_at: Optional[float] = None
+
+    def _app_url(self) -> str:
+        """URL websocket-client performs the upgrade against."""
+        return self.url
+
+    def _open_socket(self) -> Optional[socket.socket]:
+        """A connected socket for the upgrade, or None to let websocket-client connect."""
+        return self.setup.open_socket(self.url, self.timeout) if self.setup else None
+
+    def run(self, on_open, on_message, on_error, on_close):
+        def opened(app):
+            if self.setup and self._socket_ready_at:
+                self.setup.record_phase(self.url, ws_upgrade=time.monotonic() - self._socket_ready_at)
+                self.remember_session()
+            on_open(self)
+
+        self.app.on_open = opened
+        self.app.on_message = lambda app, message: on_message(self, message)
+        self.app.on_error = lambda app, error: on_error(self, error)
+        self.app.on_close = lambda app, code, reason: on_close(self, code, reason)
+        try:
+            self.app.prepared_socket = self._open_socket()
+        except Exception as e:
+            on_error(self, e)
+            on_close(self, None, str(e))
+            return
+        self._socket_ready_at = time.monotonic()
+        # websocket-client only notices close() when its select() times out;
+        # a short timeout keeps close() from waiting out the default 10s
+        self.app.run_forever(ping_timeout=self.SELECT_TIMEOUT)
+
+    def send(self, frame: str):
+        self.app.send(frame)
+
+    def close(self):
+        self.app.close()
+
+    def abort(self):
+        # Shutting the socket down wakes the reader, which reports the close
+        sock = getattr(self.app.sock, 'sock', None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def remember_session(self):
+        sock = getattr(self.app.sock, 'sock', None)
+        if self.setup and sock is not None:
+            self.setup.remember_session(self.url, sock)
+
+
+class UnixSocketTransport(WebSocketTransport):
+    """
+    WebSocket over a Unix domain socket: `ws+unix:///run/relay.sock` or
+    `ws+unix:///run/relay.sock:/request/path`.
+
+    Skips DNS, TCP and TLS for a relay on the same host while keeping the
+    relay's WebSocket protocol unchanged.
+    """
+
+    def _endpoint(self) -> Tuple[str, str]:
+        """(socket path, request path) from the URL."""
+        path = urlparse(self.url).path
+        socket_path, _, request_path = path.partition(':')
+        return socket_path, request_path or '/'
+
+    def _app_url(self) -> str:
+        return f"ws://localhost{self._endpoint()[1]}"
+
+    def _open_socket(self) -> socket.socket:
+        started = time.monotonic()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self._endpoint()[0])
+        except OSError:
+            sock.close()
+            raise
+        sock.settimeout(None)
+        if self.setup:
+            self.setup.record(self.url, {'connect': time.monotonic() - started})
+        return sock
+
+    def remember_session(self):
+        pass
+
+
+class LoopbackPeer:
+    """
+    One end of an in-process link.
+
+    send() hands the frame object to the other end's inbox; recv() takes
+    frames from this end's inbox. Closing either end closes both.
+    """
+
+    _CLOSED = object()
+
+    def __init__(self):
+        self.remote: Optional['LoopbackPeer'] = None
+        self.closed = False
+        self._inbox: queue.SimpleQueue = queue.SimpleQueue()
+
+    @classmethod
+    def pair(cls) -> Tuple['LoopbackPeer', 'LoopbackPeer']:
+        """Two connected ends."""
+        a, b = cls(), cls()
+        a.remote, b.remote = b, a
+        return a, b
+
+    def send(self, frame: str):
+        """
+        Deliver a frame to the other end.
+
+        Raises:
+            ConnectionResetError: If the link is closed
+        """
+        if self.closed:
+            raise ConnectionResetError("Loopback link closed")
+        self.remote._inbox.put(frame)
+
+    def recv(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Next frame from the other end.
+
+        Returns:
+            The frame, or None once the link is closed (or on timeout)
+        """
+        try:
+            frame = self._inbox.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if frame is self._CLOSED:
+            # Leave the marker for any other reader
+            self._inbox.put(frame)
+            return None
+        return frame
+
+    def close(self):
+        """Close both ends; pending recv() calls return None."""
+        for end in (self, self.remote):
+            if not end.closed:
+                end.closed = True
+                end._inbox.put(self._CLOSED)
+
+    def __iter__(self):
+        while True:
+            frame = self.recv()
+            if frame is None:
+                return
+            yield frame
+
+
+class LoopbackListener:
+    """
+    An in-process world endpoint that skills reach at `loop://<name>`.
+
+    Each connecting skill gets a LoopbackPeer, and `handler(peer)` runs on
+    a new daemon thread for it, much like a websockets server handler:
+
+        def world(peer):
+            peer.send(json.dumps({'type': 'welcome', 'world_name': 'test'}))
+            for frame in peer:
+                ...
+
+        with LoopbackListener('test', world):
+            skill.connect('loop://test')
+    """
+
+    _registry: Dict[str, 'LoopbackListener'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, name: str, handler: Callable[[LoopbackPeer], None]):
+        self.name = name
+        self.handler = handler
+        self.accepted = 0
+
+    @property
+    def url(self) -> str:
+        return f"loop://{self.name}"
+
+    @classmethod
+    def lookup(cls, name: str) -> Optional['LoopbackListener']:
+        with cls._registry_lock:
+            return cls._registry.get(name)
+
+    def start(self) -> 'LoopbackListener':
+        """
+        Start accepting connections.
+
+        Raises:
+            ValueError: If another listener already has this name
+        """
+        with self._registry_lock:
+            if self._registry.get(self.name) not in (None, self):
+                raise ValueError(f"Loopback name already in use: {self.name}")
+            self._registry[self.name] = self
+        return self
+
+    def close(self):
+        """Stop accepting connections; open links are not affected."""
+        with self._registry_lock:
+            if self._registry.get(self.name) is self:
+                del self._registry[self.name]
+
+    def connect(self) -> LoopbackPeer:
+        """Open a link: returns the client end and starts the handler on the other."""
+        client, server = LoopbackPeer.pair()
+        self.accepted += 1
+        threading.Thread(target=self._serve, args=(server,), daemon=True).start()
+        return client
+
+    def _serve(self, peer: LoopbackPeer):
+        try:
+            self.handler(peer)
+        except Exception as e:
+            logger.error(f"Loopback world {self.name} failed: {e}")
+        finally:
+            peer.close()
+
+    def __enter__(self) -> 'LoopbackListener':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class LoopbackTransport(Transport):
+    """In-process link to a LoopbackListener (`loop://<name>`)."""
+
+    def __init__(self, url: str, setup: Any = None, timeout: Optional[float] = None):
+        super().__init__(url, setup, timeout)
+        self.peer: Optional[LoopbackPeer] = None
+        self._closing = False
+
+    def run(self, on_open, on_message, on_error, on_close):
+        listener = LoopbackListener.lookup(urlparse(self.url).netloc)
+        if listener is None or self._closing:
+            error = ConnectionRefusedError(f"No loopback listener at {self.url}")
+            on_error(self, error)
+            on_close(self, None, str(error))
+            return
+        self.peer = listener.connect()
+        on_open(self)
+        for frame in self.peer:
+            on_message(self, frame)
+        on_close(self, 1000 if self._closing else None, 'closed')
+
+    def send(self, frame: str):
+        if self.peer is None:
+            raise ConnectionError("Loopback link not open")
+        self.peer.send(frame)
+
+    def close(self):
+        self._closing = True
+        if self.peer is not None:
+            self.peer.close()
+
+
+TRANSPORTS: Dict[str, Type[Transport]] = {
+    'ws': WebSocketTransport,
+    'wss': WebSocketTransport,
+    'ws+unix': UnixSocketTransport,
+    'loop': LoopbackTransport,
+}
+
+
+def register_transport(scheme: str, transport: Type[Transport]):
+    """Use `transport` for URLs with `scheme`."""
+    TRANSPORTS[scheme] = transport
+
+
+def transport_class(url: str) -> Type[Transport]:
+    """
+    The transport for a URL's scheme.
+
+    Raises:
+        ValueError: If no transport handles the scheme, or its
+            dependencies are not installed
+    """
+    scheme = urlparse(url).scheme
+    transport = TRANSPORTS.get(scheme)
+    if transport is None:
+        raise ValueError(f"No transport for {scheme or 'scheme-less'} URL: {url}")
+    if not transport.available:
+        raise ValueError(f"{transport.requires} not installed (needed for {scheme}:// URLs)")
+    return transport
+
+
+def open_transport(url: str, setup: Any = None, timeout: Optional[float] = None) -> Transport:
+    """Create (but don't run) the transport for `url`."""
+    return transport_class(url)(url, setup, timeout)
@@ -0,0 +1,303 @@
+"""
+Shared fixtures: scriptable in-process worlds and skills connected to them.
+
+Worlds are LoopbackListener handlers, so the thread-based skill talks to
+them through its normal connection code with no sockets involved. The
+asyncio clients only speak real WebSockets, so WsWorld serves the same
+script over a websockets server on localhost. Run from the project root:
+
+    python -m pytest tests
+"""
+
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.server import ServerConnection, serve
+
+# Import the skill the way benchmarks.py does, from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skill.admission import AdmissionWaitlist  # noqa: E402
+from skill.async_riftclaw import AsyncRiftClawSkill  # noqa: E402
+from skill.latency import AdaptiveTimeouts  # noqa: E402
+from skill.presence import MultiWorldPresence  # noqa: E402
+from skill.ratelimit import RateGovernor  # noqa: E402
+from skill.resilience import CircuitBreaker  # noqa: E402
+from skill.riftclaw import RiftClawSkill, merge_config  # noqa: E402
+from skill.transport import LoopbackListener, LoopbackPeer  # noqa: E402
+
+
+class LoopWorld:
+    """
+    A world behind a LoopbackListener that answers like the spec's server
+    and records every frame it receives.
+
+    Knobs, keyed by message type:
+        delays      seconds to wait before answering, keyed by a request's
+                    portal_id or tag if it has one (answers are sent from
+                    timers, so later requests can be answered first);
+                    'welcome' holds back the greeting on each new link
+        drop_once   close the link instead of answering, the first time
+        mute        never answer
+        replies     scripted answers, used up one per request before the
+                    usual answer is sent again
+    """
+
+    def __init__(self, name: str, portals: Optional[List[Dict[str, Any]]] = None,
+                 welcome: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.listener = LoopbackListener(name, self.serve)
+        self.portals = portals if portals is not None else [
+            {'portal_id': 'gate', 'name': 'Gate', 'destination_world': name,
+             'destination_url': self.url}
+        ]
+        self.welcome = welcome or {}
+        self.delays: Dict[str, float] = {}
+        self.drop_once = set()
+        self.mute = set()
+        self.replies: Dict[str, List[Dict[str, Any]]] = {}
+        self.received: List[Dict[str, Any]] = []
+        self.arrivals: List[float] = []
+        self.peers: List[LoopbackPeer] = []
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return self.listener.url
+
+    def start(self) -> 'LoopWorld':
+        self.listener.start()
+        return self
+
+    def close(self):
+        self.listener.close()
+        for peer in self.peers:
+            peer.close()
+
+    def of_type(self, msg_type: str) -> List[Dict[str, Any]]:
+        """Frames of one type received so far, in order."""
+        with self._lock:
+            return [m for m in self.received if m.get('type') == msg_type]
+
+    def times(self, msg_type: str) -> List[float]:
+        """time.monotonic() at which each frame of one type arrived."""
+        with self._lock:
+            return [t for m, t in zip(self.received, self.arrivals) if m.get('type') == msg_type]
+
+    def push(self, message: Dict[str, Any]):
+        """Send an unsolicited frame down every open link."""
+        for peer in self.peers:
+            if not peer.closed:
+                peer.send(json.dumps(message))
+
+    def serve(self, peer: LoopbackPeer):
+        self.peers.append(peer)
+        if self.delays.get('welcome'):
+            time.sleep(self.delays['welcome'])
+        peer.send(json.dumps({'type': 'welcome', 'world_name': self.name, **self.welcome}))
+        for frame in peer:
+            message = json.loads(frame)
+            msg_type = message.get('type')
+            key = message.get('portal_id') or message.get('tag') or msg_type
+            with self._lock:
+                self.received.append(message)
+                self.arrivals.append(time.monotonic())
+                if msg_type in self.drop_once:
+                    self.drop_once.discard(msg_type)
+                    peer.close()
+                    return
+            if msg_type in self.mute:
+                continue
+            reply = self.respond(message)
+            if reply is None:
+                continue
+            if 'request_id' in message:
+                reply['request_id'] = message['request_id']
+            delay = self.delays.get(key, 0)
+            if delay:
+                threading.Timer(delay, self._send, (peer, reply)).start()
+            else:
+                self._send(peer, reply)
+
+    @staticmethod
+    def _send(peer: LoopbackPeer, reply: Dict[str, Any]):
+        try:
+            peer.send(json.dumps(reply))
+        except ConnectionResetError:
+            pass
+
+    def respond(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        msg_type = message.get('type')
+        with self._lock:
+            scripted = self.replies.get(msg_type)
+            if scripted:
+                return dict(scripted.pop(0))
+        if msg_type == 'discover':
+            portals = self.portals
+            if 'tag' in message:
+                # Lets a test tell which request an answer belongs to
+                portals = [{**portals[0], 'portal_id': message['tag']}]
+            return {'type': 'discover_response', 'portals': portals}
+        if msg_type == 'handoff_request':
+            passport = message.get('passport') or {}
+            return {'type': 'handoff_confirm', 'passport': passport,
+                    'signature': passport.get('signature')}
+        if msg_type == 'ping':
+            return {'type': 'pong', 'timestamp': time.time()}
+        return None
+
+
+class WsPeer:
+    """A websockets server connection with the LoopbackPeer interface LoopWorld uses."""
+
+    def __init__(self, connection: ServerConnection):
+        self.connection = connection
+        self.closed = False
+
+    def send(self, frame: str):
+        try:
+            self.connection.send(frame)
+        except ConnectionClosed:
+            self.closed = True
+            raise ConnectionResetError("WebSocket closed")
+
+    def close(self):
+        self.closed = True
+        self.connection.close()
+
+    def __iter__(self):
+        try:
+            yield from self.connection
+        except ConnectionClosed:
+            pass
+        self.closed = True
+
+
+class WsWorld(LoopWorld):
+    """A LoopWorld served over a websockets server on 127.0.0.1."""
+
+    def __init__(self, name: str, **kwargs):
+        self.server = serve(lambda connection: self.serve(WsPeer(connection)),
+                            '127.0.0.1', 0, compression=None)
+        super().__init__(name, **kwargs)
+
+    @property
+    def port(self) -> int:
+        return self.server.socket.getsockname()[1]
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}"
+
+    def start(self) -> 'WsWorld':
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def close(self):
+        for peer in self.peers:
+            peer.close()
+        self.server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    """Keep skill logging out of the output; forget process-wide limits, waitlists, breakers and deadlines."""
+    logging.getLogger('riftclaw').setLevel(logging.CRITICAL)
+    yield
+    RateGovernor.forget()
+    AdmissionWaitlist.reset_all()
+    CircuitBreaker.reset_all()
+    AdaptiveTimeouts.reset_all()
+
+
+def _world_factory(request, world_class):
+    worlds = []
+
+    def make(suffix: str = 'world', **kwargs) -> LoopWorld:
+        name = re.sub(r'[^\w-]', '-', f'{request.node.name}-{suffix}')
+        loop_world = world_class(name, **kwargs).start()
+        worlds.append(loop_world)
+        return loop_world
+
+    return worlds, make
+
+
+@pytest.fixture
+def world(request):
+    """Factory for started LoopWorlds with names unique to the test."""
+    worlds, make = _world_factory(request, LoopWorld)
+    yield make
+    for loop_world in worlds:
+        loop_world.close()
+
+
+@pytest.fixture
+def ws_world(request):
+    """Factory for started WsWorlds, for the asyncio clients."""
+    worlds, make = _world_factory(request, WsWorld)
+    yield make
+    for ws_world in worlds:
+        ws_world.close()
+
+
+# Fast retries, no pings or rate limits unless a test asks for them
+TEST_CONFIG = {
+    'agent_name': 'tester',
+    'log_level': 'CRITICAL',
+    'security': {'key_path': None},
+    'keepalive': {'interval': 0},
+    'retry': {'base_delay': 0.05},
+    'rate_limits': {'enabled': False},
+    'handoff_timeout': 5,
+}
+
+
+@pytest.fixture
+def make_skill():
+    """Factory for RiftClawSkills with TEST_CONFIG; each is disconnected afterwards."""
+    skills = []
+
+    def make(**overrides) -> RiftClawSkill:
+        config = merge_config(json.loads(json.dumps(TEST_CONFIG)), overrides)
+        skill = RiftClawSkill(config=config)
+        skills.append(skill)
+        return skill
+
+    yield make
+    for skill in skills:
+        skill.disconnect(park=False)
+
+
+@pytest.fixture
+def make_async_skill():
+    """
+    Factory for AsyncRiftClawSkills with TEST_CONFIG. Their links live on
+    the test's loop, so the test disconnects them itself.
+    """
+    def make(**overrides) -> AsyncRiftClawSkill:
+        return AsyncRiftClawSkill(config=merge_config(json.loads(json.dumps(TEST_CONFIG)), overrides))
+
+    return make
+
+
+@pytest.fixture
+def make_presence():
+    """Factory for MultiWorldPresences with TEST_CONFIG; each is closed afterwards."""
+    presences = []
+
+    def make(**kwargs) -> MultiWorldPresence:
+        presence = MultiWorldPresence(config=json.loads(json.dumps(TEST_CONFIG)), **kwargs)
+        presences.append(presence)
+        return presence
+
+    yield make
+    for presence in presences:
+        presence.close()
@@ -0,0 +1,111 @@
+"""Waiting in line for a full world: one probe at a time, after retry_after."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from skill.admission import AdmissionWaitlist, Rejection
+from skill.riftclaw import HandoffRejectedError
+
+RETRY_AFTER = 0.3
+AGENTS = 3
+
+
+def _full_world(world):
+    """A world that turns the first wave away and admits everyone after."""
+    destination = world('destination')
+    source = world('source', portals=[
+        {'portal_id': 'gate', 'name': 'Gate', 'destination_world': destination.name,
+         'destination_url': destination.url}
+    ])
+    source.replies['handoff_request'] = [
+        {'type': 'handoff_rejected', 'reason': 'capacity', 'retry_after': RETRY_AFTER}
+    ] * AGENTS
+    # Keeps each probe in flight long enough to see a second one start
+    source.delays['gate'] = 0.1
+    return source, destination
+
+
+def _assert_waited_in_line(source, destination, skills):
+    times = source.times('handoff_request')
+    assert len(times) == 2 * AGENTS
+    first_wave, retries = times[:AGENTS], times[AGENTS:]
+    # Nobody retries before the world's retry_after
+    assert retries[0] - first_wave[-1] >= RETRY_AFTER - 0.05
+    # One probe at a time: each retry waits for the answer to the one before
+    for earlier, later in zip(retries, retries[1:]):
+        assert later - earlier >= 0.1
+    status = skills[0].get_status()['waitlists'][destination.name]
+    assert status['rejections'] == AGENTS
+    assert status['admissions'] == AGENTS
+    assert status['probes'] == AGENTS
+    assert not status['full']
+
+
+def test_threads_probe_a_full_world_one_at_a_time(world, make_skill):
+    source, destination = _full_world(world)
+    skills = [make_skill(agent_name=f'agent{i}') for i in range(AGENTS)]
+    for skill in skills:
+        assert skill.connect(source.url)
+        skill.discover()
+
+    results = []
+    threads = [threading.Thread(target=lambda s=skill: results.append(s.enter('gate')))
+               for skill in skills]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(results) == AGENTS and all(result['success'] for result in results)
+    _assert_waited_in_line(source, destination, skills)
+
+
+def test_coroutines_probe_a_full_world_one_at_a_time(ws_world, make_async_skill):
+    source, destination = _full_world(ws_world)
+
+    async def scenario():
+        skills = [make_async_skill(agent_name=f'agent{i}') for i in range(AGENTS)]
+        try:
+            for skill in skills:
+                assert await skill.connect(source.url)
+                await skill.discover()
+            results = await asyncio.wait_for(
+                asyncio.gather(*(skill.enter('gate') for skill in skills)), 10)
+            assert all(result['success'] for result in results)
+            _assert_waited_in_line(source, destination, skills)
+        finally:
+            for skill in skills:
+                await skill.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_rejection_for_good_is_not_retried(world, make_skill):
+    source, _ = _full_world(world)
+    source.replies['handoff_request'] = [{'type': 'handoff_rejected', 'reason': 'banned'}]
+    skill = make_skill()
+    assert skill.connect(source.url)
+    skill.discover()
+
+    with pytest.raises(HandoffRejectedError, match='banned'):
+        skill.enter('gate')
+    assert len(source.of_type('handoff_request')) == 1
+
+
+def test_waiting_coroutine_wakes_when_the_probe_is_answered():
+    waitlist = AdmissionWaitlist('woken')
+    probe, waiter = waitlist.join(), waitlist.join()
+    waitlist.rejected(probe, Rejection('capacity', retry_after=0.01))
+
+    async def scenario():
+        assert await waitlist.wait_turn_async(probe, time.monotonic() + 1)
+        # Answered from another thread, as the sync skill's reader would
+        threading.Timer(0.12, waitlist.admitted, (probe,)).start()
+        started = time.monotonic()
+        assert await waitlist.wait_turn_async(waiter, time.monotonic() + 5)
+        return time.monotonic() - started
+
+    assert 0.12 <= asyncio.run(scenario()) < 0.14
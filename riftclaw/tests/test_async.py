@@ -0,0 +1,87 @@
+"""The asyncio skill over real WebSockets: connect, discover, enter, recover."""
+
+import asyncio
+
+from skill.riftclaw import PortalState
+
+
+async def _until(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+def test_connect_discover_and_enter(ws_world, make_async_skill):
+    destination = ws_world('destination')
+    source = ws_world('source', portals=[
+        {'portal_id': 'gate', 'name': 'Gate', 'destination_world': destination.name,
+         'destination_url': destination.url}
+    ])
+    skill = make_async_skill()
+
+    async def scenario():
+        try:
+            assert await skill.connect(source.url)
+            portals = await skill.discover()
+            assert [portal.portal_id for portal in portals] == ['gate']
+
+            result = await skill.enter('gate')
+
+            assert result['success']
+            await _until(lambda: skill.current_world == destination.name)
+            assert skill.state == PortalState.ARRIVED
+        finally:
+            await skill.disconnect()
+
+    asyncio.run(scenario())
+    handoff = source.of_type('handoff_request')[0]
+    assert handoff['passport']['target_world'] == destination.name
+    assert len(destination.peers) == 1
+
+
+def test_dropped_request_is_replayed_after_reconnect(ws_world, make_async_skill):
+    loop_world = ws_world()
+    skill = make_async_skill()
+
+    async def scenario():
+        try:
+            assert await skill.connect(loop_world.url)
+            loop_world.drop_once.add('discover')
+            portals = await asyncio.wait_for(skill.discover(), 5)
+            assert [portal.portal_id for portal in portals] == ['gate']
+        finally:
+            await skill.disconnect()
+
+    asyncio.run(scenario())
+    sent = loop_world.of_type('discover')
+    assert len(sent) == 2
+    assert sent[0]['request_id'] == sent[1]['request_id']
+    assert len(loop_world.peers) == 2
+    recovery = skill.get_status()['recovery']
+    assert recovery['drops'] == 1
+    assert recovery['replayed'] == 1
+
+
+def test_skill_built_off_loop_hibernates_and_wakes_on_it(ws_world, make_async_skill):
+    loop_world = ws_world()
+    # Built here, run on the loop asyncio.run() creates, as RiftClawFleet does
+    skill = make_async_skill()
+
+    async def scenario():
+        try:
+            assert await skill.connect(loop_world.url)
+            assert await skill.hibernate() is not None
+            assert skill.state == PortalState.HIBERNATED
+            assert not skill.connected
+
+            portals = await skill.discover()
+
+            assert [portal.portal_id for portal in portals] == ['gate']
+            assert skill.connected
+        finally:
+            await skill.disconnect()
+
+    asyncio.run(scenario())
+    assert len(loop_world.peers) == 2
+    assert skill.get_status()['hibernation']['wakes'] == 1
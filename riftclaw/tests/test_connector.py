@@ -0,0 +1,58 @@
+"""Shared connection setup: the asyncio path over the cached DNS addresses."""
+
+import asyncio
+import socket
+
+import pytest
+import websockets
+
+from skill.connector import ConnectionSetup
+
+
+def _refused_address():
+    """A localhost address nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()
+
+
+def _entry(address):
+    return (socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', address)
+
+
+def test_async_connect_skips_a_dead_address(ws_world):
+    loop_world = ws_world()
+    setup = ConnectionSetup()
+    url = f"ws://world.test:{loop_world.port}"
+    setup.dns.store('world.test', loop_world.port,
+                    [_entry(_refused_address()), _entry(('127.0.0.1', loop_world.port))])
+
+    options = asyncio.run(setup.websockets_options(url, timeout=2))
+
+    with options['sock'] as sock:
+        assert sock.getpeername() == ('127.0.0.1', loop_world.port)
+    assert setup.dns.lookup('world.test', loop_world.port) is not None
+    assert set(setup.timings(url)['last']) == {'dns', 'tcp'}
+
+
+def test_async_connect_forgets_addresses_that_all_fail():
+    setup = ConnectionSetup()
+    address = _refused_address()
+    setup.dns.store('world.test', address[1], [_entry(address)])
+
+    with pytest.raises(OSError):
+        asyncio.run(setup.websockets_options(f"ws://world.test:{address[1]}", timeout=2))
+
+    assert setup.dns.lookup('world.test', address[1]) is None
+
+
+def test_async_connect_opens_a_websocket_on_the_socket(ws_world):
+    loop_world = ws_world()
+    setup = ConnectionSetup()
+
+    async def exchange():
+        options = await setup.websockets_options(loop_world.url, timeout=2)
+        async with websockets.connect(loop_world.url, compression=None, **options) as ws:
+            return await ws.recv()
+
+    assert loop_world.name in asyncio.run(exchange())
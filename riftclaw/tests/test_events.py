@@ -0,0 +1,120 @@
+"""Subscribers in each mode: inline, on the shared pool and on an asyncio loop."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from skill.events import EventDispatcher, HandlerMode
+
+
+def test_slow_thread_handler_does_not_hold_the_reader(world, make_skill):
+    loop_world = world()
+    skill = make_skill()
+    assert skill.connect(loop_world.url)
+    release = threading.Event()
+    inline_seen = []
+    inline_done = threading.Semaphore(0)
+    pooled_done = threading.Semaphore(0)
+
+    def slow(data):
+        release.wait(5)
+        pooled_done.release()
+
+    def record(data):
+        inline_seen.append(data['note'])
+        inline_done.release()
+
+    skill.subscribe('notice', slow, mode='thread')
+    skill.subscribe('notice', record)
+    loop_world.push({'type': 'notice', 'note': 'first'})
+    loop_world.push({'type': 'notice', 'note': 'second'})
+
+    # Both reach the inline handler while the pooled one is still blocked
+    assert inline_done.acquire(timeout=2) and inline_done.acquire(timeout=2)
+    assert inline_seen == ['first', 'second']
+    release.set()
+    assert pooled_done.acquire(timeout=2) and pooled_done.acquire(timeout=2)
+
+    def calls():
+        return {s['mode']: s['calls'] for s in skill.get_status()['subscribers']
+                if s['msg_type'] == 'notice'}
+
+    # The pool counts a call once its handler has returned
+    deadline = time.monotonic() + 2
+    while calls() != {'thread': 2, 'inline': 2}:
+        assert time.monotonic() < deadline, calls()
+        time.sleep(0.01)
+
+
+def test_predicate_filters_and_wildcards_come_last():
+    dispatcher = EventDispatcher()
+    calls = []
+    dispatcher.subscribe('*', lambda data: calls.append(('any', data['n'])))
+    odd = dispatcher.subscribe('tick', lambda data: calls.append(('odd', data['n'])),
+                               predicate=lambda data: data['n'] % 2)
+
+    for n in range(3):
+        dispatcher.dispatch('tick', {'n': n})
+
+    assert calls == [('any', 0), ('odd', 1), ('any', 1), ('any', 2)]
+    assert odd.calls == 1
+    assert odd.filtered == 2
+
+
+def test_failing_handler_is_counted_and_does_not_stop_the_rest():
+    dispatcher = EventDispatcher()
+    seen = []
+    broken = dispatcher.subscribe('tick', lambda data: 1 / 0)
+    dispatcher.subscribe('tick', seen.append)
+
+    assert dispatcher.dispatch('tick', {'n': 1}) == 2
+    assert broken.errors == 1
+    assert seen == [{'n': 1}]
+
+
+def test_cancelled_subscription_gets_nothing():
+    dispatcher = EventDispatcher()
+    seen = []
+    subscription = dispatcher.subscribe('tick', seen.append)
+
+    subscription.cancel()
+
+    assert dispatcher.dispatch('tick', {'n': 1}) == 0
+    assert not dispatcher.has_subscribers('tick')
+    assert not dispatcher.unsubscribe(subscription)
+    assert seen == []
+
+
+def test_coroutine_handler_runs_on_its_loop_from_another_thread():
+    loop = asyncio.new_event_loop()
+    runner = threading.Thread(target=loop.run_forever, daemon=True)
+    runner.start()
+    try:
+        dispatcher = EventDispatcher()
+        ran_on = []
+        done = threading.Event()
+
+        async def handler(data):
+            await asyncio.sleep(0)
+            ran_on.append((asyncio.get_running_loop(), data['n']))
+            done.set()
+
+        subscription = dispatcher.subscribe('tick', handler, mode=HandlerMode.ASYNCIO, loop=loop)
+        dispatcher.dispatch('tick', {'n': 7})
+
+        assert done.wait(2)
+        assert ran_on == [(loop, 7)]
+        assert subscription.calls == 1
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        runner.join(2)
+        loop.close()
+
+
+def test_asyncio_mode_needs_a_loop_outside_one():
+    with pytest.raises(ValueError):
+        EventDispatcher().subscribe('tick', print, mode='asyncio')
+    with pytest.raises(ValueError):
+        EventDispatcher().subscribe('tick', print, mode='sideways')
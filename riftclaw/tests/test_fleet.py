@@ -0,0 +1,74 @@
+"""Many agents driven from one IO thread, alone or sharing sockets."""
+
+import pytest
+
+from skill.fleet import RiftClawFleet
+from skill.multiplex import MultiplexChannel
+
+
+def _configs(count):
+    return [{'agent_name': f'agent{i}', 'log_level': 'CRITICAL', 'keepalive': {'interval': 0}}
+            for i in range(count)]
+
+
+@pytest.fixture
+def fleets():
+    started = []
+
+    def make(count, **kwargs):
+        fleet = RiftClawFleet(_configs(count), **kwargs)
+        fleet.start()
+        started.append(fleet)
+        return fleet
+
+    yield make
+    for fleet in started:
+        fleet.stop()
+
+
+def test_agents_keep_their_own_identity_on_one_thread(ws_world, fleets):
+    loop_world = ws_world()
+    fleet = fleets(5)
+
+    results = fleet.connect_all(loop_world.url)
+
+    assert list(results.values()) == [True] * 5
+    # Every link is served by tasks on the fleet's one loop
+    assert all(agent.skill._reader_task.get_loop() is fleet.loop for agent in fleet)
+    for agent in fleet:
+        assert [portal.portal_id for portal in agent.discover()] == ['gate']
+    senders = {m['agent_id'] for m in loop_world.of_type('discover')}
+    assert senders == {agent.agent_id for agent in fleet}
+    assert len({agent.skill.get_public_key() for agent in fleet}) == 5
+    status = fleet.get_status()
+    assert (status['connected'], status['sockets']) == (5, 5)
+    assert len(loop_world.peers) == 5
+
+
+def test_agents_share_sockets_in_groups(ws_world, fleets):
+    loop_world = ws_world()
+    fleet = fleets(5, agents_per_socket=3)
+
+    results = fleet.connect_all(loop_world.url)
+
+    assert list(results.values()) == [True] * 5
+    assert len(loop_world.peers) == 2
+    assert fleet.get_status()['sockets'] == 2
+    assert all(isinstance(agent.skill.ws, MultiplexChannel) for agent in fleet)
+    portals = [agent.discover() for agent in fleet]
+    assert all(p[0].portal_id == 'gate' for p in portals)
+    assert {m['agent_id'] for m in loop_world.of_type('discover')} == {a.agent_id for a in fleet}
+
+
+def test_agents_added_while_running_use_the_fleet_loop(ws_world, fleets):
+    loop_world = ws_world()
+    fleet = fleets(1)
+    fleet.connect_all(loop_world.url)
+
+    agent, = fleet.add_agents(_configs(1))
+    assert agent.connect(loop_world.url)
+    assert agent.hibernate() is not None
+    assert [portal.portal_id for portal in agent.discover()] == ['gate']
+
+    assert fleet.get(agent.agent_id) is agent
+    assert agent.get_status()['hibernation']['wakes'] == 1
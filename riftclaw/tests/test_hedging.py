@@ -0,0 +1,61 @@
+"""Hedged handoffs: the first confirm wins and the losers are withdrawn."""
+
+
+def _two_portals(world):
+    destination = world('destination')
+    source = world('source', portals=[
+        {'portal_id': portal_id, 'name': portal_id.title(),
+         'destination_world': destination.name, 'destination_url': destination.url}
+        for portal_id in ('slow', 'fast')
+    ])
+    return source, destination
+
+
+def test_losing_request_is_cancelled(world, make_skill):
+    source, destination = _two_portals(world)
+    source.delays['slow'] = 2
+    skill = make_skill()
+    assert skill.connect(source.url)
+    skill.discover()
+
+    result = skill.enter_any(destination.name, hedge_after=0.05)
+
+    assert result['portal_id'] == 'fast'
+    assert result['hedges'] == 1
+    assert skill.current_world == destination.name
+    requests = {m['portal_id']: m['request_id'] for m in source.of_type('handoff_request')}
+    assert list(requests) == ['slow', 'fast']
+    cancels = [(m['portal_id'], m['request_id']) for m in source.of_type('handoff_cancel')]
+    assert cancels == [('slow', requests['slow'])]
+    assert skill.get_status()['pending_requests'] == 0
+
+
+def test_prompt_confirm_sends_no_hedge(world, make_skill):
+    source, destination = _two_portals(world)
+    skill = make_skill()
+    assert skill.connect(source.url)
+    skill.discover()
+
+    result = skill.enter_any(destination.name, hedge_after=1)
+
+    assert result['portal_id'] == 'slow'
+    assert result['hedges'] == 0
+    assert len(source.of_type('handoff_request')) == 1
+    assert source.of_type('handoff_cancel') == []
+
+
+def test_hedge_order_follows_observed_confirm_times(world, make_skill):
+    source, destination = _two_portals(world)
+    source.delays['slow'] = 2
+    skill = make_skill()
+    assert skill.connect(source.url)
+    skill.discover()
+    skill.enter_any(destination.name, hedge_after=0.05)
+
+    # Back at the source, the portal that won goes first
+    assert skill.connect(source.url)
+    skill.discover()
+    result = skill.enter_any(destination.name, hedge_after=1)
+
+    assert result['portal_id'] == 'fast'
+    assert result['hedges'] == 0
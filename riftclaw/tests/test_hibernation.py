@@ -0,0 +1,82 @@
+"""Hibernation: an idle agent releases its link and wakes on the next call."""
+
+import time
+
+import pytest
+
+from skill.riftclaw import ConnectionError, PortalState
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def test_hibernated_agent_wakes_on_the_next_call(world, make_skill):
+    loop_world = world()
+    skill = make_skill()
+    assert skill.connect(loop_world.url)
+    skill.discover()
+
+    snapshot = skill.hibernate()
+
+    assert snapshot['urls'] == [loop_world.url]
+    assert [portal['portal_id'] for portal in snapshot['portals']] == ['gate']
+    assert skill.hibernated
+    assert skill.state == PortalState.HIBERNATED
+    assert not skill.connected
+    _wait_for(lambda: loop_world.peers[0].closed)
+
+    portals = skill.discover()
+
+    assert [portal.portal_id for portal in portals] == ['gate']
+    assert not skill.hibernated
+    assert skill.current_world == loop_world.name
+    assert loop_world.listener.accepted == 2
+    status = skill.get_status()['hibernation']
+    assert status['hibernations'] == 1
+    assert status['wakes'] == 1
+    assert status['last_wake_seconds'] is not None
+
+
+def test_busy_agent_does_not_hibernate(world, make_skill):
+    loop_world = world()
+    loop_world.delays['discover'] = 0.3
+    skill = make_skill()
+    assert skill.connect(loop_world.url)
+    future = skill.submit('discover', 'discover_response')
+
+    assert skill.hibernate() is None
+    assert skill.connected
+
+    assert future.result(timeout=2)
+    assert skill.hibernate() is not None
+
+
+def test_idle_agent_hibernates_on_its_own(world, make_skill):
+    loop_world = world()
+    skill = make_skill(hibernation={'idle_after': 0.1})
+    assert skill.connect(loop_world.url)
+    skill.discover()
+
+    _wait_for(lambda: skill.hibernated)
+
+    assert skill.get_status()['hibernation']['hibernations'] == 1
+    assert skill.discover()
+    assert skill.get_status()['hibernation']['wakes'] == 1
+
+
+def test_failed_wake_stays_hibernated(world, make_skill):
+    loop_world = world()
+    skill = make_skill()
+    assert skill.connect(loop_world.url)
+    assert skill.hibernate() is not None
+    loop_world.close()
+
+    with pytest.raises(ConnectionError):
+        skill.discover()
+
+    assert skill.hibernated
+    assert skill.get_status()['hibernation']['failed_wakes'] == 1
@@ -0,0 +1,82 @@
+"""Make-before-break handoffs: the destination link opens while the confirm is pending."""
+
+import asyncio
+
+import pytest
+
+from skill.riftclaw import HandoffRejectedError, PortalState
+
+CONFIRM_DELAY = 0.3
+
+
+def _worlds(world):
+    destination = world('destination')
+    source = world('source', portals=[
+        {'portal_id': 'gate', 'name': 'Gate', 'destination_world': destination.name,
+         'destination_url': destination.url}
+    ])
+    source.delays['gate'] = CONFIRM_DELAY
+    return source, destination
+
+
+def test_arrival_without_going_offline(world, make_skill):
+    source, destination = _worlds(world)
+    skill = make_skill()
+    assert skill.connect(source.url)
+    skill.discover()
+
+    result = skill.enter('gate', make_before_break=True)
+
+    assert result['handoff_mode'] == 'make_before_break'
+    assert result['offline_gap'] == 0.0
+    assert skill.current_world == destination.name
+    assert skill.state == PortalState.ARRIVED
+    # The destination link was opened once, during the confirm wait
+    assert destination.listener.accepted == 1
+
+
+def test_break_before_make_goes_offline(world, make_skill):
+    source, destination = _worlds(world)
+    skill = make_skill()
+    assert skill.connect(source.url)
+    skill.discover()
+
+    result = skill.enter('gate')
+
+    assert result['handoff_mode'] == 'break_before_make'
+    assert result['offline_gap'] > 0
+    assert skill.current_world == destination.name
+
+
+def test_rejected_handoff_keeps_the_source_link(world, make_skill):
+    source, destination = _worlds(world)
+    source.replies['handoff_request'] = [{'type': 'handoff_rejected', 'reason': 'banned'}]
+    skill = make_skill()
+    assert skill.connect(source.url)
+    skill.discover()
+
+    with pytest.raises(HandoffRejectedError):
+        skill.enter('gate', make_before_break=True)
+
+    assert skill.current_world == source.name
+    assert skill.connected
+    assert destination.listener.accepted == 1
+    assert [portal.portal_id for portal in skill.discover()] == ['gate']
+
+
+def test_async_arrival_without_going_offline(ws_world, make_async_skill):
+    source, destination = _worlds(ws_world)
+    skill = make_async_skill()
+
+    async def scenario():
+        try:
+            assert await skill.connect(source.url)
+            await skill.discover()
+            return await skill.enter('gate', make_before_break=True)
+        finally:
+            await skill.disconnect()
+
+    result = asyncio.run(scenario())
+    assert result['handoff_mode'] == 'make_before_break'
+    assert result['offline_gap'] == 0.0
+    assert len(destination.peers) == 1
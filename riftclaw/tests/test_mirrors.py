@@ -0,0 +1,71 @@
+"""Racing staggered connects across a world's mirrors."""
+
+import asyncio
+import time
+
+STAGGER = 0.2
+
+
+def test_fast_primary_leaves_the_mirror_alone(world, make_skill):
+    primary, mirror = world('primary'), world('mirror')
+    skill = make_skill(connect_stagger=STAGGER)
+
+    assert skill.connect([primary.url, mirror.url])
+
+    assert skill.current_world == primary.name
+    assert mirror.listener.accepted == 0
+
+
+def test_slow_primary_loses_to_the_staggered_mirror(world, make_skill):
+    primary, mirror = world('primary'), world('mirror')
+    primary.delays['welcome'] = 1
+    skill = make_skill(connect_stagger=STAGGER)
+
+    started = time.monotonic()
+    assert skill.connect([primary.url, mirror.url])
+
+    assert skill.current_world == mirror.name
+    assert STAGGER <= time.monotonic() - started < 1
+    assert primary.listener.accepted == 1
+    # The losing link was closed
+    deadline = time.monotonic() + 2
+    while not primary.peers[0].closed:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_failed_mirror_starts_the_next_at_once(world, make_skill):
+    mirror = world('mirror')
+    skill = make_skill(connect_stagger=5)
+
+    started = time.monotonic()
+    assert skill.connect(['loop://nowhere', mirror.url])
+
+    assert skill.current_world == mirror.name
+    assert time.monotonic() - started < 1
+
+
+def test_configured_mirrors_are_raced_too(world, make_skill):
+    primary, mirror = world('primary'), world('mirror')
+    primary.delays['welcome'] = 1
+    skill = make_skill(connect_stagger=STAGGER, world_mirrors={primary.url: [mirror.url]})
+
+    assert skill.connect(primary.url)
+
+    assert skill.current_world == mirror.name
+
+
+def test_async_race_skips_a_dead_mirror(ws_world, make_async_skill):
+    mirror = ws_world('mirror')
+    skill = make_async_skill(connect_stagger=5)
+
+    async def scenario():
+        try:
+            started = time.monotonic()
+            assert await skill.connect(['ws://127.0.0.1:9', mirror.url])
+            return time.monotonic() - started
+        finally:
+            await skill.disconnect()
+
+    assert asyncio.run(scenario()) < 1
+    assert len(mirror.peers) == 1
@@ -0,0 +1,105 @@
+"""Many agents on one shared link: routing and the session's keepalive."""
+
+import threading
+import time
+
+import pytest
+
+from skill.multiplex import MultiplexedSession
+from skill.riftclaw import PortalState
+
+
+@pytest.fixture
+def shared(world, make_skill):
+    """A world, a session open to it and three agents attached to the session."""
+    sessions = []
+
+    def make(keepalive=None, agents=3):
+        loop_world = world()
+        session = MultiplexedSession(loop_world.url, keepalive=keepalive or {'interval': 0})
+        sessions.append(session.open(timeout=5))
+        skills = [make_skill(agent_name=f'agent{i}', auto_reconnect=False) for i in range(agents)]
+        for skill in skills:
+            session.attach(skill)
+        return loop_world, session, skills
+
+    yield make
+    for session in sessions:
+        session.close()
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def test_replies_route_to_the_requesting_agent(shared):
+    loop_world, session, skills = shared()
+    # Every agent asks at once and the world answers in reverse order
+    futures = []
+    for i, skill in enumerate(skills):
+        loop_world.delays[f'tag{i}'] = 0.1 * (len(skills) - i)
+        futures.append(skill.submit('discover', 'discover_response', {'tag': f'tag{i}'}))
+
+    answers = [future.result(timeout=5) for future in futures]
+
+    assert [answer['portals'][0].portal_id for answer in answers] == ['tag0', 'tag1', 'tag2']
+    assert loop_world.listener.accepted == 1
+    senders = [m['agent_id'] for m in loop_world.of_type('discover')]
+    assert senders == [skill.config['agent_id'] for skill in skills]
+    status = session.get_status()
+    assert status['routed_by_request'] == 3
+    assert status['pending_routes'] == 0
+
+
+def test_pushed_frames_route_by_agent_or_reach_everyone(shared):
+    loop_world, session, skills = shared()
+    seen = {skill.config['agent_id']: [] for skill in skills}
+    delivered = threading.Semaphore(0)
+
+    def recorder(agent_id):
+        def record(data):
+            seen[agent_id].append(data['note'])
+            delivered.release()
+        return record
+
+    for skill in skills:
+        skill.subscribe('notice', recorder(skill.config['agent_id']))
+
+    target = skills[1].config['agent_id']
+    loop_world.push({'type': 'notice', 'agent_id': target, 'note': 'direct'})
+    loop_world.push({'type': 'notice', 'note': 'everyone'})
+    for _ in range(1 + len(skills)):
+        assert delivered.acquire(timeout=2)
+
+    for agent_id, notes in seen.items():
+        assert notes == (['direct', 'everyone'] if agent_id == target else ['everyone'])
+    status = session.get_status()
+    assert status['routed_by_agent'] >= 1
+    assert status['broadcasts'] >= 1
+
+
+def test_session_pings_once_per_link(shared):
+    loop_world, session, skills = shared(keepalive={'interval': 0.05})
+
+    _wait_for(lambda: session.get_status()['keepalive']['pongs'] >= 3)
+
+    pings = loop_world.of_type('ping')
+    assert len({ping['request_id'] for ping in pings}) == len(pings)
+    # One agent signs each ping; the others stay quiet
+    assert {ping['agent_id'] for ping in pings} == {skills[0].config['agent_id']}
+    assert session.rtt.count >= 3
+    for skill in skills:
+        assert skill.get_status()['rtt'][loop_world.url]['samples'] >= 3
+
+
+def test_dead_shared_link_is_dropped(shared):
+    loop_world, session, skills = shared(keepalive={'interval': 0.05, 'max_missed': 2})
+    loop_world.mute.add('ping')
+
+    _wait_for(lambda: not session.alive)
+
+    assert session.get_status()['keepalive']['dead_peers'] == 1
+    _wait_for(lambda: all(skill.state == PortalState.DISCONNECTED for skill in skills))
@@ -0,0 +1,107 @@
+"""Send queues: lane order, caps and coalescing, and the asyncio writer."""
+
+import asyncio
+
+import pytest
+
+from skill.outbound import Lane, OutboundQueue, drain
+
+
+def _drain_now(queue):
+    frames = []
+    while len(queue):
+        frames.append(queue.get_nowait())
+    return frames
+
+
+def test_lanes_are_sent_in_priority_order():
+    queue = OutboundQueue()
+    queue.put('t1', Lane.TELEMETRY)
+    queue.put('r1', Lane.REQUEST)
+    queue.put('c1', Lane.CONTROL)
+    queue.put('r2', Lane.REQUEST)
+
+    assert _drain_now(queue) == ['c1', 'r1', 'r2', 't1']
+
+
+def test_full_queue_evicts_telemetry_but_refuses_requests():
+    queue = OutboundQueue(max_messages=2)
+    assert queue.put('t1', Lane.TELEMETRY)
+    assert queue.put('r1', Lane.REQUEST)
+
+    assert queue.put('c1', Lane.CONTROL)
+    assert not queue.put('r2', Lane.REQUEST)
+
+    assert _drain_now(queue) == ['c1', 'r1']
+    lanes = queue.stats()['lanes']
+    assert lanes['telemetry']['dropped'] == 1
+    assert lanes['request']['rejected'] == 1
+
+
+def test_coalesced_frame_replaces_in_place():
+    queue = OutboundQueue()
+    queue.put('pos=1', Lane.TELEMETRY, coalesce_key='pos')
+    queue.put('chat', Lane.TELEMETRY)
+    queue.put('pos=2', Lane.TELEMETRY, coalesce_key='pos')
+
+    assert _drain_now(queue) == ['pos=2', 'chat']
+    assert queue.stats()['lanes']['telemetry']['coalesced'] == 1
+
+
+def test_growing_coalesced_frame_respects_the_byte_cap():
+    queue = OutboundQueue(max_bytes=20)
+    assert queue.put('r' * 10, Lane.REQUEST, coalesce_key='state')
+    assert queue.put('t' * 6, Lane.TELEMETRY)
+
+    # Five more bytes fit only once the telemetry frame is evicted
+    assert queue.put('R' * 15, Lane.REQUEST, coalesce_key='state')
+    assert queue.stats()['lanes']['telemetry']['dropped'] == 1
+    # Nothing is left to evict for a frame over the cap
+    assert not queue.put('R' * 21, Lane.REQUEST, coalesce_key='state')
+
+    stats = queue.stats()
+    assert stats['bytes'] == 15
+    assert stats['peak_bytes'] <= 20
+    assert stats['lanes']['request']['rejected'] == 1
+    assert _drain_now(queue) == ['R' * 15]
+
+
+def test_drained_wakes_once_the_writer_sends_everything():
+    sent = []
+
+    async def send(frame):
+        await asyncio.sleep(0.01)
+        sent.append(frame)
+
+    async def scenario():
+        queue = OutboundQueue()
+        writer = asyncio.create_task(drain(queue, send))
+        for i in range(3):
+            queue.put(f'frame{i}')
+        await asyncio.wait_for(queue.drained(), 1)
+        flushed = list(sent)
+        queue.close()
+        await writer
+        return flushed
+
+    # The last frame is taken before its send finishes
+    assert asyncio.run(scenario())[:2] == ['frame0', 'frame1']
+
+
+def test_drained_times_out_behind_a_stuck_writer():
+    async def scenario():
+        stuck = asyncio.Event()
+        queue = OutboundQueue()
+        writer = asyncio.create_task(drain(queue, lambda frame: stuck.wait()))
+        queue.put('first')
+        queue.put('second')
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(queue.drained(), 0.05)
+        assert len(queue) == 1
+        # Closing drops what is queued and releases any waiter
+        queue.close()
+        await asyncio.wait_for(queue.drained(), 1)
+        stuck.set()
+        await writer
+
+    asyncio.run(scenario())
@@ -0,0 +1,79 @@
+"""Immutable passports: cached serializations that cannot go stale."""
+
+import copy
+import pickle
+
+import pytest
+
+from skill.riftclaw import AgentPassport
+
+
+def _passport(**changes):
+    fields = dict(agent_id='a1', agent_name='Tester', source_world='here',
+                  target_world='there', position={'x': 1.0, 'y': 2.0},
+                  signature='c2lnbmVk')
+    fields.update(changes)
+    return AgentPassport(**fields)
+
+
+def test_position_cannot_change_under_a_cached_hash():
+    position = {'x': 1.0}
+    passport = _passport(position=position)
+    digest = passport.compute_hash()
+    position['x'] = 999
+
+    with pytest.raises(TypeError):
+        passport.position['x'] = 999
+    with pytest.raises(AttributeError):
+        passport.position = {'x': 999}
+
+    assert passport.position['x'] == 1.0
+    assert passport.compute_hash() == digest
+    assert b'999' not in passport.to_bytes()
+
+
+def test_changing_a_signed_field_drops_the_signature_and_the_cache():
+    passport = _passport()
+    digest = passport.compute_hash()
+
+    moved = passport.replace(position={'x': 4.0})
+
+    assert moved.signature is None
+    assert moved.compute_hash() != digest
+    assert moved.to_dict()['position'] == {'x': 4.0}
+    assert passport.signature == 'c2lnbmVk'
+    assert passport.compute_hash() == digest
+
+
+def test_new_signature_keeps_the_content_hash():
+    passport = _passport(signature=None)
+    digest = passport.compute_hash()
+    wire = passport.to_dict()
+
+    signed = passport.replace(signature='bmV3')
+
+    assert signed.compute_hash() == digest
+    assert signed.to_dict() == {**wire, 'signature': 'bmV3'}
+
+
+def test_to_dict_hands_out_independent_copies():
+    passport = _passport()
+    wire = passport.to_dict()
+    wire['agent_name'] = 'EVIL'
+    wire['position']['x'] = 999
+
+    again = passport.to_dict()
+
+    assert again['agent_name'] == 'Tester'
+    assert again['position'] == {'x': 1.0, 'y': 2.0}
+    assert AgentPassport.from_dict(again) == passport
+
+
+def test_passports_hash_copy_and_pickle():
+    passport = _passport()
+
+    assert len({passport, _passport(nonce=passport.nonce, timestamp=passport.timestamp)}) == 1
+    assert copy.deepcopy(passport) == passport
+    restored = pickle.loads(pickle.dumps(passport))
+    assert restored == passport
+    assert restored.compute_hash() == passport.compute_hash()
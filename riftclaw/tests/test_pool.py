@@ -0,0 +1,57 @@
+"""Warm links to recently visited worlds: reuse, LRU eviction and idle expiry."""
+
+import time
+
+
+def _hop(skill, *worlds):
+    for loop_world in worlds:
+        assert skill.connect(loop_world.url)
+        assert skill.current_world == loop_world.name
+
+
+def test_coming_back_reuses_the_parked_link(world, make_skill):
+    home, away = world('home'), world('away')
+    skill = make_skill(connection_pool={'max_size': 2, 'idle_ttl': 60})
+
+    _hop(skill, home, away, home)
+
+    assert home.listener.accepted == 1
+    stats = skill.get_status()['connection_pool']
+    assert stats['hits'] == 1
+    assert stats['worlds'] == [away.url]
+
+
+def test_least_recently_parked_link_is_evicted(world, make_skill):
+    first, second, third = world('first'), world('second'), world('third')
+    skill = make_skill(connection_pool={'max_size': 1, 'idle_ttl': 60})
+
+    _hop(skill, first, second, third)
+    assert skill.get_status()['connection_pool']['worlds'] == [second.url]
+    _hop(skill, first)
+
+    assert first.listener.accepted == 2
+    stats = skill.get_status()['connection_pool']
+    assert stats['evictions'] >= 1
+    assert stats['hits'] == 0
+
+
+def test_idle_links_expire(world, make_skill):
+    home, away = world('home'), world('away')
+    skill = make_skill(connection_pool={'max_size': 2, 'idle_ttl': 0.1})
+
+    _hop(skill, home, away)
+    time.sleep(0.2)
+    _hop(skill, home)
+
+    assert home.listener.accepted == 2
+    assert skill.get_status()['connection_pool']['expirations'] == 1
+
+
+def test_pooling_disabled_closes_links(world, make_skill):
+    home, away = world('home'), world('away')
+    skill = make_skill(connection_pool={'max_size': 0})
+
+    _hop(skill, home, away, home)
+
+    assert home.listener.accepted == 2
+    assert skill.get_status()['connection_pool']['size'] == 0
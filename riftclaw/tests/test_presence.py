@@ -0,0 +1,71 @@
+"""One identity in several worlds: tagged events in one stream."""
+
+import queue
+
+
+def _next_of_type(presence, msg_type):
+    for event in presence.events(timeout=2):
+        if event.msg_type == msg_type:
+            return event
+    raise AssertionError(f"no {msg_type} event")
+
+
+def test_sessions_share_one_identity_and_one_stream(world, make_presence):
+    presence = make_presence()
+    north, south = world('north'), world('south')
+    presence.join(north.url, name='n')
+    presence.join(south.url, name='s')
+    pushed = []
+    presence.subscribe('notice', pushed.append)
+
+    north.push({'type': 'notice', 'note': 'from north'})
+    first = _next_of_type(presence, 'notice')
+    south.push({'type': 'notice', 'note': 'from south'})
+    second = _next_of_type(presence, 'notice')
+
+    assert (first.session, first.world, first.data['note']) == ('n', north.name, 'from north')
+    assert (second.session, second.world, second.data['note']) == ('s', south.name, 'from south')
+    assert pushed == [first, second]
+    assert presence.worlds() == {'n': north.name, 's': south.name}
+    assert presence.session('n').config['agent_id'] == presence.session('s').config['agent_id']
+
+
+def test_full_stream_drops_the_oldest(make_presence):
+    presence = make_presence(max_events=2)
+    seen = []
+    presence.subscribe('*', seen.append)
+
+    for i in range(5):
+        presence._publish('n', presence.identity, {'type': 'notice', 'n': i})
+
+    assert [presence.next_event(timeout=0).data['n'] for _ in range(2)] == [3, 4]
+    assert presence.get_status()['events']['dropped'] == 3
+    assert len(seen) == 5
+
+
+class _RacedQueue(queue.Queue):
+    """A queue that a reader empties just before each eviction attempt."""
+
+    def __init__(self, maxsize):
+        super().__init__(maxsize)
+        self.read = []
+
+    def get_nowait(self):
+        while not self.empty():
+            self.read.append(self.get())
+        return super().get_nowait()
+
+
+def test_reader_emptying_a_full_stream_loses_no_event(make_presence):
+    presence = make_presence(max_events=1)
+    presence._queue = raced = _RacedQueue(1)
+    seen = []
+    presence.subscribe('*', seen.append)
+
+    for i in range(3):
+        presence._publish('n', presence.identity, {'type': 'notice', 'n': i})
+
+    assert len(seen) == 3
+    assert [event.data['n'] for event in raced.read] == [0, 1]
+    assert presence.next_event(timeout=0).data['n'] == 2
+    assert presence.get_status()['events']['dropped'] == 0
@@ -0,0 +1,44 @@
+"""The rate governor spaces requests so a world never sees too many at once."""
+
+import threading
+
+
+def _most_in_any_window(times, window):
+    """Largest number of arrivals within `window` seconds of each other."""
+    return max(sum(1 for later in times[i:] if later - start < window)
+               for i, start in enumerate(times))
+
+
+def test_type_limit_spaces_requests(world, make_skill):
+    loop_world = world()
+    skill = make_skill(rate_limits={
+        'enabled': True, 'max_wait': 10,
+        'limits': {'discover': {'limit': 3, 'window': 0.3}}
+    })
+    assert skill.connect(loop_world.url)
+
+    futures = [skill.submit('discover', 'discover_response') for _ in range(9)]
+
+    assert all(future.result(timeout=10) for future in futures)
+    times = loop_world.times('discover')
+    assert len(times) == 9
+    assert _most_in_any_window(times, 0.3) == 3
+    assert times[-1] - times[0] >= 0.6
+
+
+def test_world_limit_from_welcome_paces_the_socket(world, make_skill):
+    loop_world = world(welcome={'rate_limits': {'*': {'limit': 4, 'window': 0.3}}})
+    skill = make_skill(rate_limits={'enabled': True, 'max_wait': 10, 'limits': {'discover': None}})
+    assert skill.connect(loop_world.url)
+
+    # Several callers at once still share one budget
+    threads = [threading.Thread(target=skill.discover) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    times = loop_world.times('discover')
+    assert len(times) == 10
+    assert _most_in_any_window(times, 0.3) <= 4
+    assert skill.get_status()['rate_limits']['limits']['*']['limit'] == 4
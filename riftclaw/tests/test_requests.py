@@ -0,0 +1,45 @@
+"""Concurrent requests on one link, correlated by request_id."""
+
+import threading
+
+
+def test_concurrent_requests_resolve_by_request_id(world, make_skill):
+    loop_world = world()
+    # The first request is answered last
+    for i in range(5):
+        loop_world.delays[f'r{i}'] = 0.1 * (5 - i)
+    skill = make_skill()
+    assert skill.connect(loop_world.url)
+
+    completed = []
+    futures = []
+    for i in range(5):
+        future = skill.submit('discover', 'discover_response', {'tag': f'r{i}'})
+        future.add_done_callback(lambda _, i=i: completed.append(i))
+        futures.append(future)
+
+    answers = [future.result(timeout=5) for future in futures]
+    assert [answer['portals'][0].portal_id for answer in answers] == [f'r{i}' for i in range(5)]
+    assert completed == [4, 3, 2, 1, 0]
+    assert len({m['request_id'] for m in loop_world.of_type('discover')}) == 5
+    assert skill.get_status()['pending_requests'] == 0
+
+
+def test_blocking_calls_from_threads_do_not_cross(world, make_skill):
+    loop_world = world()
+    loop_world.delays['t0'] = 0.2
+    skill = make_skill()
+    assert skill.connect(loop_world.url)
+
+    results = {}
+
+    def ask(tag):
+        response = skill._request('discover', 'discover_response', {'tag': tag})
+        results[tag] = response['portals'][0].portal_id
+
+    threads = [threading.Thread(target=ask, args=(f't{i}',)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert results == {f't{i}': f't{i}' for i in range(4)}
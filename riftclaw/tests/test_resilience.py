@@ -0,0 +1,78 @@
+"""Connect retries: jittered exponential backoff and per-URL circuit breakers."""
+
+import random
+import time
+
+import pytest
+
+from skill.resilience import BreakerState, CircuitBreaker, RetryPolicy
+from skill.riftclaw import CircuitOpenError, ConnectionError
+
+
+def test_backoff_ceiling_doubles_up_to_the_cap():
+    policy = RetryPolicy(base_delay=0.5, max_delay=3)
+
+    assert [policy.ceiling(n) for n in range(1, 6)] == [0.5, 1, 2, 3, 3]
+
+
+def test_backoff_delays_are_spread_under_the_ceiling():
+    random.seed(7)
+    policy = RetryPolicy(base_delay=1, max_delay=30)
+
+    delays = [policy.delay(3) for _ in range(200)]
+
+    assert all(0 <= delay <= 4 for delay in delays)
+    # Full jitter: retries from many agents do not line up
+    assert min(delays) < 1 and max(delays) > 3
+
+
+def test_breaker_opens_then_lets_one_probe_through():
+    breaker = CircuitBreaker('ws://example', failure_threshold=2, reset_timeout=0.1)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == BreakerState.OPEN
+    assert not breaker.allow()
+    time.sleep(0.1)
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    # A failed probe re-opens it; a successful one closes it
+    breaker.record_failure()
+    assert breaker.state == BreakerState.OPEN
+    time.sleep(0.1)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == BreakerState.CLOSED
+    assert breaker.snapshot()['times_opened'] == 2
+
+
+def test_dead_world_trips_the_breaker_and_fails_fast(make_skill):
+    url = 'loop://nowhere'
+    skill = make_skill(max_retries=3, retry={'base_delay': 0.01},
+                       circuit_breaker={'failure_threshold': 3, 'reset_timeout': 60})
+
+    with pytest.raises(ConnectionError):
+        skill.connect(url)
+    stats = skill.get_status()['connect_retries']
+    assert (stats['attempts'], stats['failures'], stats['retries']) == (3, 3, 2)
+
+    started = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        skill.connect(url)
+    assert time.monotonic() - started < 0.05
+    breaker = skill.get_status()['circuit_breakers'][url]
+    assert breaker['state'] == 'open'
+    assert breaker['retry_after'] > 50
+
+
+def test_breakers_are_shared_by_every_skill(make_skill):
+    url = 'loop://nowhere'
+    settings = {'max_retries': 2, 'retry': {'base_delay': 0.01},
+                'circuit_breaker': {'failure_threshold': 2, 'reset_timeout': 60}}
+    with pytest.raises(ConnectionError):
+        make_skill(**settings).connect(url)
+
+    with pytest.raises(CircuitOpenError):
+        make_skill(**settings).connect(url)
@@ -0,0 +1,61 @@
+"""Resuming a dropped link and replaying the requests it lost."""
+
+import time
+
+
+def test_request_is_replayed_after_a_drop(world, make_skill):
+    loop_world = world()
+    skill = make_skill()
+    assert skill.connect(loop_world.url)
+    loop_world.drop_once.add('discover')
+
+    portals = skill.discover()
+
+    assert [portal.portal_id for portal in portals] == ['gate']
+    sent = loop_world.of_type('discover')
+    assert len(sent) == 2
+    assert sent[0]['request_id'] == sent[1]['request_id']
+    assert loop_world.listener.accepted == 2
+    recovery = skill.get_status()['recovery']
+    assert recovery['drops'] == 1
+    assert recovery['recoveries'] == 1
+    assert recovery['replayed'] == 1
+    assert skill.current_world == loop_world.name
+
+
+def test_handoff_survives_a_drop(world, make_skill):
+    destination = world('destination')
+    source = world('source', portals=[
+        {'portal_id': 'gate', 'name': 'Gate', 'destination_world': destination.name,
+         'destination_url': destination.url}
+    ])
+    skill = make_skill()
+    assert skill.connect(source.url)
+    skill.discover()
+    source.drop_once.add('handoff_request')
+
+    result = skill.enter('gate')
+
+    assert result['success']
+    assert skill.current_world == destination.name
+    assert len(source.of_type('handoff_request')) == 2
+
+
+def test_repeated_answer_after_replay_is_dropped(world, make_skill):
+    loop_world = world()
+    skill = make_skill()
+    assert skill.connect(loop_world.url)
+    answers = []
+    skill.subscribe('discover_response', answers.append)
+    skill.discover()
+    request_id = loop_world.of_type('discover')[0]['request_id']
+
+    # What a world does if it answers both the original and the replay
+    loop_world.push({'type': 'discover_response', 'request_id': request_id,
+                     'portals': loop_world.portals})
+    deadline = time.monotonic() + 2
+    while skill.get_status()['recovery']['duplicates_dropped'] < 1:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert len(answers) == 1
+    assert answers[0]['portals'][0]['portal_id'] == 'gate'
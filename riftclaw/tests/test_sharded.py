@@ -0,0 +1,35 @@
+"""ShardedFleet handing a dead worker's agents to the survivors."""
+
+import os
+import signal
+
+import pytest
+
+from skill.sharded import ShardedFleet
+
+
+@pytest.fixture
+def fleet():
+    fleet = ShardedFleet([{'agent_name': f'agent{i}', 'log_level': 'CRITICAL'} for i in range(6)],
+                         workers=3)
+    fleet.start()
+    yield fleet
+    fleet.stop()
+
+
+def test_killed_workers_agents_move_to_survivors(fleet):
+    assert fleet.get_status()['agents_per_worker'] == {0: 2, 1: 2, 2: 2}
+    victim = fleet._processes[0]
+    os.kill(victim.pid, signal.SIGKILL)
+    victim.join(5)
+
+    # The next call finds the pipe broken before any answer is awaited
+    status = fleet.get_status()
+
+    assert fleet.workers == [1, 2]
+    assert status['workers'] == 2
+    assert status['worker_deaths'] == 1
+    assert status['rebalanced_agents'] == 2
+    assert status['agents_per_worker'] == {1: 3, 2: 3}
+    # The survivors report every agent, so the orphans were adopted
+    assert sum(fleet.get_status()['states'].values()) == 6
@@ -0,0 +1,69 @@
+"""The portal state machine: checked transitions, waiters and dwell times."""
+
+import threading
+import time
+
+import pytest
+
+from skill.riftclaw import PortalState, PortalStateMachine, RiftError
+
+
+def test_transitions_follow_the_traversal_flow():
+    machine = PortalStateMachine()
+    seen = []
+    machine.add_listener(lambda old, new: seen.append((old.value, new.value)))
+
+    for state in (PortalState.CONNECTING, PortalState.CONNECTED, PortalState.HANDOFF_PENDING,
+                  PortalState.TRANSITIONING, PortalState.ARRIVED):
+        machine.transition(state)
+    with pytest.raises(RiftError):
+        machine.transition(PortalState.TRANSITIONING)
+    # Losing the link is allowed from anywhere
+    machine.transition(PortalState.DISCONNECTED)
+
+    assert seen[-1] == ('arrived', 'disconnected')
+    assert len(seen) == 6
+    assert machine.entry_counts()['connected'] == 1
+
+
+def test_waiter_wakes_on_the_transition():
+    machine = PortalStateMachine(PortalState.CONNECTING)
+    threading.Timer(0.1, machine.transition, (PortalState.CONNECTED,)).start()
+
+    started = time.monotonic()
+    reached = machine.wait_for_state([PortalState.CONNECTED, PortalState.DISCONNECTED], timeout=2)
+
+    assert reached == PortalState.CONNECTED
+    assert time.monotonic() - started < 0.5
+    assert machine.wait_for_state(PortalState.ARRIVED, timeout=0.05) is None
+
+
+def test_dwell_times_add_up_per_state():
+    machine = PortalStateMachine(PortalState.CONNECTING)
+    time.sleep(0.05)
+    machine.transition(PortalState.CONNECTED)
+    time.sleep(0.1)
+    machine.transition(PortalState.DISCOVERING)
+    machine.transition(PortalState.CONNECTED)
+    time.sleep(0.05)
+
+    dwell = machine.dwell_times()
+
+    assert 0.05 <= dwell['connecting'] < 0.1
+    # Both stays in CONNECTED count, including the current one
+    assert 0.15 <= dwell['connected'] < 0.25
+    assert machine.entry_counts()['connected'] == 2
+
+
+def test_skill_reports_its_states(world, make_skill):
+    loop_world = world()
+    skill = make_skill()
+    assert skill.connect(loop_world.url)
+
+    assert skill.wait_for_state(PortalState.CONNECTED, timeout=1) == PortalState.CONNECTED
+    skill.discover()
+
+    status = skill.get_status()
+    assert status['state'] == 'connected'
+    assert status['state_dwell']['discovering'] > 0
+    assert status['state_dwell']['hibernated'] == 0
@@ -0,0 +1,81 @@
+"""Adaptive deadlines: learned from observed latencies, backed off after timeouts."""
+
+import time
+
+from skill.latency import AdaptiveTimeouts
+
+URL = 'ws://timeouts.test'
+
+
+def _observe(timeouts, seconds, count=5):
+    for _ in range(count):
+        timeouts.observe(URL, 'discover', seconds)
+
+
+def test_ceiling_holds_until_enough_samples():
+    timeouts = AdaptiveTimeouts(min_samples=5)
+    _observe(timeouts, 0.1, count=4)
+
+    assert timeouts.timeout(URL, 'discover', 30) == 30
+    _observe(timeouts, 0.1, count=1)
+    assert timeouts.timeout(URL, 'discover', 30) < 30
+
+
+def test_deadline_is_percentile_plus_margin_within_floor_and_ceiling():
+    timeouts = AdaptiveTimeouts(margin=0.25, floor=0.5)
+    _observe(timeouts, 2.0)
+    # Steady samples keep the deviation small, so the margin decides
+    expected = 2.0 + max(0.25, 4 * AdaptiveTimeouts.stats_for(URL, 'discover').deviation)
+
+    assert timeouts.timeout(URL, 'discover', 30) == expected
+    assert timeouts.timeout(URL, 'discover', 1.5) == 1.5
+
+    AdaptiveTimeouts.reset_all()
+    fast = AdaptiveTimeouts(margin=0.01, floor=0.5)
+    _observe(fast, 0.001)
+    assert fast.timeout(URL, 'discover', 30) == 0.5
+
+
+def test_timeouts_double_the_deadline_and_a_success_resets_it():
+    timeouts = AdaptiveTimeouts(floor=1)
+    _observe(timeouts, 0.01)
+    base = timeouts.timeout(URL, 'discover', 1000)
+
+    timeouts.timed_out(URL, 'discover')
+    timeouts.timed_out(URL, 'discover')
+    assert timeouts.timeout(URL, 'discover', 1000) == base * 4
+    for _ in range(AdaptiveTimeouts.MAX_BACKOFF + 3):
+        timeouts.timed_out(URL, 'discover')
+    assert timeouts.timeout(URL, 'discover', 1000) == base * 2 ** AdaptiveTimeouts.MAX_BACKOFF
+    assert timeouts.timeout(URL, 'discover', 10) == 10
+
+    timeouts.observe(URL, 'discover', 0.01)
+    assert timeouts.timeout(URL, 'discover', 1000) == base
+
+
+def test_disabled_or_unknown_world_uses_the_ceiling():
+    timeouts = AdaptiveTimeouts(enabled=False)
+    _observe(timeouts, 0.01)
+
+    assert timeouts.timeout(URL, 'discover', 30) == 30
+    assert AdaptiveTimeouts().timeout(None, 'discover', 30) == 30
+
+
+def test_skill_learns_a_worlds_discover_deadline(world, make_skill):
+    loop_world = world()
+    skill = make_skill(handoff_timeout=5)
+    assert skill.connect(loop_world.url)
+    for _ in range(5):
+        skill.discover()
+
+    learned = skill.get_status()['timeouts'][loop_world.url]['discover']
+    assert learned['samples'] == 5
+    assert learned['ceiling'] == 5
+    assert learned['timeout'] < 5
+
+    # A silent world now costs the learned deadline, not the ceiling
+    loop_world.mute.add('discover')
+    started = time.monotonic()
+    assert skill.discover() == []
+    assert time.monotonic() - started < 2
+    assert skill.get_status()['timeouts'][loop_world.url]['discover']['backoff'] == 1